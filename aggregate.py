@@ -0,0 +1,305 @@
+"""Grouped aggregates and pivots over a loaded dataset, with the group indexes behind them cached."""
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+
+from partitions import OPERATORS, parse_filters
+from stats import column_values, is_numeric_column
+
+AGGREGATES = ["count", "sum", "mean", "min", "max", "median", "p25", "p75", "p90", "p95", "p99"]
+PERCENTILES = {"median": 0.5, "p25": 0.25, "p75": 0.75, "p90": 0.9, "p95": 0.95, "p99": 0.99}
+TIME_BUCKETS = ["hour", "day", "week", "month", "quarter", "year"]
+BUCKET_UNITS = {"hour": "h", "day": "D", "month": "M", "year": "Y"}
+MAX_INDEXES = 4
+MAX_MASKS = 8
+MAX_RESULTS = 64
+# Above this many groups, percentiles sort all values at once instead of selecting within each group.
+SELECT_GROUPS = 10_000
+
+
+def bucket_times(series, bucket):
+    """Start of the hour, day, week (Monday), month, quarter or year each timestamp falls in."""
+    values = series.to_numpy(dtype="datetime64[ns]")
+    missing = np.isnat(values)
+    if bucket == "week":
+        days = values.astype("datetime64[D]")
+        # 1970-01-01 was a Thursday, so (days + 3) % 7 counts days since Monday.
+        floored = days - (days.astype(np.int64) + 3) % 7
+    elif bucket == "quarter":
+        months = values.astype("datetime64[M]").astype(np.int64)
+        floored = (months - months % 3).astype("datetime64[M]")
+    elif bucket in BUCKET_UNITS:
+        floored = values.astype(f"datetime64[{BUCKET_UNITS[bucket]}]")
+    else:
+        raise ValueError(f"Unknown time bucket '{bucket}'; use one of {', '.join(TIME_BUCKETS)}.")
+    floored = floored.astype("datetime64[ns]")
+    floored[missing] = np.datetime64("NaT")
+    return pd.Series(floored, index=series.index, name=series.name)
+
+
+def column_codes(series, bucket=None):
+    """(codes, labels) for a group column: -1 marks missing keys, labels are in sorted order."""
+    if bucket and is_datetime64_any_dtype(series):
+        series = bucket_times(series, bucket)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # The codes already are a dense integer key; unused categories come out as empty groups.
+        categories = series.cat.categories
+        codes = series.cat.codes.to_numpy().astype(np.int64)
+        if series.cat.ordered or categories.is_monotonic_increasing:
+            return codes, categories
+        order = np.argsort(categories.to_numpy(dtype=object).astype(str), kind="stable")
+        remap = np.empty(len(order), dtype=np.int64)
+        remap[order] = np.arange(len(order))
+        return np.where(codes >= 0, remap[np.maximum(codes, 0)], -1), categories[order]
+    try:
+        codes, labels = pd.factorize(series, sort=True)
+    except TypeError:
+        codes, labels = pd.factorize(series.astype(str).where(series.notna()), sort=True)
+    return codes.astype(np.int64), labels
+
+
+class GroupIndex:
+    """Which group each row belongs to, for one set of group columns.
+
+    Built once per set of columns and data version; every aggregate and filter over those
+    groups reuses it.
+    """
+
+    def __init__(self, frame, columns, bucket=None):
+        self.columns = list(columns)
+        codes, sizes, labels = None, [], []
+        for col in self.columns:
+            col_codes, col_labels = column_codes(frame[col], bucket)
+            size = max(1, len(col_labels))
+            if codes is None:
+                codes = col_codes
+            else:
+                codes = np.where((codes >= 0) & (col_codes >= 0), codes * size + col_codes, -1)
+            sizes.append(size)
+            labels.append(col_labels)
+        if codes is None:
+            raise ValueError("Choose at least one column to group by.")
+        groups = int(np.prod(sizes, dtype=np.float64))
+        if groups > max(len(frame), 2**20):
+            # Too many possible key combinations for dense arrays; number only the ones present.
+            valid = codes >= 0
+            combined, composite = pd.factorize(codes[valid], sort=True)
+            self.codes = np.full(len(codes), -1, dtype=np.int64)
+            self.codes[valid] = combined
+        else:
+            self.codes = codes
+            composite = np.arange(groups)
+        self.ngroups = len(composite)
+        parts = np.unravel_index(composite, sizes)
+        self.keys = [col_labels[part] if len(col_labels) else col_labels for col_labels, part in zip(labels, parts)]
+        self.complete = bool((self.codes >= 0).all())
+        self.rows = None
+        self.order = None
+        self.sorted_codes = None
+
+    def group_rows(self, mask=None):
+        """Rows in each group, among those in mask (all rows if None)."""
+        if mask is not None:
+            codes = self.codes[mask]
+            return np.bincount(codes[codes >= 0], minlength=self.ngroups)
+        if self.rows is None:
+            self.rows = np.bincount(self.codes if self.complete else self.codes[self.codes >= 0], minlength=self.ngroups)
+        return self.rows
+
+    def sorted_order(self):
+        # Rows grouped together, in row order within each group; percentiles reuse it across filters.
+        if self.order is None:
+            # Stable sorts of 16-bit keys are radix sorts, several times faster than on int64.
+            keys = self.codes.astype(np.int16) if self.ngroups < 2**15 else self.codes
+            self.order = np.argsort(keys, kind="stable")
+            self.sorted_codes = self.codes[self.order]
+        return self.order, self.sorted_codes
+
+    def key_index(self, groups):
+        if len(self.columns) == 1:
+            return pd.Index(self.keys[0][groups], name=self.columns[0])
+        return pd.MultiIndex.from_arrays([keys[groups] for keys in self.keys], names=self.columns)
+
+
+def grouped_percentile(index, mask, values, q):
+    order, codes = index.sorted_order()
+    if mask is not None:
+        keep = mask[order]
+        order, codes = order[keep], codes[keep]
+    values = values[order]
+    valid = (codes >= 0) & ~np.isnan(values)
+    codes, values = codes[valid], values[valid]
+    result = np.full(index.ngroups, np.nan)
+    starts = np.searchsorted(codes, np.arange(index.ngroups))
+    counts = np.bincount(codes, minlength=index.ngroups)
+    groups = np.flatnonzero(counts)
+    if index.ngroups > SELECT_GROUPS:
+        values = values[np.lexsort((values, codes))]
+        position = q * (counts[groups] - 1)
+        low, high = starts[groups] + np.floor(position).astype(np.int64), starts[groups] + np.ceil(position).astype(np.int64)
+        result[groups] = values[low] + (values[high] - values[low]) * (position - np.floor(position))
+        return result
+    for group in groups:
+        start, count = starts[group], counts[group]
+        position = q * (count - 1)
+        low, high = int(np.floor(position)), int(np.ceil(position))
+        # Selecting the two order statistics needed is linear, unlike sorting the group.
+        segment = np.partition(values[start:start + count], [low, high])
+        result[group] = segment[low] + (segment[high] - segment[low]) * (position - low)
+    return result
+
+
+def grouped_extreme(index, mask, values, agg):
+    codes = index.codes if mask is None else index.codes[mask]
+    values = values if mask is None else values[mask]
+    rows = codes >= 0
+    result = np.full(index.ngroups, np.nan)
+    # fmin and fmax skip NaN, so a group is NaN only when it has no values at all.
+    (np.fmin if agg == "min" else np.fmax).at(result, codes[rows], values[rows])
+    return result
+
+
+def aggregate_values(index, mask, values, agg):
+    """One aggregate per group of index, over the rows in mask (all rows if None)."""
+    if values is None:
+        if agg != "count":
+            raise ValueError(f"Choose a numeric column to take the {agg} of.")
+        return index.group_rows(mask).astype(np.float64)
+    if agg in ("min", "max"):
+        return grouped_extreme(index, mask, values, agg)
+    codes = index.codes if mask is None else index.codes[mask]
+    subset = values if mask is None else values[mask]
+    valid = ~np.isnan(subset)
+    if not index.complete:
+        valid &= codes >= 0
+    if not valid.all():
+        # Copying out the usable rows is skipped for the common case of no missing keys or values.
+        codes, subset = codes[valid], subset[valid]
+    counts = np.bincount(codes, minlength=index.ngroups)
+    if agg == "count":
+        return counts.astype(np.float64)
+    if agg in ("sum", "mean"):
+        totals = np.bincount(codes, weights=subset, minlength=index.ngroups)
+        if agg == "sum":
+            return totals
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 0, totals / counts, np.nan)
+    if agg in PERCENTILES:
+        return grouped_percentile(index, mask, values, PERCENTILES[agg])
+    raise ValueError(f"Unknown aggregate '{agg}'; use one of {', '.join(AGGREGATES)}.")
+
+
+def condition_mask(series, op, values):
+    if op in ("=", "!="):
+        matched = series.isin(values + [str(value) for value in values]).to_numpy()
+        return matched if op == "=" else ~matched
+    value = values[0]
+    if is_datetime64_any_dtype(series):
+        value = pd.Timestamp(str(value))
+    elif not is_numeric_column(series):
+        series, value = series.astype(str), str(value)
+    elif isinstance(value, str):
+        raise ValueError(f"'{series.name}' is numeric; compare it with a number, not '{value}'.")
+    return np.asarray(OPERATORS[op](series, value), dtype=bool)
+
+
+class AggregateQuery:
+    """Group by columns, aggregate one value column, optionally pivot one group column into columns."""
+
+    def __init__(self, group_by, value=None, agg="count", pivot=None, bucket=None, filters=""):
+        self.group_by = tuple(group_by)
+        self.value = value
+        self.agg = agg
+        self.pivot = pivot
+        self.bucket = bucket or None
+        self.filters = filters.strip() if filters else ""
+
+    def key(self):
+        return (self.group_by, self.value, self.agg, self.pivot, self.bucket, self.filters)
+
+    def group_columns(self):
+        columns = list(self.group_by)
+        if self.pivot is not None and self.pivot not in columns:
+            columns.append(self.pivot)
+        return columns
+
+    def columns(self):
+        return self.group_columns() + [col for col, _, _ in parse_filters(self.filters)] + ([self.value] if self.value is not None else [])
+
+
+class AggregationEngine:
+    """Runs AggregateQuery objects against a Dataset, caching by query and column versions.
+
+    Group indexes and filter masks are cached separately from results, so changing only the
+    aggregate, the value column or the filter reuses the grouping already done.
+    """
+
+    def __init__(self):
+        self.indexes = OrderedDict()
+        self.masks = OrderedDict()
+        self.results = OrderedDict()
+
+    def versions(self, dataset, columns):
+        missing = [col for col in columns if col not in dataset.frame.columns]
+        if missing:
+            raise ValueError(f"No column named {', '.join(map(str, missing))}.")
+        return tuple(dataset.column_versions.get(col) for col in columns)
+
+    def cached(self, entries, key, build, limit):
+        if key in entries:
+            entries.move_to_end(key)
+            return entries[key]
+        value = build()
+        entries[key] = value
+        while len(entries) > limit:
+            entries.popitem(last=False)
+        return value
+
+    def group_index(self, dataset, columns, bucket=None):
+        key = (tuple(columns), bucket, self.versions(dataset, columns))
+        return self.cached(self.indexes, key, lambda: GroupIndex(dataset.frame, columns, bucket), MAX_INDEXES)
+
+    def filter_mask(self, dataset, filters):
+        conditions = parse_filters(filters)
+        if not conditions:
+            return None
+        columns = [col for col, _, _ in conditions]
+        key = (filters, self.versions(dataset, columns))
+
+        def build():
+            mask = np.ones(len(dataset.frame), dtype=bool)
+            for col, op, values in conditions:
+                mask &= condition_mask(dataset.frame[col], op, values)
+            return mask
+
+        return self.cached(self.masks, key, build, MAX_MASKS)
+
+    def compute(self, dataset, query):
+        """A DataFrame of query's aggregate, indexed by group; one column per pivot value if pivoted."""
+        key = (query.key(), self.versions(dataset, query.columns()))
+        return self.cached(self.results, key, lambda: self.run(dataset, query), MAX_RESULTS)
+
+    def run(self, dataset, query):
+        frame = dataset.frame
+        values = None
+        if query.value is not None:
+            if not is_numeric_column(frame[query.value]):
+                if query.agg != "count":
+                    raise ValueError(f"'{query.value}' is not numeric; only count works on it.")
+                values = np.where(frame[query.value].isna().to_numpy(), np.nan, 0.0)
+            else:
+                values = column_values(frame[query.value])
+        index = self.group_index(dataset, query.group_columns(), query.bucket)
+        mask = self.filter_mask(dataset, query.filters)
+        result = aggregate_values(index, mask, values, query.agg)
+        present = np.flatnonzero(index.group_rows(mask))
+        name = f"{query.agg} of {query.value}" if query.value is not None else "count"
+        series = pd.Series(result[present], index=index.key_index(present), name=name)
+        if query.pivot is None:
+            return series.to_frame()
+        # Pivoting the only group column leaves a single row holding every pivot value.
+        pivoted = series.to_frame().T if len(query.group_columns()) == 1 else series.unstack(query.pivot)
+        pivoted.columns = [str(col) for col in pivoted.columns]
+        return pivoted
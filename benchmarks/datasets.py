@@ -0,0 +1,47 @@
+"""Deterministic synthetic datasets for the benchmark suite."""
+import numpy as np
+import pandas as pd
+
+SHAPES = {"narrow": 6, "wide": 60}
+KINDS = ("numeric", "string", "nan")
+WORDS = np.array(["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliet"])
+
+
+def parse_rows(text):
+    text = text.strip().lower()
+    for suffix, factor in (("m", 1_000_000), ("k", 1_000)):
+        if text.endswith(suffix):
+            return int(float(text[:-1]) * factor)
+    return int(text)
+
+
+def dataset_name(rows, shape, kind):
+    return f"{kind}-{shape}-{rows}"
+
+
+def make_dataset(rows, shape="narrow", kind="numeric", seed=0):
+    """Builds a frame of the given size.
+
+    numeric: floats and ints with a few outliers; string: half the columns are
+    low-cardinality words; nan: numeric with ~30% missing values in every column.
+    """
+    rng = np.random.default_rng(seed)
+    columns = SHAPES[shape]
+    data = {}
+    for i in range(columns):
+        name = f"c{i}"
+        if kind == "string" and i % 2:
+            data[name] = WORDS[rng.integers(0, len(WORDS), rows)].astype(object)
+        elif i % 3 == 2:
+            data[name] = rng.integers(0, 1000, rows)
+        else:
+            values = rng.normal(100.0, 15.0, rows)
+            outliers = rng.random(rows) < 0.001
+            values[outliers] *= 10
+            data[name] = values
+    frame = pd.DataFrame(data)
+    if kind == "nan":
+        for i, name in enumerate(frame.columns):
+            missing = rng.random(rows) < 0.3
+            frame[name] = frame[name].astype(np.float64).mask(missing)
+    return frame
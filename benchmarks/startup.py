@@ -0,0 +1,81 @@
+"""Measures cold-start time of the application in fresh interpreters.
+
+Reports the time to import main, the time until the first window has been
+drawn, and which heavy modules were already imported at that point.
+
+    python benchmarks/startup.py --runs 5 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["pandas", "numpy", "matplotlib", "pyarrow", "boto3", "azure", "google.cloud", "pymysql", "psycopg2", "requests"]
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+window = None
+error = None
+try:
+    app = main.MainApplication()
+    app.update()
+    window = time.perf_counter() - started
+    app.destroy()
+except Exception as e:
+    error = str(e)
+print(json.dumps({
+    "import_seconds": imported - started,
+    "window_seconds": window,
+    "error": error,
+    "modules": [name for name in %r if name in sys.modules],
+}))
+"""
+
+
+def run_once():
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE % HEAVY_MODULES],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    # Includes interpreter start-up, which is what a user waits for.
+    result["process_seconds"] = time.perf_counter() - started
+    return result
+
+
+def summarize(runs):
+    summary = {"runs": len(runs), "modules_at_startup": runs[-1]["modules"], "error": runs[-1]["error"]}
+    for key in ("import_seconds", "window_seconds", "process_seconds"):
+        values = [run[key] for run in runs if run[key] is not None]
+        if values:
+            summary[key] = {"median": statistics.median(values), "min": min(values), "max": max(values)}
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="Write the JSON summary to this file as well.")
+    args = parser.parse_args()
+
+    summary = summarize([run_once() for _ in range(args.runs)])
+    text = json.dumps(summary, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
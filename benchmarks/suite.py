@@ -0,0 +1,252 @@
+"""Times and measures peak memory of the data hot paths on synthetic datasets.
+
+Runs headless: the grid, statistics, cleaning, plotting and export code is
+exercised through the same modules the GUI calls.
+
+    python benchmarks/suite.py --sizes 10k,100k --output results.json
+    python benchmarks/suite.py --sizes 10k,100k --baseline baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import export
+import ingest
+from aggregate import AggregateQuery, AggregationEngine
+from cleaning import CleaningPlan, ReplaceOutliers
+from dataset import Dataset
+from gridview import GridView
+from plotting import PLOT_TYPES, draw_plot_data, prepare_plot_data
+from stats import StatisticsEngine
+
+from datasets import KINDS, SHAPES, dataset_name, make_dataset, parse_rows
+
+GROUPS = ("load", "display", "stats", "clean", "plot", "aggregate", "export")
+LOAD_FORMATS = (".csv", ".jsonl", ".json", ".parquet", ".xlsx")
+EXCEL_CELLS = 250_000
+# pandas parses a JSON array as one document, so it is benchmarked at the smaller sizes only.
+JSON_CELLS = 10_000_000
+MAX_CELLS = 100_000_000
+NOISE_SECONDS = 0.005
+NOISE_MB = 1.0
+
+
+def write_input(frame, path):
+    if path.endswith(".jsonl"):
+        frame.to_json(path, orient="records", lines=True)
+    elif path.endswith(".json"):
+        frame.to_json(path, orient="records")
+    else:
+        export.export(frame, path)
+
+
+def grid_session(frame):
+    # What display_dataframe and a few user interactions ask of the grid.
+    view = GridView(frame)
+    view.rows(0, 50)
+    view.apply(sort_column=0)
+    view.rows(len(frame) // 2, len(frame) // 2 + 50)
+    view.apply(sort_column=0, filter_column=min(1, len(frame.columns) - 1), text="1")
+    return view.rows(0, 50)
+
+
+# Plot types that count the categories of a text column instead of plotting its values.
+CATEGORY_PLOTS = ("Bar", "Pie")
+
+
+def render_plot(frame, plot_type, column=None):
+    plot_data = prepare_plot_data(frame, frame.columns[0] if column is None else column, plot_type)
+    figure = Figure()
+    draw_plot_data(figure.subplots(), plot_data)
+    FigureCanvasAgg(figure).draw()
+
+
+def regroup(engine, dataset, agg):
+    # Results are dropped so only the cached group index is reused, as when the user switches aggregates.
+    engine.results.clear()
+    return engine.compute(dataset, AggregateQuery([dataset.frame.columns[2]], dataset.frame.columns[0], agg))
+
+
+def cases(frame, workdir, groups):
+    """Yields (case name, callable) pairs for one dataset."""
+    if "load" in groups:
+        for extension in LOAD_FORMATS:
+            if extension == ".xlsx" and frame.size > EXCEL_CELLS:
+                continue
+            if extension == ".json" and frame.size > JSON_CELLS:
+                continue
+            path = os.path.join(workdir, "input" + extension)
+            write_input(frame, path)
+            yield f"load{extension}", lambda path=path: ingest.load(path)
+    if "display" in groups:
+        yield "display/grid", lambda: grid_session(frame)
+    if "stats" in groups:
+        yield "stats/compute", lambda: StatisticsEngine().compute(Dataset(frame))
+    if "clean" in groups:
+        yield "clean/default", lambda: CleaningPlan.default().run(frame)
+        yield "clean/replace_outliers", lambda: CleaningPlan([ReplaceOutliers()]).run(frame)
+    if "plot" in groups:
+        for plot_type in PLOT_TYPES:
+            yield f"plot/{plot_type}", lambda plot_type=plot_type: render_plot(frame, plot_type)
+        text_columns = [col for col in frame.columns if frame[col].dtype == object]
+        if text_columns:
+            for plot_type in CATEGORY_PLOTS:
+                yield f"plot/{plot_type}/text", lambda plot_type=plot_type: render_plot(frame, plot_type, text_columns[0])
+    if "aggregate" in groups:
+        dataset = Dataset(frame)
+        engine = AggregationEngine()
+        yield "aggregate/group", lambda: regroup(AggregationEngine(), dataset, "sum")
+        yield "aggregate/regroup", lambda: regroup(engine, dataset, "mean")
+        yield "aggregate/percentile", lambda: regroup(engine, dataset, "p90")
+    if "export" in groups:
+        for extension in export.available_extensions():
+            if extension == ".xlsx" and frame.size > EXCEL_CELLS:
+                continue
+            path = os.path.join(workdir, "output" + extension)
+            yield f"export{extension}", lambda path=path: export.export(frame, path)
+
+
+def measure(run, repeat):
+    """Best-of-repeat wall time, then one traced run for the peak.
+
+    tracemalloc sees NumPy and pandas allocations but not Arrow's memory pool.
+    """
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        seconds.append(time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return min(seconds), peak / 2**20
+
+
+def run_suite(sizes, shapes, kinds, groups, repeat=3, max_cells=MAX_CELLS, log=print):
+    results = []
+    workdir = tempfile.mkdtemp(prefix="bi-tool-bench-")
+    try:
+        for rows in sizes:
+            for shape in shapes:
+                for kind in kinds:
+                    if rows * SHAPES[shape] > max_cells:
+                        log(f"skip {dataset_name(rows, shape, kind)}: more than {max_cells:,} cells")
+                        continue
+                    frame = make_dataset(rows, shape, kind)
+                    name = dataset_name(rows, shape, kind)
+                    for case, run in cases(frame, workdir, groups):
+                        try:
+                            seconds, peak_mb = measure(run, repeat if rows < 1_000_000 else 1)
+                            error = None
+                        except Exception as e:
+                            seconds, peak_mb, error = None, None, f"{type(e).__name__}: {e}"
+                        results.append({
+                            "case": case,
+                            "dataset": name,
+                            "rows": rows,
+                            "columns": len(frame.columns),
+                            "seconds": seconds,
+                            "peak_mb": peak_mb,
+                            "error": error,
+                        })
+                        if error:
+                            log(f"{name:28} {case:24} error: {error}")
+                        else:
+                            log(f"{name:28} {case:24} {seconds:9.4f}s {peak_mb:10.1f} MB")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Returns result/baseline pairs that got slower or larger by more than threshold."""
+    previous = {(entry["case"], entry["dataset"]): entry for entry in baseline["results"]}
+    regressions = []
+    for entry in results["results"]:
+        base = previous.get((entry["case"], entry["dataset"]))
+        if base is None or entry["error"] or base["error"]:
+            continue
+        slower = entry["seconds"] > base["seconds"] * threshold and entry["seconds"] - base["seconds"] > NOISE_SECONDS
+        larger = entry["peak_mb"] > base["peak_mb"] * threshold and entry["peak_mb"] - base["peak_mb"] > NOISE_MB
+        if slower or larger:
+            regressions.append((entry, base))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10k,100k", help="Comma-separated row counts, e.g. 10k,100k,1m,10m.")
+    parser.add_argument("--shapes", default=",".join(SHAPES), help="Comma-separated: narrow, wide.")
+    parser.add_argument("--kinds", default=",".join(KINDS), help="Comma-separated: numeric, string, nan.")
+    parser.add_argument("--groups", default=",".join(GROUPS), help="Comma-separated: " + ", ".join(GROUPS) + ".")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case below 1M rows (best is kept).")
+    parser.add_argument("--max-cells", type=int, default=MAX_CELLS, help="Skip datasets larger than this many cells.")
+    parser.add_argument("--output", help="Write results JSON here.")
+    parser.add_argument("--baseline", help="Compare against this results JSON and exit 1 on regressions.")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Ratio to baseline that counts as a regression.")
+    parser.add_argument("--update-baseline", action="store_true", help="Overwrite --baseline with these results.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run_suite(
+        [parse_rows(size) for size in args.sizes.split(",")],
+        args.shapes.split(","),
+        args.kinds.split(","),
+        args.groups.split(","),
+        repeat=max(1, args.repeat),
+        max_cells=args.max_cells,
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if not args.baseline:
+        return 0
+    if args.update_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    for entry, base in regressions:
+        print(
+            f"REGRESSION {entry['dataset']} {entry['case']}: "
+            f"{base['seconds']:.4f}s → {entry['seconds']:.4f}s, {base['peak_mb']:.1f} → {entry['peak_mb']:.1f} MB"
+        )
+    print(f"{len(regressions)} regressions against {args.baseline} (threshold {args.threshold:.2f}x)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
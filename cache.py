@@ -0,0 +1,210 @@
+import hashlib
+import importlib.util
+import json
+import os
+import threading
+
+CACHE_FORMAT_VERSION = "1"
+CACHE_DIR = os.environ.get("BI_TOOL_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".bi-tool", "cache"))
+MAX_CACHE_BYTES = 4 * 2**30
+OBJECT_CACHE_DIR = os.path.join(CACHE_DIR, "objects")
+MAX_OBJECT_CACHE_BYTES = 20 * 2**30
+HTTP_CACHE_DIR = os.path.join(CACHE_DIR, "http")
+MAX_HTTP_CACHE_BYTES = 4 * 2**30
+SAMPLE_BYTES = 2**20
+
+
+def content_digest(file_path, sample_bytes=SAMPLE_BYTES):
+    # Hashes the head, middle and tail of large files so fingerprinting stays cheap.
+    digest = hashlib.sha256()
+    size = os.path.getsize(file_path)
+    with open(file_path, "rb") as f:
+        if size <= 3 * sample_bytes:
+            digest.update(f.read())
+        else:
+            for offset in (0, size // 2, size - sample_bytes):
+                f.seek(offset)
+                digest.update(f.read(sample_bytes))
+    return digest.hexdigest()
+
+
+class DirectoryCache:
+    temp_suffixes = (".tmp", ".part")
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+
+    def entries(self):
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        entries = []
+        for name in names:
+            if name.endswith(self.temp_suffixes):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if os.path.isfile(path):
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def evict(self):
+        with self.lock:
+            entries = self.entries()
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+
+    def clear(self):
+        with self.lock:
+            for _, _, path in self.entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+class ColumnarCache(DirectoryCache):
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        super().__init__(directory, max_bytes)
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0 and importlib.util.find_spec("pyarrow") is not None
+
+    def key_for_file(self, file_path, *parts):
+        stat = os.stat(file_path)
+        return self.derived_key(
+            CACHE_FORMAT_VERSION,
+            os.path.abspath(file_path),
+            stat.st_size,
+            stat.st_mtime_ns,
+            content_digest(file_path),
+            *parts,
+        )
+
+    def derived_key(self, *parts):
+        return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.directory, f"{key}.feather")
+
+    def get(self, key, columns=None):
+        if not self.enabled or key is None:
+            return None
+        import pyarrow as pa
+        from pyarrow import feather
+
+        path = self.entry_path(key)
+        try:
+            table = feather.read_table(path, columns=columns, memory_map=True)
+            os.utime(path)
+        except (OSError, pa.ArrowException):
+            return None
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    def put(self, key, frame):
+        if not self.enabled or key is None:
+            return False
+        import pyarrow as pa
+        from pyarrow import feather
+
+        path = self.entry_path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            table = pa.Table.from_pandas(frame)
+            feather.write_feather(table, temp_path, compression="uncompressed")
+            os.replace(temp_path, path)
+        except (OSError, TypeError, ValueError, pa.ArrowException):
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+        self.evict()
+        return True
+
+    def put_in_background(self, key, frame):
+        if self.enabled and key is not None:
+            threading.Thread(target=self.put, args=(key, frame), daemon=True).start()
+
+
+class ObjectCache(DirectoryCache):
+    def __init__(self, directory=OBJECT_CACHE_DIR, max_bytes=MAX_OBJECT_CACHE_BYTES):
+        super().__init__(directory, max_bytes)
+
+    def path_for(self, name, etag):
+        digest = hashlib.sha256(repr((name, etag)).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest + os.path.splitext(name)[1].lower())
+
+    def lookup(self, name, etag):
+        path = self.path_for(name, etag)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def reserve(self, name, etag):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(name, etag)
+        return path, f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+
+    def commit(self, part_path, path):
+        os.replace(part_path, path)
+        self.evict()
+        return path
+
+
+class ResponseCache(DirectoryCache):
+    # Response bodies are stored decoded, next to the validators needed to revalidate them.
+    def __init__(self, directory=HTTP_CACHE_DIR, max_bytes=MAX_HTTP_CACHE_BYTES):
+        super().__init__(directory, max_bytes)
+
+    def base_path(self, url):
+        return os.path.join(self.directory, hashlib.sha256(url.encode("utf-8")).hexdigest())
+
+    def lookup(self, url):
+        base = self.base_path(url)
+        try:
+            with open(f"{base}.headers", encoding="utf-8") as f:
+                headers = json.load(f)
+            path = base + headers["extension"]
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            return None, None
+        return path, headers
+
+    def validators(self, headers):
+        validators = {}
+        if headers and headers.get("etag"):
+            validators["If-None-Match"] = headers["etag"]
+        if headers and headers.get("last_modified"):
+            validators["If-Modified-Since"] = headers["last_modified"]
+        return validators
+
+    def reserve(self, url, extension):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.base_path(url) + extension
+        return path, f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+
+    def commit(self, url, part_path, path, headers):
+        os.replace(part_path, path)
+        headers_path = f"{self.base_path(url)}.headers"
+        temp_path = f"{headers_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(dict(headers, extension=os.path.splitext(path)[1]), f)
+        os.replace(temp_path, headers_path)
+        self.evict()
+        return path
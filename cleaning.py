@@ -0,0 +1,223 @@
+import time
+
+import numpy as np
+
+from stats import BATCH_VALUES, column_values, is_numeric_column
+
+
+def spread(values):
+    # Row means, absolute deviations from them (NaN counted as zero) and sample standard deviations.
+    missing = np.isnan(values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if missing.any():
+            count = np.count_nonzero(~missing, axis=1)
+            mean = np.where(missing, 0.0, values).sum(axis=1) / count
+        else:
+            count = values.shape[1]
+            mean = values.mean(axis=1)
+        deviation = np.abs(values - mean[:, None])
+        deviation[missing] = 0.0
+        std = np.sqrt(np.einsum("ij,ij->i", deviation, deviation) / (count - 1))
+    return mean[:, None], deviation, std[:, None]
+
+
+class CleaningStep:
+    name = "step"
+    filters_rows = False
+    # Steps that can run chunk by chunk given each column's overall mean and std.
+    streaming = False
+
+    def key(self):
+        return (type(self).__name__, tuple(sorted(vars(self).items())))
+
+    def select(self, numeric_columns):
+        columns = getattr(self, "columns", None)
+        if columns is None:
+            return list(numeric_columns)
+        return [col for col in numeric_columns if col in columns]
+
+
+class DropMissing(CleaningStep):
+    name = "Drop missing values"
+    filters_rows = True
+
+    def row_mask(self, frame):
+        keep = np.ones(len(frame), dtype=bool)
+        for col in frame.columns:
+            values = frame[col].to_numpy()
+            if values.dtype.kind == "f":
+                keep &= values == values
+            else:
+                keep &= frame[col].notna().to_numpy()
+        return keep
+
+
+class ReplaceOutliers(CleaningStep):
+    name = "Replace outliers with mean"
+    streaming = True
+
+    def __init__(self, threshold=2.5, columns=None):
+        self.threshold = threshold
+        self.columns = columns
+
+    def apply(self, values):
+        mean, deviation, std = spread(values)
+        with np.errstate(invalid="ignore"):
+            outliers = deviation > self.threshold * std
+        np.copyto(values, mean, where=outliers)
+        return outliers
+
+    def apply_moments(self, values, mean, std):
+        with np.errstate(invalid="ignore"):
+            outliers = np.abs(values - mean) > self.threshold * std
+        np.copyto(values, mean, where=outliers)
+        return outliers
+
+
+class ClipValues(CleaningStep):
+    name = "Clip to quantile range"
+
+    def __init__(self, lower=0.01, upper=0.99, columns=None):
+        self.lower = lower
+        self.upper = upper
+        self.columns = columns
+
+    def apply(self, values):
+        with np.errstate(invalid="ignore"):
+            bounds = np.nanquantile(values, [self.lower, self.upper], axis=1)
+            low, high = bounds[0][:, None], bounds[1][:, None]
+            clipped = (values < low) | (values > high)
+        np.clip(values, low, high, out=values)
+        return clipped
+
+
+class ImputeMissing(CleaningStep):
+    name = "Impute missing values"
+
+    def __init__(self, strategy="mean", columns=None):
+        self.strategy = strategy
+        self.columns = columns
+
+    @property
+    def streaming(self):
+        return self.strategy == "mean"
+
+    def apply(self, values):
+        missing = np.isnan(values)
+        with np.errstate(invalid="ignore"):
+            if self.strategy == "median":
+                fill = np.nanmedian(values, axis=1, keepdims=True)
+            else:
+                fill = np.nanmean(values, axis=1, keepdims=True)
+        np.copyto(values, fill, where=missing)
+        return missing
+
+    def apply_moments(self, values, mean, std):
+        missing = np.isnan(values)
+        np.copyto(values, mean, where=missing)
+        return missing
+
+
+class CleaningReport:
+    def __init__(self):
+        self.steps = []
+        self.changed_columns = set()
+        self.rows_dropped = 0
+        self.seconds = 0.0
+
+    def add(self, step, seconds=0.0, rows=0, cells=0):
+        for entry in self.steps:
+            if entry["step"] is step:
+                entry["seconds"] += seconds
+                entry["rows"] += rows
+                entry["cells"] += cells
+                return
+        self.steps.append({"step": step, "name": step.name, "seconds": seconds, "rows": rows, "cells": cells})
+
+    def format(self):
+        lines = [
+            f"{entry['name']}: {entry['rows']:,} rows, {entry['cells']:,} cells in {entry['seconds']:.3f}s"
+            for entry in self.steps
+        ]
+        lines.append(f"Total: {self.seconds:.3f}s")
+        return "\n".join(lines)
+
+
+class CleaningPlan:
+    def __init__(self, steps):
+        self.steps = list(steps)
+
+    @classmethod
+    def default(cls):
+        return cls([DropMissing(), ReplaceOutliers(threshold=2.5)])
+
+    def key(self):
+        return tuple(step.key() for step in self.steps)
+
+    def stages(self):
+        stages = []
+        for step in self.steps:
+            if step.filters_rows or not stages or stages[-1][0].filters_rows:
+                stages.append([step])
+            else:
+                stages[-1].append(step)
+        return stages
+
+    def run(self, frame):
+        report = CleaningReport()
+        started = time.perf_counter()
+        result = frame
+        for stage in self.stages():
+            if stage[0].filters_rows:
+                result = self.filter_rows(result, stage, report)
+            else:
+                result = self.transform_values(result, stage, report)
+        report.seconds = time.perf_counter() - started
+        return result, report
+
+    def filter_rows(self, frame, stage, report):
+        keep = np.ones(len(frame), dtype=bool)
+        for step in stage:
+            started = time.perf_counter()
+            mask = step.row_mask(frame)
+            report.add(step, time.perf_counter() - started, rows=int(np.count_nonzero(keep & ~mask)))
+            keep &= mask
+        if keep.all():
+            return frame
+        report.rows_dropped += len(frame) - int(np.count_nonzero(keep))
+        report.changed_columns.update(frame.columns)
+        return frame.take(np.flatnonzero(keep))
+
+    def transform_values(self, frame, stage, report):
+        numeric_columns = [col for col in frame.columns if is_numeric_column(frame[col])]
+        columns = [col for col in numeric_columns if any(col in step.select(numeric_columns) for step in stage)]
+        result = frame
+        batch_size = max(1, BATCH_VALUES // max(1, len(frame)))
+        # A row can change in several column batches, so rows are counted once all batches have run.
+        affected_rows = [np.zeros(len(frame), dtype=bool) for _ in stage] if columns else []
+        for start in range(0, len(columns), batch_size):
+            batch = columns[start:start + batch_size]
+            values = np.empty((len(batch), len(frame)), dtype=np.float64)
+            for i, col in enumerate(batch):
+                values[i] = column_values(frame[col])
+            changed = np.zeros(len(batch), dtype=bool)
+            for step, rows in zip(stage, affected_rows):
+                selected = [i for i, col in enumerate(batch) if col in step.select(numeric_columns)]
+                started = time.perf_counter()
+                if len(selected) == len(batch):
+                    affected = step.apply(values)
+                else:
+                    subset = values[selected]
+                    affected = step.apply(subset)
+                    values[selected] = subset
+                changed[selected] |= affected.any(axis=1)
+                rows |= affected.any(axis=0)
+                report.add(step, time.perf_counter() - started, cells=int(np.count_nonzero(affected)))
+            for i in np.flatnonzero(changed):
+                if result is frame:
+                    result = frame.copy(deep=False)
+                result[batch[i]] = values[i] if changed.all() else values[i].copy()
+                report.changed_columns.add(batch[i])
+        for step, rows in zip(stage, affected_rows):
+            report.add(step, rows=int(np.count_nonzero(rows)))
+        return result
@@ -0,0 +1,71 @@
+"""Batch load → clean → stats → export without the GUI.
+
+    python cli.py partners/*.csv --output cleaned --format .parquet --workers 8
+"""
+import argparse
+import csv
+import logging
+import os
+import sys
+import time
+
+import export
+from pipeline import SUMMARY_FIELDS, expand_inputs, run_batch
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Clean and export many data files in parallel.")
+    parser.add_argument("inputs", nargs="+", help="Files, directories or glob patterns to process.")
+    parser.add_argument("-o", "--output", required=True, help="Directory for cleaned files.")
+    parser.add_argument("-f", "--format", default=".csv", choices=list(export.EXPORT_FORMATS), help="Output format (default: .csv).")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="Worker processes (default: CPU count).")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Descend into subdirectories of directory inputs.")
+    parser.add_argument("--summary", help="Per-file summary CSV (default: OUTPUT/summary.csv).")
+    parser.add_argument("--no-clean", action="store_true", help="Export the data as loaded.")
+    parser.add_argument("--no-stats", action="store_true", help="Skip writing <name>.stats.json files.")
+    parser.add_argument("--compact", action="store_true", help="Downcast numbers and encode repeated strings as categories after loading.")
+    parser.add_argument("--memory-budget", type=int, metavar="MB", help="Process files that would not fit in this many MB chunk by chunk from disk.")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the columnar cache.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log a JSON event for every pipeline stage.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(asctime)s %(name)s %(message)s")
+    paths = expand_inputs(args.inputs, args.recursive)
+    if not paths:
+        print("No supported input files found.", file=sys.stderr)
+        return 2
+    os.makedirs(args.output, exist_ok=True)
+    summary_path = args.summary or os.path.join(args.output, "summary.csv")
+
+    started = time.perf_counter()
+    failures = 0
+    with open(summary_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        results = run_batch(
+            paths,
+            args.output,
+            args.format,
+            workers=max(1, args.workers),
+            clean=not args.no_clean,
+            statistics=not args.no_stats,
+            use_cache=not args.no_cache,
+            compact=args.compact,
+            memory_budget=args.memory_budget * 2**20 if args.memory_budget else None,
+        )
+        for i, summary in enumerate(results, 1):
+            writer.writerow(summary)
+            f.flush()
+            failures += summary["status"] != "ok"
+            detail = summary["error"] or f"{summary['rows_in']:,} → {summary['rows_out']:,} rows"
+            print(f"[{i}/{len(paths)}] {summary['status']}: {summary['input']} ({detail})")
+
+    print(f"Processed {len(paths)} files in {time.perf_counter() - started:.1f}s, {failures} failed. Summary: {summary_path}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,326 @@
+import hashlib
+import io
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import ingest
+from connectors import module_available
+
+PART_SIZE = 8 * 2**20
+MAX_WORKERS = 8
+MAX_OBJECTS = 1000
+READ_BUFFER = 2**20
+STREAMING_EXTENSIONS = (".csv", ".jsonl", ".ndjson")
+
+ObjectInfo = namedtuple("ObjectInfo", ["key", "size", "etag"])
+
+
+class S3Storage:
+    scheme = "s3"
+    module_name = "boto3"
+
+    def __init__(self, access_key, secret_key, endpoint_url=None):
+        import boto3
+        from botocore.config import Config
+
+        session = boto3.Session(aws_access_key_id=access_key, aws_secret_access_key=secret_key)
+        self.client = session.client(
+            "s3",
+            endpoint_url=endpoint_url or None,
+            config=Config(max_pool_connections=MAX_WORKERS * 2),
+        )
+
+    def list_containers(self):
+        return [bucket["Name"] for bucket in self.client.list_buckets()["Buckets"]]
+
+    def list_objects(self, container, prefix="", limit=MAX_OBJECTS):
+        objects = []
+        for page in self.client.get_paginator("list_objects_v2").paginate(Bucket=container, Prefix=prefix):
+            for item in page.get("Contents", []):
+                objects.append(ObjectInfo(item["Key"], item["Size"], item["ETag"].strip('"')))
+                if len(objects) >= limit:
+                    return objects
+        return objects
+
+    def head(self, container, key):
+        response = self.client.head_object(Bucket=container, Key=key)
+        return ObjectInfo(key, response["ContentLength"], response["ETag"].strip('"'))
+
+    def read_range(self, container, key, start, end, etag=None):
+        extra = {"IfMatch": etag} if etag else {}
+        response = self.client.get_object(Bucket=container, Key=key, Range=f"bytes={start}-{end - 1}", **extra)
+        return response["Body"].read()
+
+
+class AzureStorage:
+    scheme = "azure"
+    module_name = "azure.storage.blob"
+
+    def __init__(self, account_name, account_key, endpoint_url=None):
+        from azure.storage.blob import BlobServiceClient
+
+        connect_str = f"DefaultEndpointsProtocol=https;AccountName={account_name};AccountKey={account_key};EndpointSuffix=core.windows.net"
+        if endpoint_url:
+            connect_str += f";BlobEndpoint={endpoint_url}"
+        self.client = BlobServiceClient.from_connection_string(connect_str)
+
+    def list_containers(self):
+        return [container["name"] for container in self.client.list_containers()]
+
+    def list_objects(self, container, prefix="", limit=MAX_OBJECTS):
+        objects = []
+        for blob in self.client.get_container_client(container).list_blobs(name_starts_with=prefix or None):
+            objects.append(ObjectInfo(blob.name, blob.size, blob.etag.strip('"')))
+            if len(objects) >= limit:
+                break
+        return objects
+
+    def head(self, container, key):
+        properties = self.client.get_blob_client(container, key).get_blob_properties()
+        return ObjectInfo(key, properties.size, properties.etag.strip('"'))
+
+    def read_range(self, container, key, start, end, etag=None):
+        from azure.core import MatchConditions
+
+        extra = {"etag": f'"{etag}"', "match_condition": MatchConditions.IfNotModified} if etag else {}
+        blob = self.client.get_blob_client(container, key)
+        return blob.download_blob(offset=start, length=end - start, **extra).readall()
+
+
+class GCSStorage:
+    scheme = "gs"
+    module_name = "google.cloud.storage"
+
+    def __init__(self, service_account_json, secret_key=None, endpoint_url=None):
+        from google.cloud import storage
+
+        self.client = storage.Client.from_service_account_json(service_account_json)
+
+    def list_containers(self):
+        return [bucket.name for bucket in self.client.list_buckets()]
+
+    def list_objects(self, container, prefix="", limit=MAX_OBJECTS):
+        blobs = self.client.list_blobs(container, prefix=prefix or None, max_results=limit)
+        return [ObjectInfo(blob.name, blob.size, blob.etag) for blob in blobs]
+
+    def head(self, container, key):
+        blob = self.client.bucket(container).get_blob(key)
+        if blob is None:
+            raise FileNotFoundError(f"gs://{container}/{key} does not exist.")
+        return ObjectInfo(key, blob.size, blob.etag)
+
+    def read_range(self, container, key, start, end, etag=None):
+        return self.client.bucket(container).blob(key).download_as_bytes(start=start, end=end - 1)
+
+
+class MemoryStorage:
+    scheme = "memory"
+
+    def __init__(self, containers=None):
+        self.containers = containers or {}
+        self.range_requests = 0
+
+    def put(self, container, key, data):
+        self.containers.setdefault(container, {})[key] = data
+
+    def list_containers(self):
+        return sorted(self.containers)
+
+    def list_objects(self, container, prefix="", limit=MAX_OBJECTS):
+        objects = self.containers[container]
+        keys = sorted(key for key in objects if key.startswith(prefix))[:limit]
+        return [self.head(container, key) for key in keys]
+
+    def head(self, container, key):
+        data = self.containers[container][key]
+        return ObjectInfo(key, len(data), hashlib.md5(data).hexdigest())
+
+    def read_range(self, container, key, start, end, etag=None):
+        if etag and self.head(container, key).etag != etag:
+            raise ValueError(f"{key} changed during download.")
+        self.range_requests += 1
+        return self.containers[container][key][start:end]
+
+
+STORAGES = {
+    "AWS": S3Storage,
+    "Azure": AzureStorage,
+    "GCP": GCSStorage,
+}
+
+
+def available_storages():
+    return [name for name, storage in STORAGES.items() if module_available(storage.module_name)]
+
+
+def connect_storage(service_type, access_key, secret_key, endpoint_url=None):
+    if service_type not in STORAGES:
+        raise ValueError("Unsupported cloud service type.")
+    return STORAGES[service_type](access_key, secret_key, endpoint_url)
+
+
+class DownloadCancelled(Exception):
+    pass
+
+
+class RangedDownload:
+    def __init__(self, storage, container, info, path, part_size=PART_SIZE, workers=MAX_WORKERS):
+        self.storage = storage
+        self.container = container
+        self.info = info
+        self.path = path
+        self.workers = workers
+        self.parts = [(start, min(start + part_size, info.size)) for start in range(0, info.size, part_size)]
+        self.finished_parts = [False] * len(self.parts)
+        self.next_part = 0
+        self.contiguous_bytes = 0
+        self.bytes_done = 0
+        self.error = None
+        self.cancelled = False
+        self.condition = threading.Condition()
+        self.futures = []
+
+    def start(self):
+        with open(self.path, "wb") as f:
+            f.truncate(self.info.size)
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        # Parts are submitted in order so the readable prefix grows from the start of the object.
+        self.futures = [executor.submit(self.fetch_part, i) for i in range(len(self.parts))]
+        executor.shutdown(wait=False)
+        return self
+
+    def fetch_part(self, index):
+        if self.cancelled or self.error is not None:
+            return
+        start, end = self.parts[index]
+        try:
+            data = self.storage.read_range(self.container, self.info.key, start, end, self.info.etag)
+            if len(data) != end - start:
+                raise IOError(f"Expected {end - start} bytes at offset {start}, got {len(data)}.")
+            with open(self.path, "r+b") as f:
+                f.seek(start)
+                f.write(data)
+        except Exception as e:
+            with self.condition:
+                self.error = self.error or e
+                self.condition.notify_all()
+            return
+        with self.condition:
+            self.finished_parts[index] = True
+            self.bytes_done += end - start
+            while self.next_part < len(self.parts) and self.finished_parts[self.next_part]:
+                self.contiguous_bytes = self.parts[self.next_part][1]
+                self.next_part += 1
+            self.condition.notify_all()
+
+    def wait_for(self, offset):
+        offset = min(offset, self.info.size)
+        with self.condition:
+            self.condition.wait_for(lambda: self.error is not None or self.cancelled or self.contiguous_bytes >= offset)
+            if self.cancelled:
+                raise DownloadCancelled()
+            if self.error is not None:
+                raise self.error
+            return self.contiguous_bytes
+
+    def wait(self):
+        return self.wait_for(self.info.size)
+
+    def cancel(self):
+        with self.condition:
+            self.cancelled = True
+            self.condition.notify_all()
+        for future in self.futures:
+            future.cancel()
+
+    def reader(self):
+        return io.BufferedReader(DownloadReader(self), buffer_size=READ_BUFFER)
+
+
+class DownloadReader(io.RawIOBase):
+    # Reads the part of a RangedDownload that has already arrived, blocking for the rest.
+    def __init__(self, download):
+        self.download = download
+        self.position = 0
+        self.file = open(download.path, "rb")
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self.position >= self.download.info.size:
+            return 0
+        available = self.download.wait_for(self.position + 1) - self.position
+        self.file.seek(self.position)
+        count = self.file.readinto(memoryview(buffer)[:available])
+        self.position += count
+        return count
+
+    def tell(self):
+        return self.position
+
+    def close(self):
+        self.file.close()
+        super().close()
+
+
+class ObjectSource:
+    def __init__(self, storage, container, key, object_cache, part_size=PART_SIZE, workers=MAX_WORKERS):
+        self.storage = storage
+        self.container = container
+        self.key = key
+        self.object_cache = object_cache
+        self.part_size = part_size
+        self.workers = workers
+        self.info = None
+
+    @property
+    def name(self):
+        return f"{self.storage.scheme}://{self.container}/{self.key}"
+
+    def object_info(self):
+        if self.info is None:
+            self.info = self.storage.head(self.container, self.key)
+        return self.info
+
+    def signature(self):
+        return self.object_info().etag
+
+    def cache_key(self, cache):
+        return cache.derived_key("object", self.name, self.signature())
+
+    def load(self, on_chunk=None, should_cancel=None):
+        info = self.object_info()
+        path = self.object_cache.lookup(self.name, info.etag)
+        if path is None:
+            path, part_path = self.object_cache.reserve(self.name, info.etag)
+            download = RangedDownload(self.storage, self.container, info, part_path, self.part_size, self.workers).start()
+            try:
+                if os.path.splitext(self.key)[1].lower() in STREAMING_EXTENSIONS:
+                    # Text formats are parsed from the downloaded prefix while later parts are still in flight.
+                    with download.reader() as stream:
+                        data = ingest.load(path, on_chunk=on_chunk, should_cancel=should_cancel, stream=stream, total_bytes=info.size)
+                    if data is None:
+                        download.cancel()
+                        return None
+                    download.wait()
+                    self.object_cache.commit(part_path, path)
+                    return data
+                while download.wait_for(download.contiguous_bytes + 1) < info.size:
+                    if should_cancel is not None and should_cancel():
+                        download.cancel()
+                        return None
+                    if on_chunk is not None:
+                        on_chunk(None, 0, download.contiguous_bytes, info.size)
+            except DownloadCancelled:
+                return None
+            except BaseException:
+                download.cancel()
+                raise
+            finally:
+                if download.cancelled and os.path.exists(part_path):
+                    os.remove(part_path)
+            self.object_cache.commit(part_path, path)
+        return ingest.load(path, on_chunk=on_chunk, should_cancel=should_cancel)
@@ -0,0 +1,129 @@
+import os
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+import cloud
+import ingest
+from instrument import stage
+from tasks import BackgroundTask
+
+
+class CloudServiceConnectionFrame(tk.Frame):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.parent = parent
+        self.selected_source = tk.StringVar()
+        self.storage = None
+        self.objects = []
+        
+        self.service_type = tk.StringVar()
+        self.access_key = tk.StringVar()
+        self.secret_key = tk.StringVar()
+        self.endpoint_url = tk.StringVar()
+        self.container = tk.StringVar()
+        self.prefix = tk.StringVar()
+        
+        self.label_service_type = ttk.Label(self, text="Service Type:")
+        self.label_service_type.grid(row=0, column=0, padx=5, pady=5, sticky="w")
+        self.entry_service_type = ttk.Combobox(self, textvariable=self.service_type, values=cloud.available_storages(), state="readonly")
+        self.entry_service_type.grid(row=0, column=1, padx=5, pady=5)
+        
+        self.label_access_key = ttk.Label(self, text="Access Key:")
+        self.label_access_key.grid(row=1, column=0, padx=5, pady=5, sticky="w")
+        self.entry_access_key = ttk.Entry(self, textvariable=self.access_key)
+        self.entry_access_key.grid(row=1, column=1, padx=5, pady=5)
+        
+        self.label_secret_key = ttk.Label(self, text="Secret Key:")
+        self.label_secret_key.grid(row=2, column=0, padx=5, pady=5, sticky="w")
+        self.entry_secret_key = ttk.Entry(self, textvariable=self.secret_key, show="*")
+        self.entry_secret_key.grid(row=2, column=1, padx=5, pady=5)
+
+        self.label_endpoint_url = ttk.Label(self, text="Endpoint URL (optional):")
+        self.label_endpoint_url.grid(row=3, column=0, padx=5, pady=5, sticky="w")
+        self.entry_endpoint_url = ttk.Entry(self, textvariable=self.endpoint_url)
+        self.entry_endpoint_url.grid(row=3, column=1, padx=5, pady=5)
+        
+        self.connect_button = ttk.Button(self, text="Connect", command=self.connect_to_cloud_service)
+        self.connect_button.grid(row=4, column=0, columnspan=2, padx=5, pady=5)
+
+        self.label_container = ttk.Label(self, text="Bucket / Container:")
+        self.label_container.grid(row=5, column=0, padx=5, pady=5, sticky="w")
+        self.container_box = ttk.Combobox(self, textvariable=self.container, state="readonly")
+        self.container_box.grid(row=5, column=1, padx=5, pady=5)
+
+        self.label_prefix = ttk.Label(self, text="Prefix:")
+        self.label_prefix.grid(row=6, column=0, padx=5, pady=5, sticky="w")
+        self.entry_prefix = ttk.Entry(self, textvariable=self.prefix)
+        self.entry_prefix.grid(row=6, column=1, padx=5, pady=5)
+
+        self.list_button = ttk.Button(self, text="List Objects", command=self.list_objects)
+        self.list_button.grid(row=7, column=0, columnspan=2, padx=5, pady=5)
+
+        self.object_list = tk.Listbox(self, width=60, height=8, exportselection=False)
+        self.object_list.grid(row=8, column=0, columnspan=2, padx=5, pady=5)
+
+        self.load_button = ttk.Button(self, text="Load Object", command=self.load_object)
+        self.load_button.grid(row=9, column=0, columnspan=2, padx=5, pady=5)
+        
+    def connect_to_cloud_service(self):
+        service_type = self.service_type.get()
+        access_key = self.access_key.get()
+        secret_key = self.secret_key.get()
+        endpoint_url = self.endpoint_url.get()
+
+        def run_connect(task):
+            with stage("cloud.connect", service=service_type):
+                storage = cloud.connect_storage(service_type, access_key, secret_key, endpoint_url)
+                return storage, storage.list_containers()
+
+        self.connect_button.config(state="disabled")
+        BackgroundTask(self, run_connect, self.on_connected, on_error=self.on_cloud_error).start()
+
+    def on_connected(self, result):
+        self.storage, containers = result
+        self.connect_button.config(state="normal")
+        self.container_box.config(values=containers)
+        if containers:
+            self.container.set(containers[0])
+        tk.messagebox.showinfo("Cloud Service Connection", f"Connected to {self.service_type.get()} successfully.")
+
+    def on_cloud_error(self, error):
+        self.connect_button.config(state="normal")
+        self.list_button.config(state="normal")
+        tk.messagebox.showerror("Cloud Service Connection", f"Failed to connect: {str(error)}")
+
+    def list_objects(self):
+        if self.storage is None or not self.container.get():
+            tk.messagebox.showerror("Cloud Service Connection", "Connect and choose a bucket first.")
+            return
+        storage, container, prefix = self.storage, self.container.get(), self.prefix.get()
+        self.list_button.config(state="disabled")
+        BackgroundTask(self, lambda task: self.fetch_objects(storage, container, prefix), self.on_objects_listed, on_error=self.on_cloud_error).start()
+
+    def fetch_objects(self, storage, container, prefix):
+        with stage("cloud.list", container=container, prefix=prefix) as record:
+            objects = storage.list_objects(container, prefix)
+            record.rows = len(objects)
+            return objects
+
+    def on_objects_listed(self, objects):
+        self.list_button.config(state="normal")
+        self.objects = [info for info in objects if not info.key.endswith("/")]
+        self.object_list.delete(0, tk.END)
+        for info in self.objects:
+            self.object_list.insert(tk.END, f"{info.key} ({info.size / 2**20:.1f} MB)")
+
+    def load_object(self):
+        selection = self.object_list.curselection()
+        if not selection:
+            tk.messagebox.showerror("Cloud Service Connection", "Select an object to load.")
+            return
+        info = self.objects[selection[0]]
+        if os.path.splitext(info.key)[1].lower() not in ingest.SUPPORTED_EXTENSIONS:
+            tk.messagebox.showerror("Cloud Service Connection", f"Unsupported file format: {info.key}")
+            return
+        self.pack_forget()
+        self.parent.label.pack_forget()
+        self.parent.combobox.pack_forget()
+        self.parent.select_button.pack_forget()
+        self.parent.create_process_frame(cloud.ObjectSource(self.storage, self.container.get(), info.key, self.parent.object_cache))
@@ -0,0 +1,104 @@
+import importlib.util
+import time
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import infer_dtype, is_bool_dtype, is_integer_dtype
+
+CATEGORY_RATIO = 0.5
+FLOAT32_MAX_INTEGER = 2 ** 24
+
+
+def arrow_strings_available():
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def compact_integers(series):
+    return pd.to_numeric(series, downcast="integer")
+
+
+def compact_floats(series):
+    # Only whole numbers (typically integer columns with gaps) go to float32: they convert
+    # back exactly and print the same way, so statistics, cleaning and text exports are unchanged.
+    values = series.to_numpy()
+    present = values[~np.isnan(values)]
+    if not len(present) or np.abs(present).max() > FLOAT32_MAX_INTEGER or not np.array_equal(present, np.trunc(present)):
+        return series
+    return series.astype(np.float32)
+
+
+def compact_strings(series, category_ratio=CATEGORY_RATIO):
+    if infer_dtype(series, skipna=True) != "string":
+        return series
+    present = series.count()
+    if series.nunique() <= category_ratio * present:
+        return series.astype("category")
+    if arrow_strings_available():
+        return series.astype("string[pyarrow]")
+    return series
+
+
+def compact_series(series, category_ratio=CATEGORY_RATIO):
+    if is_bool_dtype(series):
+        return series
+    if is_integer_dtype(series):
+        return compact_integers(series)
+    if series.dtype == np.float64:
+        return compact_floats(series)
+    if series.dtype == object:
+        return compact_strings(series, category_ratio)
+    return series
+
+
+class CompactionReport:
+    def __init__(self):
+        self.columns = {}
+        self.seconds = 0.0
+
+    def add(self, column, before, after):
+        before_bytes = before.memory_usage(deep=True, index=False)
+        self.columns[column] = {
+            "before_dtype": before.dtype,
+            "after_dtype": after.dtype,
+            "before_bytes": before_bytes,
+            "after_bytes": before_bytes if after is before else after.memory_usage(deep=True, index=False),
+        }
+
+    @property
+    def before_bytes(self):
+        return sum(entry["before_bytes"] for entry in self.columns.values())
+
+    @property
+    def after_bytes(self):
+        return sum(entry["after_bytes"] for entry in self.columns.values())
+
+    def format(self):
+        lines = [
+            f"{col}: {entry['before_dtype']} → {entry['after_dtype']}, "
+            f"{entry['before_bytes'] / 2**20:,.2f} → {entry['after_bytes'] / 2**20:,.2f} MB"
+            for col, entry in self.columns.items()
+        ]
+        lines.append(f"Total: {self.before_bytes / 2**20:,.2f} → {self.after_bytes / 2**20:,.2f} MB in {self.seconds:.3f}s")
+        return "\n".join(lines)
+
+
+def compact(frame, keep=(), category_ratio=CATEGORY_RATIO):
+    """Downcasts numbers and encodes strings compactly; returns (frame, report).
+
+    Columns in keep (for example ones the user gave an explicit dtype) are left as they are.
+    """
+    report = CompactionReport()
+    started = time.perf_counter()
+    result = frame
+    for col in frame.columns:
+        series = frame[col]
+        compacted = series if col in keep else compact_series(series, category_ratio)
+        if compacted.dtype == series.dtype:
+            compacted = series
+        report.add(col, series, compacted)
+        if compacted is not series:
+            if result is frame:
+                result = frame.copy(deep=False)
+            result[col] = compacted
+    report.seconds = time.perf_counter() - started
+    return result, report
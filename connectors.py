@@ -0,0 +1,44 @@
+import importlib
+import importlib.util
+
+
+def module_available(module_name):
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class Connector:
+    def __init__(self, name, module_name, class_name, requires=()):
+        self.name = name
+        self.module_name = module_name
+        self.class_name = class_name
+        self.requires = requires
+
+    def missing(self):
+        # A connector needs at least one of its optional SDKs; the rest only disable their own options.
+        if not self.requires or any(module_available(name) for name in self.requires):
+            return []
+        return list(self.requires)
+
+    def available(self):
+        return not self.missing()
+
+    def frame_class(self):
+        return getattr(importlib.import_module(self.module_name), self.class_name)
+
+
+CONNECTORS = {
+    connector.name: connector
+    for connector in (
+        Connector("Database", "database_frame", "DatabaseConnectionFrame", requires=("pymysql", "psycopg2", "sqlite3")),
+        Connector("Cloud Service", "cloud_frame", "CloudServiceConnectionFrame", requires=("boto3", "azure.storage.blob", "google.cloud.storage")),
+        Connector("File", "file_frame", "FileSelectionFrame"),
+        Connector("Web Source", "web_frame", "WebSourceConnectionFrame", requires=("requests",)),
+    )
+}
+
+
+def available_names():
+    return [name for name, connector in CONNECTORS.items() if connector.available()]
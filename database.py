@@ -0,0 +1,275 @@
+import importlib
+import importlib.util
+import itertools
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+BATCH_ROWS = 50_000
+POOL_SIZE = 4
+
+
+class Driver:
+    name = None
+    module_name = None
+
+    def available(self):
+        return importlib.util.find_spec(self.module_name) is not None
+
+    def module(self):
+        return importlib.import_module(self.module_name)
+
+    def connect(self, params):
+        raise NotImplementedError
+
+    def streaming_cursor(self, connection, batch_size):
+        return connection.cursor()
+
+    def is_alive(self, connection):
+        return True
+
+    def finish(self, connection):
+        pass
+
+
+class MySQLDriver(Driver):
+    name = "MySQL"
+    module_name = "pymysql"
+
+    def connect(self, params):
+        return self.module().connect(
+            host=params["host"],
+            port=int(params["port"] or 3306),
+            user=params["username"],
+            password=params["password"],
+            database=params["database"],
+        )
+
+    def streaming_cursor(self, connection, batch_size):
+        # SSCursor leaves the result set on the server and reads it as rows are fetched.
+        return connection.cursor(importlib.import_module("pymysql.cursors").SSCursor)
+
+    def is_alive(self, connection):
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+
+class PostgreSQLDriver(Driver):
+    name = "PostgreSQL"
+    module_name = "psycopg2"
+
+    def __init__(self):
+        self.cursor_ids = itertools.count()
+
+    def connect(self, params):
+        return self.module().connect(
+            host=params["host"],
+            port=params["port"] or 5432,
+            user=params["username"],
+            password=params["password"],
+            database=params["database"],
+        )
+
+    def streaming_cursor(self, connection, batch_size):
+        # Named cursors are server-side; rows arrive itersize at a time.
+        cursor = connection.cursor(name=f"bi_tool_{next(self.cursor_ids)}")
+        cursor.itersize = batch_size
+        return cursor
+
+    def is_alive(self, connection):
+        return not connection.closed
+
+    def finish(self, connection):
+        connection.rollback()
+
+
+class SQLiteDriver(Driver):
+    name = "SQLite"
+    module_name = "sqlite3"
+
+    def connect(self, params):
+        return self.module().connect(params["database"], check_same_thread=False)
+
+
+DRIVERS = {driver.name: driver for driver in (MySQLDriver(), PostgreSQLDriver(), SQLiteDriver())}
+
+
+class ConnectionPool:
+    def __init__(self, driver, params, max_size=POOL_SIZE):
+        self.driver = driver
+        self.params = params
+        self.idle = []
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(max_size)
+
+    @contextmanager
+    def connection(self):
+        self.slots.acquire()
+        try:
+            connection = self.checkout()
+            try:
+                yield connection
+            except BaseException:
+                self.discard(connection)
+                raise
+            else:
+                self.driver.finish(connection)
+                with self.lock:
+                    self.idle.append(connection)
+        finally:
+            self.slots.release()
+
+    def checkout(self):
+        while True:
+            with self.lock:
+                connection = self.idle.pop() if self.idle else None
+            if connection is None:
+                return self.driver.connect(self.params)
+            if self.driver.is_alive(connection):
+                return connection
+            self.discard(connection)
+
+    def discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close(self):
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for connection in idle:
+            self.discard(connection)
+
+
+POOLS = {}
+POOLS_LOCK = threading.Lock()
+
+
+def get_pool(db_type, params):
+    if db_type not in DRIVERS:
+        raise ValueError("Unsupported database type.")
+    key = (db_type, *sorted(params.items()))
+    with POOLS_LOCK:
+        if key not in POOLS:
+            POOLS[key] = ConnectionPool(DRIVERS[db_type], dict(params))
+        return POOLS[key]
+
+
+class QueryCancelled(Exception):
+    pass
+
+
+def batch_dtype(values):
+    """The dtype a fetched batch asks for, or None if it is all NULL and so says nothing about its column."""
+    if values.dtype == object and pd.isna(values).all():
+        return None
+    return values.dtype
+
+
+def column_dtype(current, batch):
+    # Integers that meet a NULL widen to float; numbers that meet text, to object.
+    if current is None or batch is None and current.kind not in "iub":
+        return current if batch is None else batch
+    if batch is None:
+        return np.dtype(np.float64)
+    if current == batch:
+        return current
+    if current.kind in "iufb" and batch.kind in "iufb":
+        return np.result_type(current, batch)
+    return np.dtype(object)
+
+
+class ColumnAccumulator:
+    # Holds fetched batches column by column so the result is assembled one column at a time.
+    # Each column gets one dtype, from the first batch that has values, and later batches are cast to it.
+    def __init__(self, columns):
+        self.columns = columns
+        self.parts = {i: [] for i in range(len(columns))}
+        self.dtypes = [None] * len(columns)
+        self.rows = 0
+
+    def add(self, rows):
+        chunk = pd.DataFrame.from_records(rows, columns=range(len(self.columns)), coerce_float=True)
+        for i in self.parts:
+            values = chunk[i].to_numpy()
+            dtype = column_dtype(self.dtypes[i], batch_dtype(values))
+            if self.dtypes[i] is None and self.parts[i] and dtype is not None:
+                # The batches so far were all NULL, which integers cannot hold.
+                dtype = column_dtype(dtype, None)
+            self.dtypes[i] = dtype
+            if dtype is not None and values.dtype != dtype:
+                values = values.astype(dtype)
+                chunk[i] = values
+            self.parts[i].append(values.copy() if values.base is not None else values)
+        self.rows += len(rows)
+        chunk.columns = self.columns
+        return chunk
+
+    def frame(self):
+        data = {}
+        for i in range(len(self.columns)):
+            parts = self.parts.pop(i)
+            dtype = self.dtypes[i] or np.dtype(object)
+            # Batches added before the column had to widen are cast now, once.
+            parts = [part if part.dtype == dtype else part.astype(dtype) for part in parts]
+            if len(parts) == 1:
+                data[i] = parts[0]
+            elif parts:
+                data[i] = np.concatenate(parts)
+            else:
+                data[i] = np.empty(0, dtype=dtype)
+        frame = pd.DataFrame(data, copy=False)
+        frame.columns = self.columns
+        return frame
+
+
+def run_query(db_type, params, sql, batch_size=BATCH_ROWS, on_batch=None, should_cancel=None):
+    pool = get_pool(db_type, params)
+    with pool.connection() as connection:
+        cursor = pool.driver.streaming_cursor(connection, batch_size)
+        cursor.execute(sql)
+        rows = cursor.fetchmany(batch_size)
+        if cursor.description is None:
+            cursor.close()
+            return pd.DataFrame()
+        accumulator = ColumnAccumulator([description[0] for description in cursor.description])
+        while rows:
+            if should_cancel is not None and should_cancel():
+                # The pool discards the connection, so the unread rows are never drained.
+                raise QueryCancelled()
+            chunk = accumulator.add(rows)
+            if on_batch is not None:
+                on_batch(chunk, accumulator.rows)
+            rows = cursor.fetchmany(batch_size)
+        cursor.close()
+        return accumulator.frame()
+
+
+class QuerySource:
+    def __init__(self, db_type, params, sql):
+        self.db_type = db_type
+        self.params = params
+        self.sql = sql
+
+    @property
+    def name(self):
+        return f"{self.db_type}: {self.params.get('database', '')}"
+
+    def cache_key(self, cache):
+        return None
+
+    def load(self, on_chunk=None, should_cancel=None):
+        def on_batch(chunk, rows):
+            if on_chunk is not None:
+                on_chunk(chunk, rows, 0, 0)
+
+        try:
+            return run_query(self.db_type, self.params, self.sql, on_batch=on_batch, should_cancel=should_cancel)
+        except QueryCancelled:
+            return None
@@ -0,0 +1,98 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+import database
+from instrument import stage
+
+
+class DatabaseConnectionFrame(tk.Frame):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.parent = parent
+        self.selected_source = tk.StringVar()
+        
+        
+        self.db_type = tk.StringVar()
+        self.host = tk.StringVar()
+        self.port = tk.StringVar()
+        self.username = tk.StringVar()
+        self.password = tk.StringVar()
+        self.database_name = tk.StringVar()
+        
+        self.label_db_type = ttk.Label(self, text="Database Type:")
+        self.label_db_type.grid(row=0, column=0, padx=5, pady=5, sticky="w")
+        self.entry_db_type = ttk.Combobox(self, textvariable=self.db_type, values=[name for name, driver in database.DRIVERS.items() if driver.available()])
+        self.entry_db_type.grid(row=0, column=1, padx=5, pady=5)
+        
+        self.label_host = ttk.Label(self, text="Host:")
+        self.label_host.grid(row=1, column=0, padx=5, pady=5, sticky="w")
+        self.entry_host = ttk.Entry(self, textvariable=self.host)
+        self.entry_host.grid(row=1, column=1, padx=5, pady=5)
+        
+        self.label_port = ttk.Label(self, text="Port:")
+        self.label_port.grid(row=2, column=0, padx=5, pady=5, sticky="w")
+        self.entry_port = ttk.Entry(self, textvariable=self.port)
+        self.entry_port.grid(row=2, column=1, padx=5, pady=5)
+        
+        self.label_username = ttk.Label(self, text="Username:")
+        self.label_username.grid(row=3, column=0, padx=5, pady=5, sticky="w")
+        self.entry_username = ttk.Entry(self, textvariable=self.username)
+        self.entry_username.grid(row=3, column=1, padx=5, pady=5)
+        
+        self.label_password = ttk.Label(self, text="Password:")
+        self.label_password.grid(row=4, column=0, padx=5, pady=5, sticky="w")
+        self.entry_password = ttk.Entry(self, textvariable=self.password, show="*")
+        self.entry_password.grid(row=4, column=1, padx=5, pady=5)
+        
+        self.label_database_name = ttk.Label(self, text="Database Name:")
+        self.label_database_name.grid(row=5, column=0, padx=5, pady=5, sticky="w")
+        self.entry_database_name = ttk.Entry(self, textvariable=self.database_name)
+        self.entry_database_name.grid(row=5, column=1, padx=5, pady=5)
+        
+        self.connect_button = ttk.Button(self, text="Connect", command=self.connect_to_database)
+        self.connect_button.grid(row=6, column=0, columnspan=2, padx=5, pady=5)
+
+        self.label_query = ttk.Label(self, text="SQL Query:")
+        self.label_query.grid(row=7, column=0, padx=5, pady=5, sticky="nw")
+        self.query_text = tk.Text(self, width=50, height=6, wrap="word")
+        self.query_text.grid(row=7, column=1, padx=5, pady=5)
+
+        self.query_button = ttk.Button(self, text="Run Query", command=self.run_query)
+        self.query_button.grid(row=8, column=0, columnspan=2, padx=5, pady=5)
+
+    def connection_params(self):
+        return {
+            "host": self.host.get(),
+            "port": self.port.get(),
+            "username": self.username.get(),
+            "password": self.password.get(),
+            "database": self.database_name.get(),
+        }
+
+    def connect_to_database(self):
+        db_type = self.db_type.get()
+        if db_type not in database.DRIVERS:
+            tk.messagebox.showerror("Database Connection", "Unsupported database type.")
+            return
+
+        try:
+            with stage("database.connect", db_type=db_type):
+                with database.get_pool(db_type, self.connection_params()).connection():
+                    pass
+            tk.messagebox.showinfo("Database Connection", f"Connected to {db_type} database successfully.")
+        except Exception as e:
+            tk.messagebox.showerror("Database Connection", f"Failed to connect: {str(e)}")
+
+    def run_query(self):
+        db_type = self.db_type.get()
+        sql = self.query_text.get("1.0", tk.END).strip()
+        if db_type not in database.DRIVERS:
+            tk.messagebox.showerror("Database Connection", "Unsupported database type.")
+        elif not sql:
+            tk.messagebox.showerror("Database Query", "Enter a SQL query to run.")
+        else:
+            self.pack_forget()
+            self.parent.label.pack_forget()
+            self.parent.combobox.pack_forget()
+            self.parent.select_button.pack_forget()
+            self.parent.create_process_frame(database.QuerySource(db_type, self.connection_params(), sql))
@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+
+
+def concat_rows(parts):
+    frame = pd.concat(parts)
+    # Categories differ between the parts, which concat turns into object.
+    for col in parts[0].columns:
+        if isinstance(parts[0][col].dtype, pd.CategoricalDtype) and col in frame.columns and frame[col].dtype == object:
+            frame[col] = frame[col].astype("category")
+    return frame
+
+
+class Dataset:
+    paged = False
+
+    def __init__(self, frame, name=None, key=None):
+        self.frame = frame
+        self.name = name
+        self.key = key
+        self.version = 0
+        self.column_versions = {col: 0 for col in frame.columns}
+        self.listeners = []
+
+    @property
+    def frame(self):
+        # Appended rows are joined to the rest only when the whole frame is asked for.
+        if self.appended:
+            self.base, self.appended = concat_rows(self.parts), []
+        return self.base
+
+    @frame.setter
+    def frame(self, frame):
+        self.base = frame
+        self.appended = []
+
+    @property
+    def parts(self):
+        return [self.base, *self.appended]
+
+    @property
+    def columns(self):
+        columns = self.base.columns
+        for part in self.appended:
+            if not part.columns.equals(columns):
+                columns = columns.union(part.columns, sort=False)
+        return columns
+
+    @property
+    def dtypes(self):
+        if not self.appended:
+            return self.base.dtypes
+        return concat_rows([part.iloc[:0] for part in self.parts]).dtypes
+
+    def __len__(self):
+        return sum(len(part) for part in self.parts)
+
+    def read_rows(self, start, stop):
+        """Rows start:stop, taken only from the parts that hold them."""
+        parts, low = [], 0
+        for part in self.parts:
+            begin, end = max(start - low, 0), min(stop - low, len(part))
+            if begin < end:
+                parts.append(part.iloc[begin:end])
+            low += len(part)
+            if low >= stop:
+                break
+        if not parts:
+            return self.base.iloc[:0]
+        return parts[0] if len(parts) == 1 else concat_rows(parts)
+
+    def take(self, positions):
+        """Rows at positions, in that order."""
+        if not self.appended:
+            return self.base.iloc[positions]
+        parts = self.parts
+        offsets = np.cumsum([0] + [len(part) for part in parts])
+        which = np.searchsorted(offsets, positions, side="right") - 1
+        # One slice per run of positions that fall in the same part.
+        breaks = np.flatnonzero(np.diff(which)) + 1
+        pieces = [
+            parts[which[begin]].iloc[positions[begin:end] - offsets[which[begin]]]
+            for begin, end in zip(np.r_[0, breaks], np.r_[breaks, len(positions)])
+        ]
+        if not pieces:
+            return self.base.iloc[:0]
+        return pieces[0] if len(pieces) == 1 else concat_rows(pieces)
+
+    def column(self, col, start=0):
+        """Column col from row start on, with a fresh 0-based index."""
+        pieces, low = [], 0
+        for part in self.parts:
+            if low + len(part) > start:
+                rows = part.iloc[max(start - low, 0):]
+                pieces.append(rows[col] if col in rows.columns else pd.Series(np.nan, index=rows.index))
+            low += len(part)
+        if not pieces:
+            return self.base[col].iloc[:0].reset_index(drop=True)
+        return pd.concat(pieces, ignore_index=True) if len(pieces) > 1 else pieces[0].reset_index(drop=True)
+
+    def touch(self, columns=None):
+        self.version += 1
+        current = self.columns
+        if columns is None:
+            columns = current
+        for col in columns:
+            self.column_versions[col] = self.version
+        for col in current:
+            self.column_versions.setdefault(col, self.version)
+        for col in list(self.column_versions):
+            if col not in current:
+                del self.column_versions[col]
+
+    def replace(self, frame, columns=None, key=None):
+        self.frame = frame
+        self.key = key
+        self.touch(columns)
+
+    def append(self, rows):
+        """Adds rows at the end and tells the listeners about just those rows.
+
+        The rows are kept as a separate part until the whole frame is needed. Parts are merged
+        whenever the last one is at least as long as the one before, so there are only
+        O(log n) of them and each row is copied O(log n) times however often rows arrive.
+        """
+        start = len(self)
+        rows = rows.set_axis(pd.RangeIndex(start, start + len(rows)))
+        self.appended.append(rows)
+        while len(self.appended) > 1 and len(self.appended[-1]) >= len(self.appended[-2]):
+            last = self.appended.pop()
+            self.appended[-1] = concat_rows([self.appended[-1], last])
+        self.key = None
+        self.touch()
+        for listener in list(self.listeners):
+            listener(rows)
@@ -0,0 +1,109 @@
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from instrument import RECORDER
+
+COLUMNS = [
+    ("time", "Started", 80),
+    ("stage", "Stage", 130),
+    ("status", "Status", 60),
+    ("wall", "Wall ms", 80),
+    ("cpu", "CPU ms", 80),
+    ("rows", "Rows", 90),
+    ("memory", "Mem Δ MB", 80),
+    ("detail", "Detail", 260),
+]
+
+
+def format_ms(seconds):
+    return f"{seconds * 1000:,.1f}" if seconds is not None else ""
+
+
+def format_mb(record):
+    size = record.traced_peak if record.traced_peak is not None else record.rss_delta
+    return f"{size / 2**20:,.1f}" if size is not None else ""
+
+
+class DiagnosticsWindow(tk.Toplevel):
+    def __init__(self, parent, recorder=RECORDER, refresh_interval=500):
+        super().__init__(parent)
+        self.title("Diagnostics")
+        self.geometry("900x400")
+        self.recorder = recorder
+        self.refresh_interval = refresh_interval
+        self.shown_version = None
+        self.records = {}
+        self.trace_memory = tk.BooleanVar(value=recorder.trace_memory)
+
+        toolbar = tk.Frame(self)
+        toolbar.pack(side="top", fill="x")
+        self.profile_button = ttk.Button(toolbar, text="Profile Next Action", command=self.profile_next)
+        self.profile_button.pack(side="left", padx=5, pady=5)
+        ttk.Checkbutton(toolbar, text="Trace Python memory (slower)", variable=self.trace_memory, command=self.toggle_trace).pack(side="left", padx=5)
+        ttk.Button(toolbar, text="Clear", command=self.recorder.clear).pack(side="left", padx=5)
+        self.status_label = ttk.Label(toolbar, text="")
+        self.status_label.pack(side="right", padx=5)
+
+        body = tk.Frame(self)
+        body.pack(side="top", fill="both", expand=True)
+        scrollbar = ttk.Scrollbar(body, orient="vertical")
+        scrollbar.pack(side="right", fill="y")
+        self.treeview = ttk.Treeview(body, columns=[name for name, _, _ in COLUMNS], show="headings", yscrollcommand=scrollbar.set)
+        scrollbar.config(command=self.treeview.yview)
+        for name, heading, width in COLUMNS:
+            self.treeview.heading(name, text=heading)
+            self.treeview.column(name, width=width, anchor="w" if name in ("stage", "detail") else "e")
+        self.treeview.pack(side="left", fill="both", expand=True)
+        self.treeview.bind("<Double-1>", self.show_details)
+
+        self.refresh()
+
+    def profile_next(self):
+        self.recorder.profile_next = True
+        self.status_label.config(text="The next action will be profiled.")
+
+    def toggle_trace(self):
+        self.recorder.trace_memory = self.trace_memory.get()
+
+    def refresh(self):
+        if self.recorder.version != self.shown_version:
+            self.shown_version = self.recorder.version
+            self.treeview.delete(*self.treeview.get_children())
+            self.records = {}
+            for record in reversed(self.recorder.recent()):
+                detail = record.error or ", ".join(f"{key}={value}" for key, value in record.fields.items())
+                if record.profile_path:
+                    detail = f"profile: {record.profile_path}; {detail}"
+                iid = self.treeview.insert("", "end", values=(
+                    time.strftime("%H:%M:%S", time.localtime(record.started_at)),
+                    record.name,
+                    record.status,
+                    format_ms(record.wall_seconds),
+                    format_ms(record.cpu_seconds),
+                    f"{record.rows:,}" if record.rows is not None else "",
+                    format_mb(record),
+                    detail,
+                ))
+                self.records[iid] = record
+            if not self.recorder.profile_next:
+                self.status_label.config(text=f"{len(self.records)} operations")
+        try:
+            self.after(self.refresh_interval, self.refresh)
+        except tk.TclError:
+            pass
+
+    def show_details(self, event):
+        selection = self.treeview.selection()
+        if not selection:
+            return
+        record = self.records[selection[0]]
+        window = tk.Toplevel(self)
+        window.title(f"{record.name} details")
+        text = tk.Text(window, wrap="none", width=120, height=30)
+        text.pack(fill="both", expand=True)
+        lines = [f"{key}: {value}" for key, value in record.as_dict().items()]
+        if record.profile_text:
+            lines += ["", record.profile_text]
+        text.insert(tk.END, "\n".join(lines))
+        text.config(state="disabled")
@@ -0,0 +1,180 @@
+import gzip
+import io
+import os
+import threading
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+EXPORT_ROWS = 100_000
+EXCEL_MAX_ROWS = 1_048_575
+EXPORT_FORMATS = {
+    ".csv": "CSV files",
+    ".csv.gz": "CSV files (gzip)",
+    ".csv.zst": "CSV files (zstd)",
+    ".json": "JSON files",
+    ".jsonl": "JSON Lines files",
+    ".jsonl.gz": "JSON Lines files (gzip)",
+    ".jsonl.zst": "JSON Lines files (zstd)",
+    ".xlsx": "Excel files",
+    ".parquet": "Parquet files",
+    ".feather": "Feather files",
+}
+ARROW_EXTENSIONS = (".csv.zst", ".jsonl.zst", ".parquet", ".feather")
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def export_extension(path):
+    name = path.lower()
+    for extension in sorted(EXPORT_FORMATS, key=len, reverse=True):
+        if name.endswith(extension):
+            return extension
+    raise ValueError(f"Unsupported export format: {os.path.basename(path)}")
+
+
+def available_extensions():
+    return [extension for extension in EXPORT_FORMATS if pa is not None or extension not in ARROW_EXTENSIONS]
+
+
+def open_output(path, compression=None):
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=6)
+    if compression == "zstd":
+        return pa.CompressedOutputStream(path, "zstd")
+    return open(path, "wb")
+
+
+def chunks(frame, chunk_rows):
+    for start in range(0, len(frame), chunk_rows):
+        yield frame.iloc[start:start + chunk_rows]
+
+
+# Writers take an iterable of frames plus a template frame with the output's columns and
+# types, so in-memory frames and chunks streamed from disk share them.
+def write_csv(frames, path, template, compression=None):
+    with open_output(path, compression) as raw, io.TextIOWrapper(raw, encoding="utf-8", newline="") as f:
+        header = True
+        for chunk in frames:
+            chunk.to_csv(f, index=False, header=header)
+            header = False
+            yield len(chunk)
+        if header:
+            template.iloc[:0].to_csv(f, index=False)
+
+
+def write_jsonl(frames, path, template, compression=None):
+    with open_output(path, compression) as raw, io.TextIOWrapper(raw, encoding="utf-8") as f:
+        for chunk in frames:
+            text = chunk.to_json(orient="records", lines=True)
+            f.write(text if text.endswith("\n") else text + "\n")
+            yield len(chunk)
+
+
+def write_xlsx(frames, path, template):
+    # Write-only workbooks stream rows to disk instead of building the sheet in memory.
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append([str(col) for col in template.columns])
+    for chunk in frames:
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            sheet.append(row)
+        yield len(chunk)
+    workbook.save(path)
+
+
+def arrow_batches(frames, template):
+    schema = pa.Schema.from_pandas(template, preserve_index=False)
+    for chunk in frames:
+        yield schema, pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+
+
+def write_parquet(frames, path, template):
+    writer = None
+    try:
+        for schema, table in arrow_batches(frames, template):
+            if writer is None:
+                writer = pq.ParquetWriter(path, schema, compression="snappy")
+            writer.write_table(table)
+            yield table.num_rows
+        if writer is None:
+            pq.write_table(pa.Table.from_pandas(template.iloc[:0], preserve_index=False), path)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_feather(frames, path, template):
+    writer = None
+    try:
+        for schema, table in arrow_batches(frames, template):
+            if writer is None:
+                writer = pa.ipc.new_file(path, table.schema)
+            writer.write_table(table)
+            yield table.num_rows
+        if writer is None:
+            writer = pa.ipc.new_file(path, pa.Schema.from_pandas(template.iloc[:0], preserve_index=False))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+WRITERS = {
+    ".csv": lambda frames, path, template: write_csv(frames, path, template),
+    ".csv.gz": lambda frames, path, template: write_csv(frames, path, template, "gzip"),
+    ".csv.zst": lambda frames, path, template: write_csv(frames, path, template, "zstd"),
+    ".json": lambda frames, path, template: write_jsonl(frames, path, template),
+    ".jsonl": lambda frames, path, template: write_jsonl(frames, path, template),
+    ".jsonl.gz": lambda frames, path, template: write_jsonl(frames, path, template, "gzip"),
+    ".jsonl.zst": lambda frames, path, template: write_jsonl(frames, path, template, "zstd"),
+    ".xlsx": write_xlsx,
+    ".parquet": write_parquet,
+    ".feather": write_feather,
+}
+
+
+def export(frame, path, chunk_rows=EXPORT_ROWS, on_progress=None, should_cancel=None):
+    """Writes frame to path chunk by chunk; returns False if cancelled."""
+    return export_chunks(chunks(frame, chunk_rows), path, frame, len(frame), on_progress, should_cancel)
+
+
+def export_chunks(frames, path, template, total_rows, on_progress=None, should_cancel=None):
+    """Writes an iterable of frames to path; returns False if cancelled.
+
+    template supplies the columns and types (it may be a sample of the data). Output goes
+    to a temporary file that replaces path only once it is complete.
+    """
+    extension = export_extension(path)
+    if extension in ARROW_EXTENSIONS and pa is None:
+        raise ValueError(f"Exporting {EXPORT_FORMATS[extension]} needs the pyarrow package.")
+    if extension == ".xlsx" and total_rows > EXCEL_MAX_ROWS:
+        raise ValueError(f"Excel sheets hold at most {EXCEL_MAX_ROWS:,} rows; this dataset has {total_rows:,}.")
+    # Thread idents repeat across the worker processes of a batch run, so the pid is part of the name too.
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+    rows = 0
+    try:
+        writer = WRITERS[extension](frames, temp_path, template)
+        try:
+            for written in writer:
+                if should_cancel is not None and should_cancel():
+                    raise ExportCancelled()
+                rows += written
+                if on_progress is not None:
+                    on_progress(rows, total_rows)
+        finally:
+            writer.close()
+        os.replace(temp_path, path)
+    except ExportCancelled:
+        return False
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return True
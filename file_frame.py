@@ -0,0 +1,139 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+import ingest
+from instrument import stage
+from partitions import PartitionedSource
+
+
+class LoadOptionsDialog(tk.Toplevel):
+    def __init__(self, parent, columns, on_confirm):
+        super().__init__(parent)
+        self.title("Load Options")
+        self.columns = columns
+        self.on_confirm = on_confirm
+        self.dtypes = {}
+        self.dtype_column = tk.StringVar()
+        self.dtype_choice = tk.StringVar(value="auto")
+
+        ttk.Label(self, text="Columns to load:").pack(anchor="w", padx=5, pady=5)
+        list_frame = tk.Frame(self)
+        list_frame.pack(fill="both", expand=True, padx=5)
+        self.column_list = tk.Listbox(list_frame, selectmode="multiple", exportselection=False, height=12)
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.column_list.yview)
+        self.column_list.config(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        self.column_list.pack(side="left", fill="both", expand=True)
+        for col in columns:
+            self.column_list.insert(tk.END, str(col))
+        self.column_list.select_set(0, tk.END)
+
+        dtype_frame = tk.Frame(self)
+        dtype_frame.pack(fill="x", padx=5, pady=5)
+        ttk.Label(dtype_frame, text="Column Type:").pack(side="left")
+        ttk.Combobox(dtype_frame, textvariable=self.dtype_column, values=[str(col) for col in columns], state="readonly").pack(side="left", padx=5)
+        ttk.Combobox(dtype_frame, textvariable=self.dtype_choice, values=ingest.DTYPE_CHOICES, state="readonly", width=16).pack(side="left", padx=5)
+        ttk.Button(dtype_frame, text="Set", command=self.set_dtype).pack(side="left")
+
+        self.dtype_label = ttk.Label(self, text="Type overrides: none")
+        self.dtype_label.pack(anchor="w", padx=5)
+
+        button_frame = tk.Frame(self)
+        button_frame.pack(pady=5)
+        ttk.Button(button_frame, text="Load", command=self.confirm).pack(side="left", padx=5)
+        ttk.Button(button_frame, text="Cancel", command=self.destroy).pack(side="left", padx=5)
+
+        self.transient(parent)
+        self.grab_set()
+
+    def set_dtype(self):
+        names = [str(col) for col in self.columns]
+        if self.dtype_column.get() not in names:
+            return
+        col = self.columns[names.index(self.dtype_column.get())]
+        if self.dtype_choice.get() == "auto":
+            self.dtypes.pop(col, None)
+        else:
+            self.dtypes[col] = self.dtype_choice.get()
+        overrides = ", ".join(f"{col}: {dtype}" for col, dtype in self.dtypes.items())
+        self.dtype_label.config(text=f"Type overrides: {overrides or 'none'}")
+
+    def confirm(self):
+        selected = [self.columns[i] for i in self.column_list.curselection()]
+        if not selected:
+            messagebox.showerror("Load Options", "Select at least one column to load.")
+            return
+        columns = None if len(selected) == len(self.columns) else selected
+        self.destroy()
+        self.on_confirm(columns, dict(self.dtypes))
+
+
+class FileSelectionFrame(tk.Frame):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.parent = parent
+        self.selected_source = tk.StringVar()
+        
+        self.file_path = None
+        self.folder = None
+        self.pattern = tk.StringVar(value="*")
+        self.partition_filter = tk.StringVar()
+        
+        self.label = ttk.Label(self, text="Select File:")
+        self.label.pack(pady=5)
+        
+        self.select_button = ttk.Button(self, text="Browse", command=self.select_file)
+        self.select_button.pack(pady=5)
+
+        folder_frame = ttk.LabelFrame(self, text="Or load every file in a folder")
+        folder_frame.pack(pady=5, fill="x")
+        ttk.Label(folder_frame, text="File pattern:").grid(row=0, column=0, sticky="w", padx=5, pady=2)
+        ttk.Entry(folder_frame, textvariable=self.pattern).grid(row=0, column=1, sticky="ew", padx=5, pady=2)
+        ttk.Label(folder_frame, text="Partition filter:").grid(row=1, column=0, sticky="w", padx=5, pady=2)
+        ttk.Entry(folder_frame, textvariable=self.partition_filter).grid(row=1, column=1, sticky="ew", padx=5, pady=2)
+        ttk.Label(folder_frame, text="e.g. year>=2024, region=eu|us").grid(row=2, column=1, sticky="w", padx=5)
+        ttk.Button(folder_frame, text="Browse Folder", command=self.select_folder).grid(row=3, column=0, columnspan=2, pady=5)
+        folder_frame.columnconfigure(1, weight=1)
+        
+    def select_file(self):
+        self.file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv"), ("Excel files", "*.xlsx"), ("JSON files", "*.json *.jsonl *.ndjson"), ("Parquet files", "*.parquet")])
+        if self.file_path:
+            try:
+                with stage("file.preview", path=self.file_path):
+                    preview = ingest.preview(self.file_path)
+            except Exception as e:
+                messagebox.showerror("File Selection Error", f"Could not read the selected file: {str(e)}")
+                return
+            LoadOptionsDialog(self, preview.columns.tolist(), self.open_file)
+        else:
+            messagebox.showerror("File Selection Error", "No file selected. Please choose a file.")
+
+    def folder_source(self, columns=None, dtypes=None):
+        return PartitionedSource(self.folder, self.pattern.get() or "*", columns, dtypes, self.partition_filter.get())
+
+    def select_folder(self):
+        self.folder = filedialog.askdirectory()
+        if not self.folder:
+            return
+        try:
+            with stage("file.preview", path=self.folder):
+                source = self.folder_source()
+                preview = source.preview()
+        except Exception as e:
+            messagebox.showerror("Folder Selection Error", f"Could not read the selected folder: {str(e)}")
+            return
+        LoadOptionsDialog(self, preview.columns.tolist(), self.open_folder)
+
+    def open_folder(self, columns, dtypes):
+        self.pack_forget()
+        self.parent.label.pack_forget()
+        self.parent.combobox.pack_forget()
+        self.parent.select_button.pack_forget()
+        self.parent.create_process_frame(self.folder_source(columns, dtypes))
+
+    def open_file(self, columns, dtypes):
+        self.pack_forget()
+        self.parent.label.pack_forget()
+        self.parent.combobox.pack_forget()
+        self.parent.select_button.pack_forget()
+        self.parent.create_process_frame(ingest.FileSource(self.file_path, columns, dtypes))
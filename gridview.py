@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+
+def sorted_values(series, ascending):
+    """Positions of series in sorted order, and the sorted values that are not missing.
+
+    Values that cannot be compared with each other are sorted as text, missing values included.
+    """
+    series = series.reset_index(drop=True)
+    try:
+        ordered = series.sort_values(ascending=ascending, kind="mergesort")
+        present = int(series.notna().sum())
+        text = False
+    except TypeError:
+        ordered = series.astype(str).sort_values(ascending=ascending, kind="mergesort")
+        present = len(series)
+        text = True
+    return ordered.index.to_numpy(), ordered.to_numpy()[:present], text
+
+
+class GridView:
+    # Row order and filtering for DataGrid, kept free of Tk so it can run headless.
+    def __init__(self, data=None):
+        self.set_data(data)
+
+    def set_data(self, data):
+        # Paged data is read from disk and only offers read_rows(); a Dataset may hold its rows in parts.
+        self.data = data
+        self.paged = getattr(data, "paged", False)
+        self.view_index = None
+        self.sort_orders = {}
+        self.filter_masks = {}
+        self.params = (None, True, None, "")
+
+    def row_count(self):
+        if self.data is None:
+            return 0
+        if self.view_index is not None:
+            return len(self.view_index)
+        return len(self.data)
+
+    def take(self, start, stop):
+        if self.view_index is not None:
+            positions = self.view_index[start:stop]
+            return self.data.iloc[positions] if isinstance(self.data, pd.DataFrame) else self.data.take(positions)
+        if isinstance(self.data, pd.DataFrame):
+            return self.data.iloc[start:stop]
+        return self.data.read_rows(start, stop)
+
+    def rows(self, start, stop):
+        rows = self.take(start, stop)
+        return list(zip(rows.index.tolist(), rows.itertuples(index=False, name=None)))
+
+    def column(self, index, start=0):
+        if isinstance(self.data, pd.DataFrame):
+            return self.data.iloc[start:, index].reset_index(drop=True)
+        return self.data.column(self.data.columns[index], start)
+
+    def sort_order(self, index, ascending):
+        key = (index, ascending)
+        if key not in self.sort_orders:
+            self.sort_orders[key] = sorted_values(self.column(index), ascending)
+        return self.sort_orders[key][0]
+
+    def filter_mask(self, index, text):
+        key = (index, text.lower())
+        if key not in self.filter_masks:
+            self.filter_masks[key] = self.match(self.column(index), text)
+        return self.filter_masks[key]
+
+    @staticmethod
+    def match(series, text):
+        return series.astype(str).str.contains(text, case=False, regex=False).to_numpy()
+
+    def apply(self, sort_column=None, ascending=True, filter_column=None, text=""):
+        if self.paged and (sort_column is not None or text):
+            raise ValueError("Sorting and filtering need the data in memory; this dataset is paged from disk.")
+        self.params = (sort_column, ascending, filter_column, text)
+        order = None
+        if sort_column is not None:
+            order = self.sort_order(sort_column, ascending)
+
+        mask = None
+        if text and filter_column is not None:
+            mask = self.filter_mask(filter_column, text)
+
+        if mask is None:
+            self.view_index = order
+        elif order is None:
+            self.view_index = np.flatnonzero(mask)
+        else:
+            self.view_index = order[mask[order]]
+        return self.row_count()
+
+    def append(self, count):
+        """Takes in the last count rows of the data, which were just appended.
+
+        Cached sort orders and filter masks are extended from those rows alone: the new values
+        are sorted and inserted with a binary search, and only they are matched against filters.
+        """
+        start = len(self.data) - count
+        for key, (order, values, text) in list(self.sort_orders.items()):
+            merged = self.merge_sorted(order, values, text, self.column(key[0], start), start, key[1])
+            if merged is None:
+                del self.sort_orders[key]
+            else:
+                self.sort_orders[key] = merged
+        for index, text in list(self.filter_masks):
+            mask = self.filter_masks[index, text]
+            self.filter_masks[index, text] = np.concatenate([mask, self.match(self.column(index, start), text)])
+
+        sort_column, ascending, filter_column, text = self.params
+        if sort_column is None and text and filter_column is not None:
+            new = np.flatnonzero(self.filter_masks[filter_column, text.lower()][start:]) + start
+            self.view_index = np.concatenate([self.view_index, new])
+        elif self.view_index is not None:
+            self.apply(*self.params)
+        return self.row_count()
+
+    @staticmethod
+    def merge_sorted(order, values, text, series, start, ascending):
+        positions, new_values, new_text = sorted_values(series.astype(str) if text else series, ascending)
+        if new_text and not text:
+            return None
+        present = len(values)
+        try:
+            if ascending:
+                at = np.searchsorted(values, new_values, side="right")
+            else:
+                at = present - np.searchsorted(values[::-1], new_values, side="left")
+        except (TypeError, ValueError):
+            # The new values cannot be compared with the old ones; the order is worked out again when needed.
+            return None
+        # Equal values keep their row order, so new rows go after the old ones they tie with; missing values stay last.
+        merged = np.insert(order[:present], at, positions[:len(new_values)] + start)
+        order = np.concatenate([merged, order[present:], positions[len(new_values):] + start])
+        return order, np.insert(values, at, new_values), text
@@ -0,0 +1,220 @@
+import contextlib
+import itertools
+import json
+import os
+
+import pandas as pd
+
+CHUNK_ROWS = 100_000
+PREVIEW_ROWS = 100
+SUPPORTED_EXTENSIONS = (".csv", ".json", ".jsonl", ".ndjson", ".xlsx", ".parquet")
+STREAMING_FORMATS = ("csv", "jsonl")
+DTYPE_CHOICES = ["auto", "int64", "Int64", "float64", "bool", "string", "category", "datetime64[ns]"]
+
+
+class UnsupportedFormatError(ValueError):
+    pass
+
+
+def file_format(file_path):
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if extension == ".json":
+        return "jsonl" if is_line_delimited(file_path) else "json"
+    if extension == ".xlsx":
+        return "xlsx"
+    if extension == ".parquet":
+        return "parquet"
+    raise UnsupportedFormatError("Unsupported file format. Please choose a CSV, JSON, Excel, or Parquet file.")
+
+
+def is_line_delimited(file_path):
+    with open(file_path, "rb") as f:
+        first_line = f.readline().strip()
+        second_line = f.readline().strip()
+    if not first_line or first_line.startswith(b"["):
+        return False
+    try:
+        return isinstance(json.loads(first_line), dict) and isinstance(json.loads(second_line), dict)
+    except ValueError:
+        return False
+
+
+def split_dtypes(dtypes):
+    parse_dtypes = {}
+    parse_dates = []
+    for col, dtype in (dtypes or {}).items():
+        if dtype == "datetime64[ns]":
+            parse_dates.append(col)
+        elif dtype == "category":
+            parse_dtypes[col] = "object"
+        elif dtype != "auto":
+            parse_dtypes[col] = dtype
+    return parse_dtypes, parse_dates
+
+
+def chunk_dtypes(dtypes):
+    return {col: "object" if dtype == "category" else dtype for col, dtype in dtypes.items() if dtype != "auto"}
+
+
+def apply_dtypes(frame, dtypes):
+    dtypes = {col: dtype for col, dtype in dtypes.items() if col in frame.columns and dtype != "auto"}
+    datetimes = [col for col, dtype in dtypes.items() if dtype == "datetime64[ns]"]
+    others = {col: dtype for col, dtype in dtypes.items() if col not in datetimes}
+    if others:
+        frame = frame.astype(others)
+    if datetimes:
+        frame = frame.copy(deep=False)
+        for col in datetimes:
+            frame[col] = pd.to_datetime(frame[col], errors="coerce")
+    return frame
+
+
+def project(frame, columns):
+    if columns is None:
+        return frame
+    return frame[[col for col in columns if col in frame.columns]]
+
+
+def open_source(file_path, stream=None):
+    if stream is not None:
+        return contextlib.nullcontext(stream)
+    return open(file_path, "rb")
+
+
+def read_csv_chunks(file_path, columns, dtypes, chunk_rows, stream=None):
+    parse_dtypes, parse_dates = split_dtypes(dtypes)
+    with open_source(file_path, stream) as f:
+        reader = pd.read_csv(
+            f,
+            usecols=columns,
+            dtype=parse_dtypes or None,
+            parse_dates=parse_dates or False,
+            chunksize=chunk_rows,
+        )
+        for chunk in reader:
+            yield chunk, f.tell()
+
+
+def read_jsonl_chunks(file_path, columns, dtypes, chunk_rows, stream=None):
+    with open_source(file_path, stream) as f:
+        while True:
+            lines = list(itertools.islice(f, chunk_rows))
+            if not lines:
+                break
+            records = [json.loads(line) for line in lines if line.strip()]
+            chunk = project(pd.DataFrame.from_records(records), columns)
+            yield apply_dtypes(chunk, chunk_dtypes(dtypes)), f.tell()
+
+
+def read_json_chunks(file_path, columns, dtypes, chunk_rows):
+    frame = project(pd.read_json(file_path), columns)
+    yield apply_dtypes(frame, chunk_dtypes(dtypes)), os.path.getsize(file_path)
+
+
+def read_xlsx_chunks(file_path, columns, dtypes, chunk_rows):
+    import openpyxl
+
+    total_bytes = os.path.getsize(file_path)
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = [name if name is not None else f"Unnamed: {i}" for i, name in enumerate(header)]
+        total_rows = max((sheet.max_row or 0) - 1, 1)
+        rows_read = 0
+        while True:
+            batch = list(itertools.islice(rows, chunk_rows))
+            if not batch:
+                break
+            rows_read += len(batch)
+            chunk = project(pd.DataFrame.from_records(batch, columns=header, coerce_float=True), columns)
+            chunk = apply_dtypes(chunk, chunk_dtypes(dtypes))
+            yield chunk, min(total_bytes, total_bytes * rows_read // total_rows)
+    finally:
+        workbook.close()
+
+
+def read_parquet_chunks(file_path, columns, dtypes, chunk_rows):
+    from pyarrow import parquet
+
+    total_bytes = os.path.getsize(file_path)
+    parquet_file = parquet.ParquetFile(file_path)
+    total_rows = max(parquet_file.metadata.num_rows, 1)
+    rows_read = 0
+    for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=columns):
+        rows_read += batch.num_rows
+        yield apply_dtypes(batch.to_pandas(), chunk_dtypes(dtypes)), total_bytes * rows_read // total_rows
+
+
+READERS = {
+    "csv": read_csv_chunks,
+    "jsonl": read_jsonl_chunks,
+    "json": read_json_chunks,
+    "xlsx": read_xlsx_chunks,
+    "parquet": read_parquet_chunks,
+}
+
+
+def read_chunks(file_path, columns=None, dtypes=None, chunk_rows=CHUNK_ROWS, stream=None):
+    fmt = file_format(file_path)
+    if stream is not None:
+        if fmt not in STREAMING_FORMATS:
+            raise UnsupportedFormatError(f"{fmt} files cannot be read from a stream.")
+        return READERS[fmt](file_path, columns, dtypes or {}, chunk_rows, stream=stream)
+    return READERS[fmt](file_path, columns, dtypes or {}, chunk_rows)
+
+
+def combine_chunks(chunks, dtypes=None):
+    if not chunks:
+        return pd.DataFrame()
+    frame = chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True, copy=False)
+    categories = {col: "category" for col, dtype in (dtypes or {}).items() if dtype == "category" and col in frame.columns}
+    return frame.astype(categories) if categories else frame
+
+
+def load(file_path, columns=None, dtypes=None, chunk_rows=CHUNK_ROWS, on_chunk=None, should_cancel=None, stream=None, total_bytes=None):
+    if total_bytes is None:
+        total_bytes = os.path.getsize(file_path)
+    chunks = []
+    rows = 0
+    for chunk, bytes_read in read_chunks(file_path, columns, dtypes, chunk_rows, stream):
+        if should_cancel is not None and should_cancel():
+            return None
+        chunks.append(chunk)
+        rows += len(chunk)
+        if on_chunk is not None:
+            on_chunk(chunk, rows, bytes_read, total_bytes)
+    return combine_chunks(chunks, dtypes)
+
+
+def preview(file_path, rows=PREVIEW_ROWS):
+    chunks = read_chunks(file_path, chunk_rows=rows)
+    try:
+        chunk, _ = next(chunks, (pd.DataFrame(), 0))
+    finally:
+        chunks.close()
+    return chunk
+
+
+class FileSource:
+    def __init__(self, file_path, columns=None, dtypes=None):
+        self.file_path = file_path
+        self.columns = columns
+        self.dtypes = dtypes
+
+    @property
+    def name(self):
+        return self.file_path
+
+    def cache_key(self, cache):
+        return cache.key_for_file(self.file_path, self.columns, self.dtypes)
+
+    def load(self, on_chunk=None, should_cancel=None):
+        return load(self.file_path, self.columns, self.dtypes, on_chunk=on_chunk, should_cancel=should_cancel)
@@ -0,0 +1,174 @@
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+PROFILE_DIR = os.environ.get("BI_TOOL_PROFILE_DIR", os.path.join(os.path.expanduser("~"), ".bi-tool", "profiles"))
+MAX_RECORDS = 200
+PROFILE_LINES = 25
+
+logger = logging.getLogger("bi_tool.stages")
+
+
+def current_rss():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class StageRecord:
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+        self.rows = fields.pop("rows", None)
+        self.started_at = time.time()
+        self.thread = threading.current_thread().name
+        self.status = "running"
+        self.error = None
+        self.wall_seconds = None
+        self.cpu_seconds = None
+        self.rss_delta = None
+        self.traced_peak = None
+        self.traced_before = 0
+        self.peak_seen = 0
+        self.profile_path = None
+        self.profile_text = None
+
+    def as_dict(self):
+        event = {
+            "stage": self.name,
+            "status": self.status,
+            "started_at": self.started_at,
+            "wall_seconds": self.wall_seconds,
+            "cpu_seconds": self.cpu_seconds,
+            "rows": self.rows,
+            "rss_delta_bytes": self.rss_delta,
+            "traced_peak_bytes": self.traced_peak,
+            "thread": self.thread,
+        }
+        if self.error:
+            event["error"] = self.error
+        if self.profile_path:
+            event["profile"] = self.profile_path
+        event.update(self.fields)
+        return event
+
+
+class Recorder:
+    """Keeps the last few stage records and logs each one as a JSON event."""
+
+    def __init__(self, max_records=MAX_RECORDS):
+        self.records = deque(maxlen=max_records)
+        self.lock = threading.Lock()
+        self.version = 0
+        self.trace_memory = False
+        self.profile_next = False
+        # Stages measuring memory; tracemalloc keeps one peak for the whole process, which they share.
+        self.traced_stages = []
+        self.started_tracing = False
+
+    @contextmanager
+    def stage(self, name, **fields):
+        record = StageRecord(name, fields)
+        with self.lock:
+            profile = self.profile_next
+            self.profile_next = False
+        profiler = cProfile.Profile() if profile else None
+        if self.trace_memory:
+            self.start_tracing(record)
+        rss_before = current_rss()
+        cpu_started = time.thread_time()
+        started = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield record
+            record.status = "ok"
+        except BaseException as e:
+            record.status = "error"
+            record.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            record.wall_seconds = time.perf_counter() - started
+            record.cpu_seconds = time.thread_time() - cpu_started
+            rss_after = current_rss()
+            if rss_before is not None and rss_after is not None:
+                record.rss_delta = rss_after - rss_before
+            self.stop_tracing(record)
+            if profiler is not None:
+                self.save_profile(record, profiler)
+            self.add(record)
+
+    def fold_peak(self):
+        # Open stages take the peak so far before it is reset, so a nested stage does not wipe its parent's.
+        peak = tracemalloc.get_traced_memory()[1]
+        for record in self.traced_stages:
+            record.peak_seen = max(record.peak_seen, peak)
+
+    def start_tracing(self, record):
+        with self.lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.started_tracing = True
+            else:
+                self.fold_peak()
+                tracemalloc.reset_peak()
+            record.traced_before = record.peak_seen = tracemalloc.get_traced_memory()[0]
+            self.traced_stages.append(record)
+
+    def stop_tracing(self, record):
+        with self.lock:
+            if not any(entry is record for entry in self.traced_stages):
+                return
+            if tracemalloc.is_tracing():
+                self.fold_peak()
+            self.traced_stages = [entry for entry in self.traced_stages if entry is not record]
+            record.traced_peak = max(0, record.peak_seen - record.traced_before)
+            if not self.traced_stages and self.started_tracing:
+                tracemalloc.stop()
+                self.started_tracing = False
+
+    def save_profile(self, record, profiler):
+        text = io.StringIO()
+        pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(PROFILE_LINES)
+        record.profile_text = text.getvalue()
+        try:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            path = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{record.name}.prof")
+            profiler.dump_stats(path)
+            record.profile_path = path
+        except OSError:
+            pass
+
+    def add(self, record):
+        with self.lock:
+            self.records.append(record)
+            self.version += 1
+        logger.info("%s", json.dumps(record.as_dict(), default=str))
+
+    def recent(self):
+        with self.lock:
+            return list(self.records)
+
+    def clear(self):
+        with self.lock:
+            self.records.clear()
+            self.version += 1
+
+
+RECORDER = Recorder()
+
+
+def stage(name, **fields):
+    return RECORDER.stage(name, **fields)
@@ -0,0 +1,289 @@
+"""Datasets kept on disk as memory-mapped Arrow chunks, for data larger than memory."""
+import os
+import shutil
+import tempfile
+import time
+import weakref
+
+import numpy as np
+import pandas as pd
+
+import export
+import ingest
+from cache import CACHE_DIR
+from cleaning import CleaningReport
+from stats import RunningMoments, StreamingStatistics, column_values, is_numeric_column
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+MEMORY_BUDGET = int(os.environ.get("BI_TOOL_MEMORY_BUDGET", 2**30))
+SPILL_DIR = os.environ.get("BI_TOOL_SPILL_DIR", os.path.join(CACHE_DIR, "spill"))
+# Parsing, Arrow conversion and cleaning each hold about one more copy of a chunk.
+CHUNK_COPIES = 4
+MIN_CHUNK_ROWS = 1_000
+ESTIMATE_ROWS = 1_000
+# pandas parses a JSON array as one document; the other formats are read a chunk at a time
+# (Excel through openpyxl's read-only mode, which streams rows).
+CHUNKED_FORMATS = ("csv", "jsonl", "xlsx", "parquet")
+
+
+def available():
+    return pa is not None
+
+
+def is_number(dtype):
+    return dtype.kind in "iuf"
+
+
+def common_dtype(a, b):
+    if a == b:
+        return a
+    if is_number(a) and is_number(b):
+        return np.result_type(a, b)
+    return np.dtype(object)
+
+
+def chunk_rows_for(frame, budget):
+    row_bytes = frame.memory_usage(deep=True, index=False).sum() / max(1, len(frame))
+    return max(MIN_CHUNK_ROWS, int(budget // (CHUNK_COPIES * max(1.0, row_bytes))))
+
+
+def exceeds_budget(source, budget=MEMORY_BUDGET):
+    path = getattr(source, "file_path", None)
+    return path is not None and available() and os.path.getsize(path) * CHUNK_COPIES > budget
+
+
+class ChunkedDataset:
+    """Rows split across Arrow IPC files that are memory-mapped one chunk at a time.
+
+    Column types are widened as chunks arrive (int to float, mixed to object) and every
+    chunk read back is converted to them, so chunks always agree on their columns.
+    """
+
+    paged = True
+
+    def __init__(self, directory, name=None):
+        self.directory = directory
+        self.name = name
+        self.key = None
+        self.version = 0
+        self.paths = []
+        self.offsets = [0]
+        self.column_dtypes = {}
+        self.samples = {}
+        # Spilled chunks go away with the dataset, even if nobody calls remove().
+        self.finalizer = weakref.finalize(self, shutil.rmtree, directory, True)
+
+    @classmethod
+    def create(cls, name=None, parent=SPILL_DIR):
+        os.makedirs(parent, exist_ok=True)
+        return cls(tempfile.mkdtemp(prefix="dataset-", dir=parent), name)
+
+    @property
+    def columns(self):
+        return pd.Index(list(self.column_dtypes))
+
+    @property
+    def dtypes(self):
+        return pd.Series(self.column_dtypes, index=self.columns, dtype=object)
+
+    def __len__(self):
+        return self.offsets[-1]
+
+    def append(self, frame):
+        missing = [col for col in self.column_dtypes if col not in frame.columns]
+        for col in missing:
+            self.column_dtypes[col] = common_dtype(self.column_dtypes[col], np.dtype(np.float64))
+        for col in frame.columns:
+            dtype = frame[col].dtype
+            if col not in self.column_dtypes:
+                self.column_dtypes[col] = dtype if not self.paths else common_dtype(dtype, np.dtype(np.float64))
+            else:
+                self.column_dtypes[col] = common_dtype(self.column_dtypes[col], dtype)
+            if self.samples.get(col) is None:
+                first = frame[col].first_valid_index()
+                self.samples[col] = frame[col].at[first] if first is not None else None
+        path = os.path.join(self.directory, f"{len(self.paths):06d}.arrow")
+        table = pa.Table.from_pandas(frame.reset_index(drop=True), preserve_index=False)
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        self.paths.append(path)
+        self.offsets.append(self.offsets[-1] + len(frame))
+        self.version += 1
+
+    def conform(self, frame):
+        frame = frame.reindex(columns=self.columns)
+        changed = {col: dtype for col, dtype in self.column_dtypes.items() if frame[col].dtype != dtype}
+        return frame.astype(changed) if changed else frame
+
+    def read_table(self, i):
+        with pa.memory_map(self.paths[i]) as source:
+            return pa.ipc.open_file(source).read_all()
+
+    def read(self, i, columns=None):
+        frame = self.conform(self.read_table(i).to_pandas())
+        return frame if columns is None else frame[columns]
+
+    def iter_chunks(self, columns=None):
+        for i in range(len(self.paths)):
+            yield self.read(i, columns)
+
+    def read_rows(self, start, stop):
+        """Rows start:stop, read only from the chunks that hold them."""
+        start, stop = max(0, start), min(stop, len(self))
+        parts = []
+        first = max(0, int(np.searchsorted(self.offsets, start, side="right")) - 1)
+        for i in range(first, len(self.paths)):
+            low, high = self.offsets[i], self.offsets[i + 1]
+            if low >= stop:
+                break
+            begin, end = max(start, low) - low, min(stop, high) - low
+            table = self.read_table(i).slice(begin, end - begin)
+            part = self.conform(table.to_pandas())
+            part.index = pd.RangeIndex(low + begin, low + end)
+            parts.append(part)
+        if not parts:
+            return self.template().iloc[:0]
+        return parts[0] if len(parts) == 1 else pd.concat(parts)
+
+    def sample(self, rows):
+        """Evenly spaced rows across the whole dataset, at most rows of them."""
+        step = max(1, -(-len(self) // max(1, rows)))
+        parts = []
+        for i in range(len(self.paths)):
+            low, high = self.offsets[i], self.offsets[i + 1]
+            positions = np.arange(-(-low // step) * step, high, step) - low
+            if len(positions):
+                part = self.conform(self.read_table(i).take(positions).to_pandas())
+                part.index = positions + low
+                parts.append(part)
+        return pd.concat(parts) if parts else self.template().iloc[:0]
+
+    def template(self):
+        # One row of real values per column, so Arrow infers the same types as the data.
+        frame = pd.DataFrame({col: [self.samples.get(col)] for col in self.column_dtypes})
+        return frame.astype({col: dtype for col, dtype in self.column_dtypes.items() if self.samples.get(col) is not None})
+
+    def remove(self):
+        self.finalizer()
+
+
+def load(source, budget=MEMORY_BUDGET, on_chunk=None, should_cancel=None):
+    """Parses a file source chunk by chunk into a ChunkedDataset; None if cancelled."""
+    file_path = source.file_path
+    if ingest.file_format(file_path) not in CHUNKED_FORMATS:
+        raise ValueError(
+            f"{os.path.basename(file_path)} is a JSON array, which is parsed in one piece and cannot be loaded out of core. "
+            "Convert it to JSON Lines, or raise the memory budget."
+        )
+    columns, dtypes = getattr(source, "columns", None), getattr(source, "dtypes", None)
+    chunk_rows = chunk_rows_for(ingest.preview(file_path, ESTIMATE_ROWS), budget)
+    total_bytes = os.path.getsize(file_path)
+    dataset = ChunkedDataset.create(source.name)
+    try:
+        for chunk, bytes_read in ingest.read_chunks(file_path, columns, dtypes, chunk_rows):
+            if should_cancel is not None and should_cancel():
+                dataset.remove()
+                return None
+            dataset.append(chunk)
+            if on_chunk is not None:
+                on_chunk(chunk, len(dataset), bytes_read, total_bytes)
+    except BaseException:
+        dataset.remove()
+        raise
+    return dataset
+
+
+def compute_statistics(dataset, should_cancel=None):
+    """Column statistics in one pass over the chunks; None if cancelled."""
+    statistics = StreamingStatistics()
+    for chunk in dataset.iter_chunks():
+        if should_cancel is not None and should_cancel():
+            return None
+        statistics.add(chunk)
+    return statistics.compute(dataset.columns)
+
+
+def apply_steps(chunk, steps, report=None):
+    """Runs filter steps and moment-based transforms on one chunk."""
+    for step, means, stds in steps:
+        started = time.perf_counter()
+        if step.filters_rows:
+            keep = step.row_mask(chunk)
+            dropped = len(chunk) - int(np.count_nonzero(keep))
+            if dropped:
+                chunk = chunk.take(np.flatnonzero(keep))
+            if report is not None:
+                report.add(step, time.perf_counter() - started, rows=dropped)
+                report.rows_dropped += dropped
+                if dropped:
+                    report.changed_columns.update(chunk.columns)
+            continue
+        columns = [col for col in means if col in chunk.columns and is_numeric_column(chunk[col])]
+        if not columns or not len(chunk):
+            continue
+        values = np.empty((len(columns), len(chunk)), dtype=np.float64)
+        for i, col in enumerate(columns):
+            values[i] = column_values(chunk[col])
+        affected = step.apply_moments(
+            values,
+            np.array([means[col] for col in columns])[:, None],
+            np.array([stds[col] for col in columns])[:, None],
+        )
+        changed = affected.any(axis=1)
+        if changed.any():
+            chunk = chunk.copy(deep=False)
+            for i in np.flatnonzero(changed):
+                chunk[columns[i]] = values[i]
+        if report is not None:
+            report.add(step, time.perf_counter() - started, rows=int(np.count_nonzero(affected.any(axis=0))), cells=int(np.count_nonzero(affected)))
+            report.changed_columns.update(columns[i] for i in np.flatnonzero(changed))
+    return chunk
+
+
+def clean(dataset, plan, should_cancel=None):
+    """Runs a cleaning plan over the chunks; returns (cleaned dataset, report), (None, None) if cancelled.
+
+    Each transform that needs column means or standard deviations costs one extra read pass
+    (over the data as the earlier steps leave it); the last pass writes the cleaned chunks.
+    """
+    steps = []
+    for step in plan.steps:
+        if step.filters_rows:
+            steps.append((step, None, None))
+            continue
+        if not step.streaming:
+            raise ValueError(f"'{step.name}' needs the whole dataset in memory and cannot run out of core.")
+        moments = {}
+        for chunk in dataset.iter_chunks():
+            if should_cancel is not None and should_cancel():
+                return None, None
+            chunk = apply_steps(chunk, steps)
+            numeric_columns = [col for col in chunk.columns if is_numeric_column(chunk[col])]
+            for col in step.select(numeric_columns):
+                moments.setdefault(col, RunningMoments()).merge(RunningMoments.of(column_values(chunk[col])))
+        means = {col: total.mean if total.count else np.nan for col, total in moments.items()}
+        stds = {col: total.std for col, total in moments.items()}
+        steps.append((step, means, stds))
+
+    report = CleaningReport()
+    started = time.perf_counter()
+    cleaned = ChunkedDataset.create(dataset.name, os.path.dirname(dataset.directory))
+    try:
+        for chunk in dataset.iter_chunks():
+            if should_cancel is not None and should_cancel():
+                cleaned.remove()
+                return None, None
+            cleaned.append(apply_steps(chunk, steps, report))
+    except BaseException:
+        cleaned.remove()
+        raise
+    report.seconds = time.perf_counter() - started
+    return cleaned, report
+
+
+def export_dataset(dataset, path, on_progress=None, should_cancel=None):
+    return export.export_chunks(dataset.iter_chunks(), path, dataset.template(), len(dataset), on_progress, should_cancel)
@@ -0,0 +1,271 @@
+"""Loads many files, or a key=value/ partitioned directory, into one dataset in parallel."""
+import glob
+import operator
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+import ingest
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.json as pa_json
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+OPERATORS = {
+    "!=": operator.ne,
+    ">=": operator.ge,
+    "<=": operator.le,
+    "=": operator.eq,
+    ">": operator.gt,
+    "<": operator.lt,
+}
+FILTER_PATTERN = re.compile(r"^\s*([^=!<>\s]+)\s*(!=|>=|<=|=|>|<)\s*(.*?)\s*$")
+
+
+def find_files(location, pattern="*"):
+    """Supported files under a directory (recursively, matching pattern) or matching a glob."""
+    if os.path.isdir(location):
+        location = os.path.join(location, "**", pattern)
+    paths = [
+        os.path.normpath(path) for path in glob.glob(location, recursive=True)
+        if os.path.isfile(path) and os.path.splitext(path)[1].lower() in ingest.SUPPORTED_EXTENSIONS
+    ]
+    return sorted(paths)
+
+
+def partition_values(path, root):
+    """key=value directory names between root and the file, in order."""
+    values = {}
+    for part in os.path.relpath(os.path.dirname(path), root).split(os.sep):
+        key, sep, value = part.partition("=")
+        if sep and key:
+            values[key] = value
+    return values
+
+
+def typed(value):
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def parse_filters(text):
+    """Parses "year>=2024, region=eu|us" into (key, op, values) conditions."""
+    filters = []
+    for condition in filter(None, (part.strip() for part in (text or "").split(","))):
+        match = FILTER_PATTERN.match(condition)
+        if match is None:
+            raise ValueError(f"Cannot read partition filter '{condition}'; use key=value, key!=value, key>=value and so on.")
+        key, op, value = match.groups()
+        filters.append((key, op, [typed(v) for v in value.split("|")]))
+    return filters
+
+
+def matches(values, filters):
+    for key, op, expected in filters:
+        if key not in values:
+            continue
+        actual = typed(values[key])
+        try:
+            if op == "=":
+                ok = actual in expected
+            elif op == "!=":
+                ok = actual not in expected
+            else:
+                ok = OPERATORS[op](actual, expected[0])
+        except TypeError:
+            ok = OPERATORS[op](str(actual), str(expected[0]))
+        if not ok:
+            return False
+    return True
+
+
+def partition_types(partitions):
+    # A partition key is numeric when every file's value for it is.
+    types = {}
+    for values in partitions:
+        for key, value in values.items():
+            numeric = isinstance(typed(value), (int, float))
+            types[key] = types.get(key, numeric) and numeric
+    return types
+
+
+def unified_type(a, b):
+    if a == b:
+        return a
+    if pa.types.is_null(a):
+        return b
+    if pa.types.is_null(b):
+        return a
+    if pa.types.is_integer(a) and pa.types.is_integer(b):
+        return pa.int64()
+    if (pa.types.is_integer(a) or pa.types.is_floating(a)) and (pa.types.is_integer(b) or pa.types.is_floating(b)):
+        return pa.float64()
+    return pa.string()
+
+
+def unify(tables):
+    """Casts tables to one schema (widening types, adding missing columns as nulls)."""
+    fields = {}
+    for table in tables:
+        for field in table.schema:
+            fields[field.name] = unified_type(fields[field.name], field.type) if field.name in fields else field.type
+    schema = pa.schema([pa.field(name, type) for name, type in fields.items()])
+    unified = []
+    for table in tables:
+        if table.schema.remove_metadata() == schema:
+            unified.append(table.replace_schema_metadata(None))
+            continue
+        columns = [
+            table.column(field.name).cast(field.type) if field.name in table.column_names else pa.nulls(table.num_rows, field.type)
+            for field in schema
+        ]
+        unified.append(pa.Table.from_arrays(columns, schema=schema))
+    return unified
+
+
+def read_table(path, columns=None):
+    """Parses one file into an Arrow table; CSV, JSON Lines and Parquet parsers release the GIL."""
+    fmt = ingest.file_format(path)
+    if fmt == "csv":
+        convert = pa_csv.ConvertOptions(
+            include_columns=columns,
+            include_missing_columns=columns is not None,
+            strings_can_be_null=True,
+            timestamp_parsers=[],
+        )
+        return pa_csv.read_csv(path, convert_options=convert)
+    if fmt == "jsonl":
+        table = pa_json.read_json(path)
+    elif fmt == "parquet":
+        names = pq.ParquetFile(path).schema_arrow.names
+        table = pq.read_table(path, columns=[col for col in columns if col in names] if columns is not None else None)
+    else:
+        table = pa.Table.from_pandas(ingest.load(path, columns), preserve_index=False)
+    if columns is not None:
+        table = table.select([col for col in columns if col in table.column_names])
+    return table
+
+
+def with_partitions(table, values, types):
+    for key, value in values.items():
+        if key in table.column_names:
+            continue
+        if types[key]:
+            array = pa.array(np.full(table.num_rows, typed(value), dtype=np.float64 if isinstance(typed(value), float) else np.int64))
+        else:
+            # A one-entry dictionary, so the column costs one small index per row.
+            array = pa.DictionaryArray.from_arrays(pa.array(np.zeros(table.num_rows, dtype=np.int32)), pa.array([value]))
+        table = table.append_column(key, array)
+    return table
+
+
+def with_partitions_frame(frame, values, types):
+    for key, value in values.items():
+        if key not in frame.columns:
+            frame[key] = typed(value) if types[key] else pd.Categorical([value] * len(frame))
+    return frame
+
+
+class PartitionedSource:
+    """Every supported file under a directory or matching a glob, loaded as one dataset.
+
+    Directory names like year=2024/ become columns, and filters on them skip whole files
+    before they are read.
+    """
+
+    def __init__(self, location, pattern="*", columns=None, dtypes=None, filters="", workers=None):
+        self.location = location
+        self.pattern = pattern
+        self.columns = columns
+        self.dtypes = dtypes
+        self.filters = filters
+        self.workers = workers or os.cpu_count()
+        self.root = location if os.path.isdir(location) else os.path.dirname(location.split("*")[0])
+
+    @property
+    def name(self):
+        return os.path.join(self.location, self.pattern) if os.path.isdir(self.location) else self.location
+
+    def files(self):
+        """(path, partition values) for the files that pass the filters."""
+        filters = parse_filters(self.filters)
+        selected = []
+        keys = set()
+        for path in find_files(self.location, self.pattern):
+            values = partition_values(path, self.root)
+            keys.update(values)
+            if matches(values, filters):
+                selected.append((path, values))
+        unknown = sorted({key for key, _, _ in filters} - keys)
+        if unknown:
+            raise ValueError(f"No partition directories are named {', '.join(unknown)}; filters apply to key=value folders.")
+        return selected
+
+    def preview(self, rows=ingest.PREVIEW_ROWS):
+        files = self.files()
+        if not files:
+            raise ValueError(f"No supported files match {self.name}.")
+        path, values = files[0]
+        return with_partitions_frame(ingest.preview(path, rows), values, partition_types([values]))
+
+    def cache_key(self, cache):
+        stats = [(path, os.path.getsize(path), os.stat(path).st_mtime_ns) for path, _ in self.files()]
+        return cache.derived_key("partitioned", os.path.abspath(self.name), stats, self.columns, self.dtypes)
+
+    def file_columns(self, values):
+        if self.columns is None:
+            return None
+        return [col for col in self.columns if col not in values]
+
+    def load(self, on_chunk=None, should_cancel=None):
+        files = self.files()
+        if not files:
+            raise ValueError(f"No supported files match {self.name}.")
+        types = partition_types([values for _, values in files])
+        total_bytes = sum(os.path.getsize(path) for path, _ in files)
+        read = self.read_arrow if pa is not None else self.read_pandas
+        parts = [None] * len(files)
+        bytes_read = rows = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(read, path, values, types): i for i, (path, values) in enumerate(files)}
+            for future in as_completed(futures):
+                if should_cancel is not None and should_cancel():
+                    for pending in futures:
+                        pending.cancel()
+                    return None
+                i = futures[future]
+                parts[i] = future.result()
+                bytes_read += os.path.getsize(files[i][0])
+                rows += parts[i].num_rows if pa is not None else len(parts[i])
+                if on_chunk is not None:
+                    on_chunk(None, rows, bytes_read, total_bytes)
+        if pa is not None:
+            # Concatenating Arrow tables only links their buffers; the one copy is to pandas.
+            frame = pa.concat_tables(unify(parts)).to_pandas(split_blocks=True, self_destruct=True)
+        else:
+            frame = pd.concat(parts, ignore_index=True, copy=False)
+            for key, numeric in types.items():
+                if not numeric and key in frame.columns:
+                    frame[key] = frame[key].astype("category")
+        if self.columns is not None:
+            frame = ingest.project(frame, self.columns)
+        return ingest.apply_dtypes(frame, self.dtypes or {})
+
+    def read_arrow(self, path, values, types):
+        return with_partitions(read_table(path, self.file_columns(values)), values, types)
+
+    def read_pandas(self, path, values, types):
+        return with_partitions_frame(ingest.load(path, self.file_columns(values)), values, types)
@@ -0,0 +1,236 @@
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import compaction
+import ingest
+import outofcore
+from cache import ColumnarCache
+from cleaning import CleaningPlan
+from dataset import Dataset
+from export import export, export_extension
+from instrument import stage
+from stats import StatisticsEngine
+
+SUMMARY_FIELDS = [
+    "input", "status", "output", "rows_in", "rows_out", "columns", "rows_dropped",
+    "changed_columns", "load_seconds", "clean_seconds", "stats_seconds", "export_seconds", "error",
+]
+
+
+def store(cache, key, frame, background=True):
+    if cache is None:
+        return
+    if background:
+        cache.put_in_background(key, frame)
+    else:
+        cache.put(key, frame)
+
+
+def load_source(source, cache, on_chunk=None, should_cancel=None, background=True):
+    """Loads a source through the columnar cache; returns (frame, key), frame None if cancelled."""
+    with stage("load", source=source.name) as record:
+        key = source.cache_key(cache) if cache is not None and cache.enabled else None
+        data = cache.get(key) if cache is not None else None
+        record.fields["cached"] = data is not None
+        if data is None:
+            data = source.load(on_chunk=on_chunk, should_cancel=should_cancel)
+            if data is not None:
+                store(cache, key, data, background)
+        elif hasattr(source, "release"):
+            # Sources that opened a connection to work out their key let go of it unread.
+            source.release()
+        record.rows = len(data) if data is not None else None
+    return data, key
+
+
+def user_dtype_columns(source):
+    return [col for col, dtype in (getattr(source, "dtypes", None) or {}).items() if dtype != "auto"]
+
+
+def compact_frame(frame, key, cache=None, keep=()):
+    """Compacts dtypes of a loaded frame; returns (frame, report, key).
+
+    The key changes too, so snapshots derived from compacted data are cached apart from the rest.
+    """
+    with stage("compact", rows=len(frame)) as record:
+        compacted, report = compaction.compact(frame, keep)
+        record.fields["saved_bytes"] = report.before_bytes - report.after_bytes
+    if cache is not None and key:
+        key = cache.derived_key(key, "compact", compaction.CATEGORY_RATIO, tuple(keep))
+    return compacted, report, key
+
+
+def clean_dataset(dataset, plan, cache=None, background=True):
+    """Runs plan on the dataset's frame; returns (cleaned, report, key), report None on a cache hit."""
+    with stage("clean", source=dataset.name, rows=len(dataset.frame)) as record:
+        key = cache.derived_key(dataset.key, "clean", plan.key()) if cache is not None and dataset.key else None
+        cleaned = cache.get(key) if cache is not None else None
+        record.fields["cached"] = cleaned is not None
+        if cleaned is not None:
+            return cleaned, None, key
+        cleaned, report = plan.run(dataset.frame)
+        record.fields["rows_dropped"] = report.rows_dropped
+        store(cache, key, cleaned, background)
+    return cleaned, report, key
+
+
+def json_value(value):
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def write_statistics(statistics, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({str(col): stats for col, stats in statistics.items()}, f, indent=2, default=json_value)
+
+
+def output_path(input_path, output_dir, extension, root=None, keep_extension=False):
+    """Where input_path is written; keep_extension names it a.csv.csv rather than a.csv, for inputs that share a stem."""
+    relative = os.path.relpath(input_path, root) if root else os.path.basename(input_path)
+    stem = relative if keep_extension else os.path.splitext(relative)[0]
+    return os.path.join(output_dir, stem + extension)
+
+
+def output_names(paths, output_dir, extension, root):
+    """Whether each input keeps its extension in its output name, and the inputs whose output is still taken.
+
+    Inputs that share a stem (a.csv and a.json) keep their extension; any output claimed twice even then is
+    reported instead of being written by two files at once.
+    """
+    def outputs(keep):
+        claimed = {}
+        for path in paths:
+            output = os.path.normcase(output_path(os.path.abspath(path), output_dir, extension, root, path in keep))
+            claimed.setdefault(output, []).append(path)
+        return [group for group in claimed.values() if len(group) > 1]
+
+    keep = {path for group in outputs(set()) for path in group}
+    clashing = {path for group in outputs(keep) for path in group}
+    return keep, clashing
+
+
+def process_file_out_of_core(source, output, summary, clean, statistics, memory_budget):
+    started = time.perf_counter()
+    with stage("load.out_of_core", source=source.name, budget=memory_budget) as record:
+        dataset = outofcore.load(source, memory_budget)
+        record.rows = len(dataset)
+    summary.update(rows_in=len(dataset), columns=len(dataset.columns), load_seconds=time.perf_counter() - started)
+
+    summary.update(rows_dropped=0, changed_columns="")
+    if clean:
+        started = time.perf_counter()
+        with stage("clean.out_of_core", source=source.name, rows=len(dataset)):
+            cleaned, report = outofcore.clean(dataset, CleaningPlan.default())
+        dataset.remove()
+        dataset = cleaned
+        summary.update(rows_dropped=report.rows_dropped, changed_columns=";".join(map(str, sorted(report.changed_columns, key=str))))
+        summary["clean_seconds"] = time.perf_counter() - started
+
+    if statistics:
+        started = time.perf_counter()
+        with stage("statistics.out_of_core", source=source.name, rows=len(dataset)):
+            write_statistics(outofcore.compute_statistics(dataset), os.path.splitext(output)[0] + ".stats.json")
+        summary["stats_seconds"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    with stage("export", source=source.name, rows=len(dataset), path=output):
+        outofcore.export_dataset(dataset, output)
+    summary.update(output=output, rows_out=len(dataset), export_seconds=time.perf_counter() - started)
+    dataset.remove()
+
+
+def process_file(input_path, output_dir, extension=".csv", clean=True, statistics=True, use_cache=True, root=None, compact=False, memory_budget=None, keep_extension=False):
+    """Runs load → clean → stats → export for one file and returns its summary row.
+
+    Files too large for memory_budget are processed chunk by chunk from disk.
+    """
+    summary = dict.fromkeys(SUMMARY_FIELDS)
+    summary.update(input=input_path, status="ok", error="")
+    cache = ColumnarCache() if use_cache else None
+    try:
+        output = output_path(input_path, output_dir, extension, root, keep_extension)
+        if os.path.abspath(output) == os.path.abspath(input_path):
+            raise ValueError("Output would overwrite the input file; choose another output directory or format.")
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        source = ingest.FileSource(input_path)
+        if memory_budget and outofcore.exceeds_budget(source, memory_budget):
+            process_file_out_of_core(source, output, summary, clean, statistics, memory_budget)
+            return summary
+
+        started = time.perf_counter()
+        frame, key = load_source(source, cache, background=False)
+        if compact:
+            frame, _, key = compact_frame(frame, key, cache)
+        dataset = Dataset(frame, input_path, key)
+        summary.update(rows_in=len(frame), columns=len(frame.columns), load_seconds=time.perf_counter() - started)
+
+        summary.update(rows_dropped=0, changed_columns="")
+        if clean:
+            started = time.perf_counter()
+            cleaned, report, key = clean_dataset(dataset, CleaningPlan.default(), cache, background=False)
+            if report is None:
+                dataset.replace(cleaned, key=key)
+            else:
+                dataset.replace(cleaned, report.changed_columns, key)
+                summary.update(rows_dropped=report.rows_dropped, changed_columns=";".join(map(str, sorted(report.changed_columns, key=str))))
+            summary["clean_seconds"] = time.perf_counter() - started
+
+        if statistics:
+            started = time.perf_counter()
+            with stage("statistics", source=input_path, rows=len(dataset.frame)):
+                write_statistics(StatisticsEngine().compute(dataset), os.path.splitext(output)[0] + ".stats.json")
+            summary["stats_seconds"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        with stage("export", source=input_path, rows=len(dataset.frame), path=output):
+            export(dataset.frame, output)
+        summary.update(output=output, rows_out=len(dataset.frame), export_seconds=time.perf_counter() - started)
+    except Exception as e:
+        summary.update(status="error", error=f"{type(e).__name__}: {e}")
+    return summary
+
+
+def expand_inputs(patterns, recursive=False):
+    """Turns files, directories and glob patterns into a sorted list of supported files."""
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "**", "*") if recursive else os.path.join(pattern, "*")
+        for path in glob.glob(pattern, recursive=True):
+            if os.path.isfile(path) and os.path.splitext(path)[1].lower() in ingest.SUPPORTED_EXTENSIONS:
+                paths.add(os.path.normpath(path))
+    return sorted(paths)
+
+
+def common_root(paths):
+    if not paths:
+        return None
+    return os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths])
+
+
+def run_batch(paths, output_dir, extension=".csv", workers=None, clean=True, statistics=True, use_cache=True, compact=False, memory_budget=None):
+    """Processes files on a process pool and yields each summary row as it finishes."""
+    export_extension(output_dir + extension)
+    root = common_root(paths)
+    keep, clashing = output_names(paths, output_dir, extension, root)
+    for path in paths:
+        if path in clashing:
+            summary = dict.fromkeys(SUMMARY_FIELDS)
+            summary.update(input=os.path.abspath(path), status="error", error="ValueError: Another input is written to the same output file.")
+            yield summary
+    paths = [path for path in paths if path not in clashing]
+    if workers == 1:
+        for path in paths:
+            yield process_file(os.path.abspath(path), output_dir, extension, clean, statistics, use_cache, root, compact, memory_budget, path in keep)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(process_file, os.path.abspath(path), output_dir, extension, clean, statistics, use_cache, root, compact, memory_budget, path in keep)
+            for path in paths
+        ]
+        for future in as_completed(futures):
+            yield future.result()
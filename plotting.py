@@ -0,0 +1,285 @@
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype, is_integer_dtype, is_numeric_dtype
+
+from stats import column_values, is_numeric_column
+
+PLOT_TYPES = ["Bar", "Line", "Scatter", "Pie", "Histogram", "Box"]
+DEFAULT_WIDTH = 800
+MAX_CATEGORIES = 30
+BAR_BINS = 30
+HISTOGRAM_BINS = 10
+MAX_FLIERS = 1000
+# Appended points are kept until a line or scatter has this many times the canvas width, then decimated again.
+EXTEND_SLACK = 4
+
+
+def x_values(frame):
+    if is_numeric_dtype(frame.index):
+        return frame.index.to_numpy(dtype=np.float64)
+    return np.arange(len(frame), dtype=np.float64)
+
+
+def min_max_decimate(x, y, buckets):
+    # Keeps the smallest and largest value of each bucket so spikes survive decimation.
+    n = len(y)
+    if n <= 2 * buckets:
+        return x, y
+    size = -(-n // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    blocks = padded.reshape(buckets, size)
+    missing = np.isnan(blocks)
+    low = np.where(missing, np.inf, blocks).argmin(axis=1)
+    high = np.where(missing, -np.inf, blocks).argmax(axis=1)
+    offsets = np.arange(buckets) * size
+    positions = np.unique(np.concatenate([low + offsets, high + offsets]))
+    positions = positions[positions < n]
+    return x[positions], y[positions]
+
+
+def category_counts(series, limit=MAX_CATEGORIES):
+    counts = series.value_counts()
+    counts = counts[counts > 0]
+    if len(counts) > limit:
+        other = counts.iloc[limit - 1:].sum()
+        counts = pd.concat([counts.iloc[:limit - 1], pd.Series([other], index=["Other"])])
+    return [str(label) for label in counts.index], counts.to_numpy()
+
+
+def finite_values(series):
+    values = column_values(series)
+    return values[~np.isnan(values)]
+
+
+def bar_data(series):
+    if not is_numeric_column(series):
+        labels, counts = category_counts(series)
+        return {"kind": "bar", "labels": labels, "counts": counts}
+    values = finite_values(series)
+    if is_integer_dtype(series) and len(values) and values.max() - values.min() < MAX_CATEGORIES:
+        low = int(values.min())
+        counts = np.bincount((values - low).astype(np.int64))
+        present = np.flatnonzero(counts)
+        return {"kind": "bar", "labels": [str(low + i) for i in present], "counts": counts[present]}
+    counts, edges = np.histogram(values, bins=BAR_BINS)
+    return {"kind": "binned_bar", "counts": counts, "edges": edges}
+
+
+def box_data(values, label):
+    if not len(values):
+        raise ValueError("Column has no numeric values to plot.")
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    low = q1 - 1.5 * (q3 - q1)
+    high = q3 + 1.5 * (q3 - q1)
+    outside = (values < low) | (values > high)
+    inside = values[~outside]
+    fliers = np.sort(values[outside])
+    if len(fliers) > MAX_FLIERS:
+        fliers = fliers[np.linspace(0, len(fliers) - 1, MAX_FLIERS).astype(np.int64)]
+    return {
+        "kind": "box",
+        "stats": {
+            "label": label,
+            "med": median,
+            "q1": q1,
+            "q3": q3,
+            "whislo": inside.min() if len(inside) else q1,
+            "whishi": inside.max() if len(inside) else q3,
+            "fliers": fliers,
+        },
+    }
+
+
+def prepare_plot_data(frame, column, plot_type, width=DEFAULT_WIDTH):
+    series = frame[column]
+    if plot_type in ("Line", "Scatter"):
+        if not is_numeric_column(series):
+            raise ValueError(f"{plot_type} plots need a numeric column.")
+        x, y = min_max_decimate(x_values(frame), column_values(series), max(1, width))
+        return {"kind": plot_type.lower(), "x": x, "y": y}
+    if plot_type == "Bar":
+        return bar_data(series)
+    if plot_type == "Pie":
+        labels, counts = category_counts(series)
+        return {"kind": "pie", "labels": labels, "counts": counts}
+    if plot_type == "Histogram":
+        if not is_numeric_column(series):
+            return bar_data(series)
+        counts, edges = np.histogram(finite_values(series), bins=HISTOGRAM_BINS)
+        return {"kind": "histogram", "counts": counts, "edges": edges}
+    if plot_type == "Box":
+        if not is_numeric_column(series):
+            raise ValueError("Box plots need a numeric column.")
+        return box_data(finite_values(series), str(column))
+    raise ValueError(f"Unsupported plot type: {plot_type}")
+
+
+def group_labels(index):
+    if isinstance(index, pd.MultiIndex):
+        return [" / ".join(map(str, key)) for key in index]
+    if is_datetime64_any_dtype(index):
+        return [str(label) for label in index.astype(str)]
+    return [str(label) for label in index]
+
+
+def largest(frame, limit=MAX_CATEGORIES):
+    # The rows with the largest totals, kept in group order so time buckets stay in sequence.
+    if len(frame) <= limit:
+        return frame
+    totals = frame.abs().sum(axis=1).to_numpy()
+    return frame.iloc[np.sort(np.argsort(-totals, kind="stable")[:limit])]
+
+
+def aggregate_plot_data(result, plot_type):
+    """Plot data for an AggregationEngine result: one value per group, or one series per pivot column."""
+    index = result.index
+    names = [str(name) for name in index.names if name is not None]
+    labels = {"xlabel": " / ".join(names), "ylabel": str(result.columns[0]) if result.shape[1] == 1 else "Value"}
+    pivoted = result.shape[1] > 1
+    if pivoted:
+        # Too many pivot values make an unreadable legend, so only the largest series are drawn.
+        result = largest(result.T).T
+    if plot_type in ("Line", "Scatter"):
+        numeric_x = not isinstance(index, pd.MultiIndex) and (is_numeric_dtype(index) or is_datetime64_any_dtype(index))
+        x = index.to_numpy() if numeric_x else np.arange(len(index), dtype=np.float64)
+        tick_labels = None if numeric_x else group_labels(index)
+        if pivoted:
+            series = [(str(col), result[col].to_numpy(dtype=np.float64)) for col in result.columns]
+            return {"kind": f"multi_{plot_type.lower()}", "x": x, "series": series, "labels": tick_labels, **labels}
+        return {"kind": plot_type.lower(), "x": x, "y": result.iloc[:, 0].to_numpy(dtype=np.float64), "labels": tick_labels, **labels}
+    if plot_type == "Bar":
+        shown = largest(result.fillna(0))
+        if pivoted:
+            series = [(str(col), shown[col].to_numpy()) for col in shown.columns]
+            return {"kind": "grouped_bar", "labels": group_labels(shown.index), "series": series, **labels}
+        return {"kind": "bar", "labels": group_labels(shown.index), "counts": shown.iloc[:, 0].to_numpy(), **labels}
+    if plot_type == "Pie":
+        if pivoted:
+            raise ValueError("Pie charts show one value per group; remove the pivot.")
+        values = result.iloc[:, 0].fillna(0)
+        if (values < 0).any():
+            raise ValueError("Pie charts need values that are not negative.")
+        shown = largest(values.to_frame()).iloc[:, 0]
+        return {"kind": "pie", "labels": group_labels(shown.index), "counts": shown.to_numpy()}
+    values = result.to_numpy(dtype=np.float64).ravel()
+    values = values[~np.isnan(values)]
+    if plot_type == "Histogram":
+        counts, edges = np.histogram(values, bins=HISTOGRAM_BINS)
+        return {"kind": "histogram", "counts": counts, "edges": edges}
+    if plot_type == "Box":
+        return box_data(values, labels["ylabel"])
+    raise ValueError(f"Unsupported plot type: {plot_type}")
+
+
+def extend_plot_data(plot_data, rows, column, width=DEFAULT_WIDTH):
+    """plot_data with rows appended to the data it came from; None if it has to be prepared again."""
+    kind = plot_data["kind"]
+    series = rows[column] if column in rows.columns else None
+    if series is None or not is_numeric_column(series):
+        return None
+    if kind in ("line", "scatter"):
+        width = max(1, width)
+        x, y = min_max_decimate(x_values(rows), column_values(series), width)
+        x, y = np.concatenate([plot_data["x"], x]), np.concatenate([plot_data["y"], y])
+        if len(y) > EXTEND_SLACK * width:
+            x, y = min_max_decimate(x, y, width)
+        return {"kind": kind, "x": x, "y": y}
+    if kind == "histogram":
+        values, edges = finite_values(series), plot_data["edges"]
+        if len(values) and (values.min() < edges[0] or values.max() > edges[-1]):
+            return None
+        return {"kind": kind, "counts": plot_data["counts"] + np.histogram(values, bins=edges)[0], "edges": edges}
+    return None
+
+
+def update_plot_artists(ax, plot_data):
+    """Moves extended plot_data into the artists draw_plot_data made, without drawing them again."""
+    kind = plot_data["kind"]
+    if kind == "line":
+        ax.lines[0].set_data(plot_data["x"], plot_data["y"])
+    elif kind == "scatter":
+        ax.collections[0].set_offsets(np.column_stack([plot_data["x"], plot_data["y"]]))
+    elif kind == "histogram":
+        for patch, count in zip(ax.patches, plot_data["counts"]):
+            patch.set_height(count)
+    ax.relim()
+    if kind == "scatter" and len(plot_data["x"]):
+        # relim skips collections, so the scatter points are added to the limits by hand.
+        ax.update_datalim(np.column_stack([plot_data["x"], plot_data["y"]]))
+    ax.autoscale_view()
+
+
+def draw_plot_data(ax, plot_data):
+    kind = plot_data["kind"]
+    if kind == "line":
+        ax.plot(plot_data["x"], plot_data["y"])
+    elif kind == "scatter":
+        ax.scatter(plot_data["x"], plot_data["y"], s=4)
+    elif kind == "bar":
+        ax.bar(range(len(plot_data["counts"])), plot_data["counts"], tick_label=plot_data["labels"])
+    elif kind == "binned_bar":
+        edges = plot_data["edges"]
+        ax.bar(edges[:-1], plot_data["counts"], width=np.diff(edges), align="edge")
+    elif kind == "pie":
+        ax.pie(plot_data["counts"], labels=plot_data["labels"])
+    elif kind == "histogram":
+        edges = plot_data["edges"]
+        ax.hist(edges[:-1], bins=edges, weights=plot_data["counts"])
+    elif kind == "box":
+        ax.bxp([plot_data["stats"]])
+    elif kind == "grouped_bar":
+        series = plot_data["series"]
+        width = 0.8 / max(1, len(series))
+        positions = np.arange(len(plot_data["labels"]))
+        for i, (name, values) in enumerate(series):
+            ax.bar(positions + i * width, values, width=width, label=name)
+        ax.set_xticks(positions + width * (len(series) - 1) / 2, plot_data["labels"])
+        ax.legend()
+    elif kind in ("multi_line", "multi_scatter"):
+        for name, y in plot_data["series"]:
+            if kind == "multi_line":
+                ax.plot(plot_data["x"], y, label=name)
+            else:
+                ax.scatter(plot_data["x"], y, s=4, label=name)
+        ax.legend()
+    if plot_data.get("labels") is not None and kind in ("line", "scatter", "multi_line", "multi_scatter"):
+        # Group keys that are not numbers are plotted at 0, 1, 2, ... and named on the ticks.
+        if len(plot_data["labels"]) <= MAX_CATEGORIES:
+            ax.set_xticks(plot_data["x"], plot_data["labels"])
+    if "xlabel" in plot_data:
+        ax.set_xlabel(plot_data["xlabel"])
+        ax.set_ylabel(plot_data["ylabel"])
+    elif kind in ("line", "scatter"):
+        ax.set_xlabel('Index')
+        ax.set_ylabel('Value')
+    elif kind in ("bar", "binned_bar", "histogram"):
+        ax.set_xlabel('Value')
+        ax.set_ylabel('Count')
+
+
+class PlotDataCache:
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def key(self, dataset, column, plot_type, width):
+        if plot_type not in ("Line", "Scatter"):
+            width = None
+        return (column, plot_type, dataset.column_versions.get(column), width)
+
+    def get(self, dataset, column, plot_type, width=DEFAULT_WIDTH):
+        key = self.key(dataset, column, plot_type, width)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        plot_data = prepare_plot_data(dataset.frame, column, plot_type, key[3] or DEFAULT_WIDTH)
+        self.put(dataset, column, plot_type, width, plot_data)
+        return plot_data
+
+    def put(self, dataset, column, plot_type, width, plot_data):
+        self.entries[self.key(dataset, column, plot_type, width)] = plot_data
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
@@ -0,0 +1,719 @@
+import copy
+import time
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+import export
+import outofcore
+import pipeline
+import session
+import watch
+from cleaning import CleaningPlan
+from dataset import Dataset
+from gridview import GridView
+from instrument import stage
+from stats import StatisticsEngine, StreamingStatistics, format_data_info
+from tasks import BackgroundTask
+
+
+class DataGrid(tk.Frame):
+    def __init__(self, parent, buffer_rows=100):
+        super().__init__(parent)
+        self.buffer_rows = buffer_rows
+        self.view = GridView()
+        self.first_row = 0
+        self.visible_rows = 20
+        self.block = None
+        self.block_start = 0
+        self.sort_column = None
+        self.sort_ascending = True
+        self.items = []
+
+        self.filter_column = tk.StringVar()
+        self.filter_text = tk.StringVar()
+
+        filter_bar = tk.Frame(self)
+        filter_bar.pack(side="top", fill="x")
+        ttk.Label(filter_bar, text="Filter:").pack(side="left")
+        self.filter_column_dropdown = ttk.Combobox(filter_bar, textvariable=self.filter_column, state="readonly")
+        self.filter_column_dropdown.pack(side="left", padx=5)
+        self.filter_entry = ttk.Entry(filter_bar, textvariable=self.filter_text)
+        self.filter_entry.pack(side="left", padx=5)
+        self.filter_entry.bind("<Return>", lambda event: self.apply_view())
+        ttk.Button(filter_bar, text="Apply", command=self.apply_view).pack(side="left")
+        ttk.Button(filter_bar, text="Clear", command=self.clear_filter).pack(side="left")
+        self.status_label = ttk.Label(filter_bar, text="")
+        self.status_label.pack(side="right")
+
+        body = tk.Frame(self)
+        body.pack(side="top", fill="both", expand=True)
+        self.scrollbar = ttk.Scrollbar(body, orient="vertical", command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.treeview = ttk.Treeview(body, height=self.visible_rows)
+        self.treeview.pack(side="left", fill="both", expand=True)
+
+        self.treeview.bind("<Configure>", self.on_resize)
+        self.treeview.bind("<MouseWheel>", self.on_mousewheel)
+        self.treeview.bind("<Button-4>", lambda event: self.scroll_rows(-3))
+        self.treeview.bind("<Button-5>", lambda event: self.scroll_rows(3))
+
+    @property
+    def data(self):
+        return self.view.data
+
+    def set_data(self, title, dataframe):
+        self.view.set_data(dataframe)
+        self.first_row = 0
+        self.block = None
+        self.sort_column = None
+        self.sort_ascending = True
+        self.filter_text.set("")
+
+        column_names = [str(col) for col in dataframe.columns]
+        self.treeview.delete(*self.items)
+        self.items = []
+        self.treeview['columns'] = [str(i) for i in range(len(column_names))]
+        self.treeview.heading("#0", text=title)
+        for i, name in enumerate(column_names):
+            self.treeview.heading(str(i), text=name, command=lambda i=i: self.sort_by(i))
+        self.filter_column_dropdown['values'] = column_names
+        if column_names:
+            self.filter_column.set(column_names[0])
+        self.render()
+
+    def row_count(self):
+        return self.view.row_count()
+
+    def fetch_rows(self, start, stop):
+        if self.block is None or start < self.block_start or stop > self.block_start + len(self.block):
+            self.block_start = max(0, start - self.buffer_rows)
+            self.block = self.view.take(self.block_start, min(self.row_count(), stop + self.buffer_rows))
+        offset = start - self.block_start
+        rows = self.block.iloc[offset:offset + stop - start]
+        return zip(rows.index.tolist(), rows.itertuples(index=False, name=None))
+
+    def render(self):
+        total = self.row_count()
+        self.first_row = max(0, min(self.first_row, total - self.visible_rows))
+        stop = min(self.first_row + self.visible_rows, total)
+        rows = list(self.fetch_rows(self.first_row, stop)) if stop > self.first_row else []
+
+        while len(self.items) < len(rows):
+            self.items.append(self.treeview.insert('', 'end'))
+        if len(self.items) > len(rows):
+            self.treeview.delete(*self.items[len(rows):])
+            del self.items[len(rows):]
+        for iid, (label, values) in zip(self.items, rows):
+            self.treeview.item(iid, text=label, values=values)
+
+        if total:
+            self.scrollbar.set(self.first_row / total, stop / total)
+            self.status_label.config(text=f"Rows {self.first_row + 1}-{stop} of {total}")
+        else:
+            self.scrollbar.set(0, 1)
+            self.status_label.config(text="No rows")
+
+    def scroll_rows(self, count):
+        self.first_row += count
+        self.render()
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.first_row = int(float(amount) * self.row_count())
+            self.render()
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll_rows(int(amount) * step)
+
+    def on_mousewheel(self, event):
+        self.scroll_rows(-3 if event.delta > 0 else 3)
+
+    def on_resize(self, event):
+        row_height = ttk.Style().lookup("Treeview", "rowheight") or 20
+        visible_rows = max(1, event.height // int(row_height) - 1)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.render()
+
+    def sort_by(self, index):
+        if self.view.paged:
+            self.status_label.config(text="Sorting needs the data in memory")
+            return
+        if self.sort_column == index:
+            self.sort_ascending = not self.sort_ascending
+        else:
+            self.sort_column = index
+            self.sort_ascending = True
+        for i, name in enumerate(self.data.columns):
+            arrow = ""
+            if i == index:
+                arrow = " ▲" if self.sort_ascending else " ▼"
+            self.treeview.heading(str(i), text=f"{name}{arrow}")
+        self.apply_view()
+
+    def clear_filter(self):
+        self.filter_text.set("")
+        self.apply_view()
+
+    def update_view(self):
+        names = [str(col) for col in self.data.columns]
+        column = self.filter_column.get()
+        try:
+            self.view.apply(
+                self.sort_column,
+                self.sort_ascending,
+                names.index(column) if column in names else None,
+                self.filter_text.get(),
+            )
+        except ValueError as e:
+            messagebox.showinfo("Filter", str(e))
+            return False
+        return True
+
+    def apply_view(self):
+        if self.data is None:
+            return
+        if not self.update_view():
+            return
+        self.first_row = 0
+        self.block = None
+        self.render()
+
+    def extend(self, count):
+        """Shows the last count rows of the data, which were just appended, keeping the position, sort and filter.
+
+        A grid scrolled to the last row keeps following the end as rows arrive.
+        """
+        following = self.first_row + self.visible_rows >= self.row_count()
+        self.view.append(count)
+        self.block = None
+        if following:
+            self.first_row = self.row_count()
+        self.render()
+
+
+class ProcessDataFrame(tk.Frame):
+    def __init__(self, parent, source):
+        super().__init__(parent)
+        self.source = source
+        self.cache = parent.cache
+        self.source_key = None
+        self.compact = parent.compact_dtypes.get()
+        self.compaction = None
+        self.memory_budget = parent.memory_budget or outofcore.MEMORY_BUDGET
+        self.out_of_core = parent.out_of_core.get() or outofcore.exceeds_budget(source, self.memory_budget)
+        self.statistics = StatisticsEngine()
+        self.cleaning_plan = CleaningPlan.default()
+        self.stats_task = None
+        self.cleaning_task = None
+        self.load_task = None
+        self.export_task = None
+        self.watch_task = None
+        self.watch_job = None
+        self.live_statistics = None
+        self.needs_reload = False
+        self.reload_state = None
+        self.dataset = None
+        self.visualization = None
+        self.plot_sample = None
+        self.memory = (None, 0)
+        self.closed = False
+        self.create_widgets()
+        self.start_loading()
+
+    @property
+    def paged(self):
+        return isinstance(self.dataset, outofcore.ChunkedDataset)
+
+    @property
+    def data(self):
+        if self.dataset is None:
+            return None
+        return self.dataset if self.paged else self.dataset.frame
+
+    @property
+    def watching(self):
+        return self.watch_var.get()
+
+    def memory_bytes(self):
+        """Memory the dataset and its plot sample take, measured again only when they change."""
+        frames = [] if self.dataset is None or self.paged else self.dataset.parts
+        if self.plot_sample is not None:
+            frames.append(self.plot_sample[2].frame)
+        version = tuple((id(frame), len(frame), len(frame.columns)) for frame in frames)
+        if self.memory[0] != version:
+            self.memory = (version, sum(session.frame_bytes(frame) for frame in frames))
+        return self.memory[1]
+
+    def load_data(self, on_chunk=None, should_cancel=None):
+        if self.out_of_core:
+            if not hasattr(self.source, "file_path"):
+                raise ValueError("Out-of-core mode works with local files only.")
+            with stage("load.out_of_core", source=self.source.name, budget=self.memory_budget) as record:
+                data = outofcore.load(self.source, self.memory_budget, on_chunk, should_cancel)
+                record.rows = len(data) if data is not None else None
+            return data
+        data, self.source_key = pipeline.load_source(self.source, self.cache, on_chunk, should_cancel)
+        if data is not None and self.compact:
+            keep = pipeline.user_dtype_columns(self.source)
+            data, self.compaction, self.source_key = pipeline.compact_frame(data, self.source_key, self.cache, keep)
+        return data
+
+    def start_loading(self):
+        self.set_actions_state("disabled")
+        self.load_task = BackgroundTask(
+            self,
+            self.run_load,
+            self.on_load_done,
+            on_error=lambda e: self.display_file_load_error(f"Failed to load data from {self.source.name}: {e}"),
+            on_progress=self.on_load_progress,
+        ).start()
+
+    def run_load(self, task):
+        def on_chunk(chunk, rows, bytes_read, total_bytes):
+            task.report(chunk if chunk is not None and rows == len(chunk) else None, rows, bytes_read, total_bytes)
+
+        return self.load_data(on_chunk=on_chunk, should_cancel=lambda: task.cancelled)
+
+    def on_load_progress(self, first_chunk, rows, bytes_read, total_bytes):
+        if first_chunk is not None:
+            self.data_grid.set_data("Loading...", first_chunk)
+        if total_bytes:
+            self.progress_bar['value'] = 100 * bytes_read / total_bytes
+            self.progress_label.config(text=f"Loaded {rows:,} rows ({bytes_read / 2**20:.1f} of {total_bytes / 2**20:.1f} MB)")
+        else:
+            self.progress_bar.config(mode="indeterminate")
+            self.progress_bar.step(5)
+            self.progress_label.config(text=f"Loaded {rows:,} rows")
+
+    def on_load_done(self, data):
+        self.progress_frame.pack_forget()
+        if data is None:
+            messagebox.showinfo("Data Loading", "Loading cancelled.")
+            if self.reload_state is not None:
+                self.restore_after_reload()
+            elif self.winfo_ismapped():
+                self.go_back()
+            else:
+                self.master.datasets.discard(self)
+            return
+        self.dataset = data if isinstance(data, outofcore.ChunkedDataset) else Dataset(data, self.source.name, self.source_key)
+        # Column versions start again at 0, so statistics cached for the previous dataset would match.
+        self.statistics = StatisticsEngine()
+        self.needs_reload = False
+        self.reload_state = None
+        self.set_actions_state("normal")
+        self.display_dataframe("Data", self.dataset)
+        if self.watch_var.get():
+            self.start_watching()
+        self.master.datasets.evict()
+
+    def cancel_loading(self):
+        if self.load_task is not None and not self.load_task.finished:
+            self.load_task.cancel()
+            self.cancel_button.config(state="disabled")
+            self.progress_label.config(text="Cancelling...")
+
+    def set_actions_state(self, state):
+        for button in self.action_buttons:
+            button.config(state=state)
+
+    def display_file_load_error(self, error_message):
+        self.progress_frame.pack_forget()
+        messagebox.showerror("Data Load Error", error_message)
+        if self.reload_state is not None:
+            self.restore_after_reload()
+
+    def restore_after_reload(self):
+        # A watch reload that did not finish leaves the rows already on screen as they were.
+        self.source, self.compaction = self.reload_state
+        self.reload_state = None
+        self.watch_var.set(False)
+        self.set_actions_state("normal")
+        self.data_grid.set_data("Data", self.dataset)
+
+
+    def create_widgets(self):
+        self.progress_frame = tk.Frame(self)
+        self.progress_frame.pack(side="top", fill="x")
+
+        self.progress_bar = ttk.Progressbar(self.progress_frame, mode="determinate", maximum=100)
+        self.progress_bar.pack(side="left", fill="x", expand=True, padx=5)
+
+        self.progress_label = ttk.Label(self.progress_frame, text="Loading...")
+        self.progress_label.pack(side="left", padx=5)
+
+        self.cancel_button = ttk.Button(self.progress_frame, text="Cancel", command=self.cancel_loading)
+        self.cancel_button.pack(side="left")
+
+        self.data_grid = DataGrid(self)
+        self.data_grid.pack(side="top", fill='both',expand=True)
+
+        self.info_frame = tk.Frame(self)
+        self.info_frame.pack(side="left", fill="both",expand=True)
+
+        self.data_info_label = ttk.Label(self.info_frame, text="Data Info:")
+        self.data_info_label.pack( anchor="w")
+
+        self.data_info_text = tk.Text(self.info_frame, wrap="word")
+        self.data_info_text.pack(fill="both",)
+
+        self.clean_button = ttk.Button(self, text="Clean Data", command=self.clean_data)
+        self.clean_button.pack(side="right",anchor='center')
+
+        self.back_button = ttk.Button(self, text="Back", command=self.go_back)
+        self.back_button.pack(side="right", anchor='center')
+
+        self.visualize_button = ttk.Button(self, text="Hii", command=self.go_to_visualization)
+        self.visualize_button.pack(side="bottom")
+            
+        self.download_csv_button = ttk.Button(self, text="Download CSV", command=self.download_csv)
+        self.download_csv_button.pack(side="bottom", anchor='center')
+
+        self.download_json_button = ttk.Button(self, text="Download JSON", command=self.download_json)
+        self.download_json_button.pack(side="bottom", anchor='center')
+
+        self.download_excel_button = ttk.Button(self, text="Download Excel", command=self.download_excel)
+        self.download_excel_button.pack(side="bottom", anchor='center')
+
+        self.download_other_button = ttk.Button(self, text="Download As...", command=self.download_other)
+        self.download_other_button.pack(side="bottom", anchor='center')
+
+        self.watch_var = tk.BooleanVar(value=False)
+        self.watch_check = ttk.Checkbutton(self, text="Watch File for New Rows", variable=self.watch_var, command=self.toggle_watch)
+        self.watch_check.pack(side="bottom", anchor='center')
+        if not watch.can_watch(self.source):
+            self.watch_check.config(state="disabled")
+
+        self.action_buttons = [
+            self.clean_button,
+            self.visualize_button,
+            self.download_csv_button,
+            self.download_json_button,
+            self.download_excel_button,
+            self.download_other_button,
+        ]
+        if watch.can_watch(self.source):
+            self.action_buttons.append(self.watch_check)
+
+    def download_csv(self):
+        self.download_data(".csv")
+
+    def download_json(self):
+        self.download_data(".json")
+
+    def download_excel(self):
+        self.download_data(".xlsx")
+
+    def download_other(self):
+        self.download_data(None)
+
+    def download_data(self, extension):
+        if self.data is not None:
+            extensions = [extension] if extension else export.available_extensions()
+            filetypes = [(export.EXPORT_FORMATS[ext], "*" + ext) for ext in extensions]
+            save_path = filedialog.asksaveasfilename(defaultextension=extension or ".csv", filetypes=filetypes)
+            if save_path:
+                try:
+                    export.export_extension(save_path)
+                except ValueError as e:
+                    messagebox.showerror("Download Error", str(e))
+                    return
+                self.start_export(save_path)
+        else:
+            messagebox.showerror("Download Error", "No data to download.")
+
+    def start_export(self, save_path):
+        frame = self.data
+
+        def run_export(task):
+            with stage("export", source=self.source.name, rows=len(frame), path=save_path):
+                if isinstance(frame, outofcore.ChunkedDataset):
+                    return outofcore.export_dataset(frame, save_path, on_progress=task.report, should_cancel=lambda: task.cancelled)
+                return export.export(frame, save_path, on_progress=task.report, should_cancel=lambda: task.cancelled)
+
+        self.set_actions_state("disabled")
+        self.progress_bar.config(mode="determinate", value=0)
+        self.progress_label.config(text="Exporting...")
+        self.cancel_button.config(state="normal", command=self.cancel_export)
+        self.progress_frame.pack(side="top", fill="x", before=self.data_grid)
+        self.export_task = BackgroundTask(
+            self,
+            run_export,
+            lambda completed: self.on_export_done(completed, save_path),
+            on_error=self.on_export_error,
+            on_progress=self.on_export_progress,
+        ).start()
+
+    def on_export_progress(self, rows, total_rows):
+        self.progress_bar['value'] = 100 * rows / max(1, total_rows)
+        self.progress_label.config(text=f"Exported {rows:,} of {total_rows:,} rows")
+
+    def on_export_done(self, completed, save_path):
+        self.progress_frame.pack_forget()
+        self.set_actions_state("normal")
+        if completed:
+            messagebox.showinfo("Download Successful", f"Data has been successfully downloaded to {save_path}.")
+        else:
+            messagebox.showinfo("Download", "Download cancelled.")
+
+    def on_export_error(self, error):
+        self.progress_frame.pack_forget()
+        self.set_actions_state("normal")
+        messagebox.showerror("Download Error", f"An error occurred while downloading: {str(error)}")
+
+    def cancel_export(self):
+        if self.export_task is not None and not self.export_task.finished:
+            self.export_task.cancel()
+            self.cancel_button.config(state="disabled")
+            self.progress_label.config(text="Cancelling...")
+
+    def clean_data(self):
+        if self.data is None:
+            messagebox.showinfo("Data Information", "No data loaded.")
+            return
+        # Rows appended to cleaned data would skip the cleaning, so watching stops here.
+        self.stop_watching()
+        self.set_actions_state("disabled")
+        dataset = self.dataset
+        plan = self.cleaning_plan
+        self.cleaning_task = BackgroundTask(
+            self,
+            lambda task: self.run_cleaning(dataset, plan, lambda: task.cancelled),
+            self.on_cleaning_done,
+            on_error=self.on_cleaning_error,
+        ).start()
+
+    def run_cleaning(self, dataset, plan, should_cancel=None):
+        if isinstance(dataset, outofcore.ChunkedDataset):
+            with stage("clean.out_of_core", source=dataset.name, rows=len(dataset)) as record:
+                cleaned, report = outofcore.clean(dataset, plan, should_cancel)
+                record.fields["rows_dropped"] = report.rows_dropped if report is not None else None
+            return cleaned, report, None
+        return pipeline.clean_dataset(dataset, plan, self.cache)
+
+    def on_cleaning_done(self, result):
+        cleaned, report, key = result
+        self.set_actions_state("normal")
+        if self.paged:
+            if cleaned is None:
+                return
+            if self.stats_task is not None:
+                self.stats_task.cancel()
+            self.dataset.remove()
+            self.dataset = cleaned
+            summary = report.format()
+        elif report is None:
+            self.dataset.replace(cleaned, key=key)
+            summary = "Loaded cleaned snapshot from cache."
+        else:
+            self.dataset.replace(cleaned, report.changed_columns, key)
+            summary = report.format()
+        self.needs_reload = True
+        messagebox.showinfo("Data Cleaning", f"Data cleaned successfully.\n\n{summary}")
+        self.update_treeview()
+        self.master.datasets.evict()
+
+    def on_cleaning_error(self, e):
+        self.set_actions_state("normal")
+        messagebox.showerror("Data Cleaning Error", f"An error occurred during data cleaning: {str(e)}")
+
+    def update_treeview(self):
+        if self.data is not None:
+            self.display_dataframe("Cleaned Data", self.dataset)
+        else:
+            messagebox.showinfo("Data Information", "No data loaded.")
+
+    def display_dataframe(self, title, dataframe):
+        with stage("grid.populate", source=self.source.name, rows=len(dataframe)):
+            self.data_grid.set_data(title, dataframe)
+        self.update_data_info()
+
+    def update_data_info(self):
+        if self.data is not None:
+            if self.stats_task is not None:
+                self.stats_task.cancel()
+            self.show_data_info("Computing statistics...")
+            dataset, data = self.dataset, self.data
+            self.stats_task = BackgroundTask(
+                self,
+                lambda task: (data, self.compute_statistics(dataset, lambda: task.cancelled)),
+                self.on_statistics_ready,
+                on_error=lambda e: data is self.data and self.show_data_info(f"Failed to compute statistics: {e}"),
+            ).start()
+        else:
+            messagebox.showinfo("Data Information", "No data loaded.")
+
+    def compute_statistics(self, dataset, should_cancel=None):
+        if isinstance(dataset, outofcore.ChunkedDataset):
+            with stage("statistics.out_of_core", source=dataset.name, rows=len(dataset)):
+                return outofcore.compute_statistics(dataset, should_cancel)
+        with stage("statistics", source=dataset.name, rows=len(dataset.frame)) as record:
+            record.fields["stale_columns"] = len(self.statistics.stale_columns(dataset))
+            return self.statistics.compute(dataset)
+
+    def on_statistics_ready(self, result):
+        frame, statistics = result
+        if statistics is None or frame is not self.data:
+            return
+        if self.paged:
+            note = f"Out-of-core: {len(frame.paths)} chunks on disk, memory budget {self.memory_budget / 2**20:,.0f} MB.\n"
+            note += "Median, mode and quartiles are estimated from a sample of each column.\n\n"
+            self.show_data_info(note + format_data_info(frame, statistics))
+        else:
+            self.show_data_info(format_data_info(frame, statistics, self.compaction))
+
+    def show_data_info(self, info_str):
+        self.data_info_text.config(state="normal")
+        self.data_info_text.delete("1.0", tk.END)
+        self.data_info_text.insert(tk.END, info_str)
+        self.data_info_text.config(state="disabled")
+
+    def toggle_watch(self):
+        if not self.watch_var.get():
+            self.stop_watching()
+            return
+        if self.paged:
+            self.watch_var.set(False)
+            messagebox.showinfo("Watch File", "Watching needs the data in memory; turn off Out-of-Core Mode to watch this file.")
+            return
+        if isinstance(self.source, watch.TailSource) and self.dataset is not None and not self.needs_reload:
+            self.start_watching()
+            return
+        # Reload once through a TailSource so its offset matches the rows in the grid.
+        self.reload_state = (self.source, self.compaction) if self.dataset is not None else None
+        self.source = watch.TailSource(self.source.file_path, getattr(self.source, "columns", None), getattr(self.source, "dtypes", None))
+        self.compaction = None
+        self.progress_bar.config(mode="determinate", value=0)
+        self.progress_label.config(text="Loading...")
+        self.cancel_button.config(state="normal", command=self.cancel_loading)
+        self.progress_frame.pack(side="top", fill="x", before=self.data_grid)
+        self.start_loading()
+
+    def start_watching(self):
+        self.live_statistics = None
+        self.schedule_watch()
+
+    def schedule_watch(self):
+        if self.watch_var.get():
+            self.watch_job = self.after(watch.POLL_INTERVAL_MS, self.poll_watch)
+
+    def stop_watching(self):
+        self.watch_var.set(False)
+        if self.watch_job is not None:
+            self.after_cancel(self.watch_job)
+            self.watch_job = None
+        if self.watch_task is not None:
+            self.watch_task.cancel()
+            self.watch_task = None
+
+    def poll_watch(self):
+        self.watch_job = None
+        if not self.watch_var.get() or self.dataset is None:
+            return
+        task = BackgroundTask(
+            self,
+            self.read_appended,
+            lambda result: self.on_rows_appended(task, result),
+            on_error=lambda e: self.on_watch_error(task, e),
+        )
+        self.watch_task = task.start()
+
+    def read_appended(self, task):
+        with stage("watch.read", source=self.source.name) as record:
+            result = self.source.read_new()
+            if result is None or task.cancelled:
+                return None
+            rows, end = result
+            if not len(rows):
+                return None, end, None, None
+            record.rows = len(rows)
+            # Seeded once from the rows already loaded; every later refresh only adds the new rows. The
+            # running totals are kept only if the rows are, so they are copied rather than added to in place.
+            if self.live_statistics is None:
+                live_statistics = StreamingStatistics()
+                for part in self.dataset.parts:
+                    live_statistics.add(part)
+            else:
+                live_statistics = copy.deepcopy(self.live_statistics)
+            live_statistics.add(rows)
+            statistics = live_statistics.compute(self.dataset.columns.union(rows.columns, sort=False))
+            return rows, end, live_statistics, statistics
+
+    def on_rows_appended(self, task, result):
+        if task is not self.watch_task or task.cancelled:
+            return
+        self.watch_task = None
+        self.schedule_watch()
+        if result is None:
+            return
+        rows, end, live_statistics, statistics = result
+        self.source.offset = end
+        if rows is None:
+            return
+        self.live_statistics = live_statistics
+        with stage("watch.append", source=self.source.name, rows=len(rows)):
+            if self.stats_task is not None:
+                self.stats_task.cancel()
+            self.dataset.append(rows)
+            self.data_grid.extend(len(rows))
+        note = f"Watching: {len(rows):,} new rows at {time.strftime('%H:%M:%S')}.\n"
+        note += "Median, mode and quartiles are estimated from a sample of each column while watching.\n\n"
+        self.show_data_info(note + format_data_info(self.dataset, statistics, self.compaction))
+        self.master.datasets.evict()
+
+    def on_watch_error(self, task, error):
+        if task is not self.watch_task:
+            return
+        self.stop_watching()
+        if isinstance(error, watch.FileTruncated):
+            messagebox.showinfo("Watch File", f"Stopped watching: {error}\nTurn watching on again to reload the file.")
+            self.source = watch.TailSource(self.source.file_path, self.source.columns, self.source.dtypes)
+            self.needs_reload = True
+        else:
+            messagebox.showerror("Watch File", f"Stopped watching: {error}")
+
+    def go_back(self):
+        # The frame stays in the session store with its data, so opening the source again is instant.
+        if self.load_task is not None and not self.load_task.finished:
+            self.load_task.cancel()
+        self.master.show_home()
+        if self.dataset is None and self.load_task is not None and self.load_task.finished:
+            self.master.datasets.discard(self)
+
+    def close(self):
+        """Stops background work and frees the dataset; the store calls this when it drops the frame."""
+        if self.closed:
+            return
+        self.closed = True
+        self.stop_watching()
+        for task in (self.load_task, self.export_task, self.stats_task, self.cleaning_task):
+            if task is not None:
+                task.cancel()
+        if self.visualization is not None:
+            self.visualization.close()
+        if self.paged:
+            self.dataset.remove()
+        self.destroy()
+
+    def plot_dataset(self):
+        if not self.paged:
+            return self.dataset
+        # Out-of-core data is plotted from an evenly spaced sample, taken again only when the data changes.
+        if self.plot_sample is None or self.plot_sample[:2] != (self.dataset, self.dataset.version):
+            rows = outofcore.chunk_rows_for(self.dataset.read_rows(0, outofcore.ESTIMATE_ROWS), self.memory_budget)
+            sample = Dataset(self.dataset.sample(rows), f"{self.dataset.name} (sample)")
+            self.plot_sample = (self.dataset, self.dataset.version, sample)
+        return self.plot_sample[2]
+
+    def go_to_visualization(self):
+        if self.data is None:
+            messagebox.showinfo("Data Information", "No data loaded.")
+            return
+        dataset = self.plot_dataset()
+        if self.visualization is None or self.visualization.dataset is not dataset:
+            if self.visualization is not None:
+                self.visualization.close()
+            self.visualization = self.master.create_visualization_frame(dataset, self)
+        self.visualization.refresh()
+        self.master.show_dataset(self, self.visualization)
@@ -0,0 +1,124 @@
+"""Keeps the datasets opened this session, with the frames that show them, alive between views."""
+import os
+import sys
+from collections import OrderedDict
+
+SESSION_BYTES = int(os.environ.get("BI_TOOL_SESSION_BYTES", 2 * 2**30))
+SAMPLE_OBJECTS = 1_000
+
+
+def frame_bytes(frame):
+    """Estimated memory of a frame; object columns are sized from a sample of their values."""
+    total = int(frame.memory_usage(index=False).sum())
+    for col in frame.columns:
+        series = frame[col]
+        if series.dtype == object and len(series):
+            sample = series.iloc[:: max(1, len(series) // SAMPLE_OBJECTS)]
+            total += int(sum(sys.getsizeof(value) for value in sample) / len(sample) * len(series))
+    return total
+
+
+def source_identity(source):
+    dtypes = getattr(source, "dtypes", None) or {}
+    columns = getattr(source, "columns", None)
+    return (
+        source.name,
+        getattr(source, "sql", None),
+        tuple(columns) if columns is not None else None,
+        tuple(sorted((str(col), str(dtype)) for col, dtype in dtypes.items())),
+        getattr(source, "filters", None),
+    )
+
+
+def source_signature(source):
+    """What the source's data looks like now, or None if there is no cheap way to tell it changed.
+
+    Local files are compared by size and modification time. Remote sources offer signature(), such as
+    an object's ETag or a response's validators.
+    """
+    if hasattr(source, "signature"):
+        try:
+            return source.signature()
+        except Exception:
+            # An unreachable source is loaded again, which reports the error.
+            return None
+    try:
+        path = getattr(source, "file_path", None)
+        if path is not None:
+            stat = os.stat(path)
+            return stat.st_size, stat.st_mtime_ns
+        if hasattr(source, "files"):
+            return tuple((path, os.stat(path).st_size, os.stat(path).st_mtime_ns) for path, _ in source.files())
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+class SessionStore:
+    """Process frames for the datasets opened this session, most recently shown last.
+
+    Opening a source again returns its frame (with the loaded or cleaned data, statistics and
+    plots) unless its files changed. Once the frames hold more than max_bytes of data, the least
+    recently shown ones are closed; the one on screen is always kept.
+    """
+
+    def __init__(self, max_bytes=SESSION_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+
+    def frames(self):
+        return [frame for _, frame in self.entries.values()]
+
+    def open(self, source, create):
+        """The frame kept for source if its data did not change, otherwise a new one from create(source)."""
+        identity = source_identity(source)
+        if identity in self.entries:
+            kept, frame = self.entries[identity]
+            if hasattr(frame.source, "signature"):
+                # Remote sources remember the version they loaded, so they are asked only when opened again.
+                kept = source_signature(frame.source)
+            if kept is not None and (frame.watching or kept == source_signature(source)):
+                if hasattr(source, "release"):
+                    # The kept frame is shown instead, so whatever the new source opened is not needed.
+                    source.release()
+                return frame
+            self.discard(frame)
+        frame = create(source)
+        self.entries[identity] = (None if hasattr(source, "signature") else source_signature(source), frame)
+        return frame
+
+    def identity_of(self, frame):
+        for identity, (_, entry) in self.entries.items():
+            if entry is frame:
+                return identity
+        return None
+
+    def touch(self, frame):
+        identity = self.identity_of(frame)
+        if identity is not None:
+            self.entries.move_to_end(identity)
+        self.evict()
+
+    def nbytes(self):
+        return sum(frame.memory_bytes() for frame in self.frames())
+
+    def evict(self):
+        total = self.nbytes()
+        for identity in list(self.entries)[:-1]:
+            if total <= self.max_bytes:
+                break
+            frame = self.entries[identity][1]
+            total -= frame.memory_bytes()
+            del self.entries[identity]
+            frame.close()
+
+    def discard(self, frame):
+        identity = self.identity_of(frame)
+        if identity is not None:
+            del self.entries[identity]
+        frame.close()
+
+    def clear(self):
+        for frame in self.frames():
+            frame.close()
+        self.entries.clear()
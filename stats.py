@@ -0,0 +1,278 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_integer_dtype, is_numeric_dtype
+
+QUARTILES = (0.25, 0.5, 0.75)
+BATCH_VALUES = 2 ** 24
+SAMPLE_VALUES = 20_000
+
+
+def is_numeric_column(series):
+    return is_numeric_dtype(series) and not is_bool_dtype(series)
+
+
+def column_values(series):
+    if isinstance(series.dtype, np.dtype):
+        return series.to_numpy(dtype=np.float64)
+    return series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def numeric_summary(values):
+    # values holds one column per row; NaNs sort to the end of each row.
+    if values.shape[1] == 0:
+        values = np.full((len(values), 1), np.nan)
+    values = np.sort(values, axis=1)
+    count = np.count_nonzero(~np.isnan(values), axis=1)
+    has_values = count > 0
+    last = np.maximum(count - 1, 0)
+    rows = np.arange(len(values))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        total = np.nansum(values, axis=1)
+        mean = np.where(has_values, total / np.maximum(count, 1), np.nan)
+        squares = np.nansum((values - mean[:, None]) ** 2, axis=1)
+        var = np.where(count > 1, squares / (count - 1), np.nan)
+
+    quantiles = []
+    for q in QUARTILES:
+        position = q * last
+        low = np.floor(position).astype(np.int64)
+        high = np.ceil(position).astype(np.int64)
+        low_values = values[rows, low]
+        high_values = values[rows, high]
+        quantile = low_values + (high_values - low_values) * (position - low)
+        quantiles.append(np.where(has_values, quantile, np.nan))
+
+    modes = np.full(len(values), np.nan)
+    for i in rows[has_values]:
+        present = values[i, :count[i]]
+        starts = np.flatnonzero(np.r_[True, present[1:] != present[:-1]])
+        run_lengths = np.diff(np.r_[starts, len(present)])
+        modes[i] = present[starts[np.argmax(run_lengths)]]
+
+    return {
+        "count": count,
+        "mean": mean,
+        "median": quantiles[1],
+        "mode": modes,
+        "std": np.sqrt(var),
+        "var": var,
+        "min": np.where(has_values, values[:, 0], np.nan),
+        "max": np.where(has_values, values[rows, last], np.nan),
+        "q1": quantiles[0],
+        "q3": quantiles[2],
+    }
+
+
+def object_summary(series):
+    mode = series.mode()
+    summary = {"mode": mode.iloc[0] if len(mode) else np.nan}
+    if isinstance(series.dtype, pd.CategoricalDtype) and not series.cat.ordered:
+        # Unordered categoricals refuse min/max; answer from the categories actually present.
+        codes = series.cat.codes.to_numpy()
+        series = pd.Series(series.cat.categories[np.unique(codes[codes >= 0])])
+    # Missing values (None next to strings) would make the comparison fail for the whole column.
+    series = series.dropna()
+    try:
+        summary["min"] = series.min()
+        summary["max"] = series.max()
+    except TypeError:
+        summary["min"] = summary["max"] = "n/a"
+    return summary
+
+
+class RunningMoments:
+    """Count, mean, squared deviations, min and max of a column that merge chunk by chunk."""
+
+    def __init__(self, count=0, mean=0.0, m2=0.0, minimum=np.inf, maximum=-np.inf):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.min = minimum
+        self.max = maximum
+
+    @classmethod
+    def of(cls, values):
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return cls()
+        mean = values.mean()
+        return cls(len(values), mean, float(np.square(values - mean).sum()), values.min(), values.max())
+
+    def merge(self, other):
+        # Chan et al.'s pairwise update, so chunks can be combined in any order.
+        if not other.count:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def var(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def std(self):
+        return np.sqrt(self.var)
+
+
+class ValueSample:
+    """Uniform sample of a column's values; keeps the smallest random keys so chunk samples merge."""
+
+    def __init__(self, size=SAMPLE_VALUES, seed=0):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.keys = np.empty(0)
+        self.values = None
+
+    def add(self, values):
+        keys = self.rng.random(len(values))
+        if len(values) > self.size:
+            keep = np.argpartition(keys, self.size)[:self.size]
+            keys, values = keys[keep], values[keep]
+        if self.values is not None:
+            keys = np.concatenate([self.keys, keys])
+            values = np.concatenate([self.values, values])
+        if len(keys) > self.size:
+            keep = np.argpartition(keys, self.size)[:self.size]
+            keys, values = keys[keep], values[keep]
+        self.keys, self.values = keys, values
+        return self
+
+
+def object_bounds(series, bounds):
+    if bounds is None or not series.notna().any():
+        return bounds
+    if isinstance(series.dtype, pd.CategoricalDtype) and not series.cat.ordered:
+        series = series.astype(object)
+    try:
+        low, high = series.min(), series.max()
+        if bounds:
+            low, high = min(bounds[0], low), max(bounds[1], high)
+    except TypeError:
+        return None
+    return low, high
+
+
+class StreamingStatistics:
+    """Column statistics accumulated chunk by chunk, for data that is never in memory at once.
+
+    Count, mean, std, variance, min and max are exact. Median, quartiles and mode come
+    from a uniform sample of SAMPLE_VALUES values per column.
+    """
+
+    def __init__(self):
+        self.moments = {}
+        self.samples = {}
+        self.bounds = {}
+        self.integer = {}
+
+    def add(self, frame):
+        for col in frame.columns:
+            series = frame[col]
+            if is_numeric_column(series):
+                values = column_values(series)
+                self.moments.setdefault(col, RunningMoments()).merge(RunningMoments.of(values))
+                self.samples.setdefault(col, ValueSample()).add(values[~np.isnan(values)])
+                self.integer[col] = self.integer.get(col, True) and is_integer_dtype(series)
+            else:
+                present = series.dropna()
+                self.samples.setdefault(col, ValueSample()).add(present.to_numpy(dtype=object))
+                self.bounds[col] = object_bounds(present, self.bounds.get(col, ()))
+        return self
+
+    def compute(self, columns):
+        statistics = {}
+        for col in columns:
+            sample = self.samples.get(col)
+            values = sample.values if sample is not None and sample.values is not None else np.empty(0)
+            if col in self.moments:
+                total = self.moments[col]
+                stats = {name: result[0] for name, result in numeric_summary(values[None, :].astype(np.float64)).items()}
+                stats.update(count=total.count, mean=total.mean if total.count else np.nan, std=total.std, var=total.var)
+                stats.update(min=total.min if total.count else np.nan, max=total.max if total.count else np.nan)
+                if self.integer[col] and total.count:
+                    for name in ("mode", "min", "max"):
+                        stats[name] = int(stats[name])
+            else:
+                mode = pd.Series(values).mode()
+                low, high = self.bounds.get(col) or ("n/a", "n/a")
+                stats = {"mode": mode.iloc[0] if len(mode) else np.nan, "min": low, "max": high}
+            statistics[col] = stats
+        return statistics
+
+
+class StatisticsEngine:
+    def __init__(self):
+        self.cache = {}
+
+    def stale_columns(self, dataset):
+        return [
+            col for col in dataset.frame.columns
+            if col not in self.cache or self.cache[col][0] != dataset.column_versions[col]
+        ]
+
+    def compute(self, dataset):
+        frame = dataset.frame
+        versions = dict(dataset.column_versions)
+        stale = self.stale_columns(dataset)
+
+        numeric = [col for col in stale if is_numeric_column(frame[col])]
+        batch_size = max(1, BATCH_VALUES // max(1, len(frame)))
+        for start in range(0, len(numeric), batch_size):
+            batch = numeric[start:start + batch_size]
+            values = np.empty((len(batch), len(frame)), dtype=np.float64)
+            for i, col in enumerate(batch):
+                values[i] = column_values(frame[col])
+            summary = numeric_summary(values)
+            for i, col in enumerate(batch):
+                stats = {name: result[i] for name, result in summary.items()}
+                if is_integer_dtype(frame[col]) and stats["count"]:
+                    for name in ("mode", "min", "max"):
+                        stats[name] = int(stats[name])
+                self.cache[col] = (versions[col], stats)
+
+        for col in stale:
+            if col not in numeric:
+                self.cache[col] = (versions[col], object_summary(frame[col]))
+
+        for col in list(self.cache):
+            if col not in versions:
+                del self.cache[col]
+        return {col: self.cache[col][1] for col in frame.columns}
+
+
+def format_data_info(frame, statistics, compaction=None):
+    info_str = f"Number of rows: {len(frame)}\n"
+    info_str += f"Number of columns: {len(frame.columns)}\n"
+    info_str += f"Column names: {', '.join(map(str, frame.columns))}\n"
+    info_str += f"Data types:\n{frame.dtypes}\n\n"
+
+    info_str += "Statistics:\n"
+    for col in frame.columns:
+        stats = statistics[col]
+        info_str += f"{col}:\n"
+        if "mean" in stats:
+            info_str += f"Mean: {stats['mean']}\n"
+            info_str += f"Median: {stats['median']}\n"
+            info_str += f"Mode: {stats['mode']}\n"
+            info_str += f"Standard Deviation: {stats['std']}\n"
+            info_str += f"Variance: {stats['var']}\n"
+            info_str += f"Min: {stats['min']}\n"
+            info_str += f"Max: {stats['max']}\n"
+            info_str += f"Q1 (First Quartile): {stats['q1']}\n"
+            info_str += f"Q3 (Third Quartile): {stats['q3']}\n\n"
+        else:
+            info_str += f"Mode: {stats['mode']}\n"
+            info_str += f"Min: {stats['min']}\n"
+            info_str += f"Max: {stats['max']}\n\n"
+
+    if compaction is not None:
+        info_str += "Memory usage at load (before → after compaction):\n"
+        info_str += compaction.format() + "\n"
+    return info_str
@@ -0,0 +1,61 @@
+import queue
+import threading
+import tkinter as tk
+from tkinter import messagebox
+
+
+class BackgroundTask:
+    def __init__(self, widget, target, on_done, on_error=None, on_progress=None, poll_interval=50):
+        self.widget = widget
+        self.target = target
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.poll_interval = poll_interval
+        self.queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.finished = False
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def start(self):
+        threading.Thread(target=self.run, daemon=True).start()
+        self.widget.after(self.poll_interval, self.poll)
+        return self
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def report(self, *args):
+        self.queue.put(("progress", args))
+
+    def run(self):
+        try:
+            self.queue.put(("done", self.target(self)))
+        except Exception as e:
+            self.queue.put(("error", e))
+
+    def poll(self):
+        try:
+            while True:
+                kind, payload = self.queue.get_nowait()
+                if kind == "progress":
+                    if self.on_progress is not None and not self.cancelled:
+                        self.on_progress(*payload)
+                    continue
+                self.finished = True
+                if kind == "done":
+                    self.on_done(payload)
+                elif self.on_error is not None:
+                    self.on_error(payload)
+                else:
+                    messagebox.showerror("Error", str(payload))
+                return
+        except queue.Empty:
+            pass
+        try:
+            self.widget.after(self.poll_interval, self.poll)
+        except tk.TclError:
+            self.cancel()
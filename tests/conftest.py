@@ -0,0 +1,45 @@
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+class CSVHandler(BaseHTTPRequestHandler):
+    # Serves server.body with server.etag, answering 304 to a matching If-None-Match when server.conditional is set.
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.headers.get("If-None-Match"))
+        if server.conditional and self.headers.get("If-None-Match") == server.etag:
+            self.send_response(304)
+            self.send_header("ETag", server.etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv")
+        self.send_header("Content-Length", str(len(server.body)))
+        self.send_header("ETag", server.etag)
+        self.end_headers()
+        self.wfile.write(server.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CSVHandler)
+    server.requests = []
+    server.conditional = True
+    server.etag = '"v1"'
+    server.body = b"id,name\n1,a\n2,b\n"
+    server.url = f"http://127.0.0.1:{server.server_port}/data.csv"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,19 @@
+import numpy as np
+import pandas as pd
+
+import cleaning
+from cleaning import CleaningPlan, ReplaceOutliers
+
+
+def test_rows_changed_in_several_column_batches_are_counted_once(monkeypatch):
+    frame = pd.DataFrame({f"c{i}": np.zeros(100) for i in range(6)})
+    frame.iloc[[3, 7], :] = 1000.0
+    # Two columns per batch, so each outlier row is changed in three batches.
+    monkeypatch.setattr(cleaning, "BATCH_VALUES", 200)
+
+    cleaned, report = CleaningPlan([ReplaceOutliers()]).run(frame)
+    entry = report.steps[0]
+    assert entry["rows"] == 2
+    assert entry["cells"] == 12
+    assert report.changed_columns == set(frame.columns)
+    assert (cleaned.loc[[3, 7]] < 1000).all().all()
@@ -0,0 +1,56 @@
+import io
+
+import pandas as pd
+
+import cloud
+from cache import ObjectCache
+
+
+def sample_frame(rows=5000):
+    return pd.DataFrame({"id": range(rows), "name": [f"row-{i}" for i in range(rows)], "value": [i / 4 for i in range(rows)]})
+
+
+def test_ranged_download_reassembles_the_object(tmp_path):
+    data = bytes(range(256)) * 100
+    storage = cloud.MemoryStorage()
+    storage.put("bucket", "blob.bin", data)
+    info = storage.head("bucket", "blob.bin")
+    path = str(tmp_path / "blob.bin")
+
+    download = cloud.RangedDownload(storage, "bucket", info, path, part_size=1000, workers=4).start()
+    assert download.wait() == len(data)
+    with open(path, "rb") as f:
+        assert f.read() == data
+    assert storage.range_requests == -(-len(data) // 1000)
+
+
+def test_csv_object_is_parsed_while_it_downloads_and_then_cached(tmp_path):
+    frame = sample_frame()
+    storage = cloud.MemoryStorage()
+    storage.put("bucket", "data/sample.csv", frame.to_csv(index=False).encode())
+    object_cache = ObjectCache(str(tmp_path / "objects"))
+
+    loaded = cloud.ObjectSource(storage, "bucket", "data/sample.csv", object_cache, part_size=4096, workers=3).load()
+    pd.testing.assert_frame_equal(loaded, frame)
+    requests = storage.range_requests
+    assert requests == -(-storage.head("bucket", "data/sample.csv").size // 4096)
+
+    # The unchanged object is read from the object cache without another request.
+    again = cloud.ObjectSource(storage, "bucket", "data/sample.csv", object_cache, part_size=4096).load()
+    pd.testing.assert_frame_equal(again, frame)
+    assert storage.range_requests == requests
+
+
+def test_parquet_object_is_loaded_after_a_chunked_download(tmp_path):
+    frame = sample_frame()
+    buffer = io.BytesIO()
+    frame.to_parquet(buffer, index=False)
+    storage = cloud.MemoryStorage()
+    storage.put("bucket", "sample.parquet", buffer.getvalue())
+
+    progress = []
+    source = cloud.ObjectSource(storage, "bucket", "sample.parquet", ObjectCache(str(tmp_path / "objects")), part_size=2048)
+    loaded = source.load(on_chunk=lambda chunk, rows, done, total: progress.append((done, total)))
+    pd.testing.assert_frame_equal(loaded, frame)
+    assert storage.range_requests > 1
+    assert all(total == len(buffer.getvalue()) for _, total in progress)
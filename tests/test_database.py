@@ -0,0 +1,59 @@
+import sqlite3
+
+import pytest
+
+import database
+
+
+@pytest.fixture
+def sqlite_params(tmp_path):
+    path = str(tmp_path / "sales.db")
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE sales (id INTEGER, region TEXT, amount REAL)")
+        connection.executemany(
+            "INSERT INTO sales VALUES (?, ?, ?)",
+            [(i, "eu" if i % 2 else "us", None if i % 7 == 0 else i * 1.5) for i in range(2500)],
+        )
+    yield {"database": path}
+    database.POOLS.pop(("SQLite", ("database", path)), None)
+
+
+def test_sqlite_query_round_trip(sqlite_params):
+    batches = []
+    frame = database.run_query(
+        "SQLite", sqlite_params, "SELECT id, region, amount FROM sales ORDER BY id", batch_size=1000,
+        on_batch=lambda chunk, rows: batches.append((len(chunk), rows)),
+    )
+    assert batches == [(1000, 1000), (1000, 2000), (500, 2500)]
+    assert list(frame.columns) == ["id", "region", "amount"]
+    assert len(frame) == 2500
+    assert frame["id"].tolist() == list(range(2500))
+    assert frame.loc[3, "region"] == "eu" and frame.loc[4, "region"] == "us"
+    assert frame["amount"].isna().sum() == len(range(0, 2500, 7))
+    assert frame.loc[3, "amount"] == 4.5
+
+
+def test_cancelled_query_returns_none_and_frees_the_connection(sqlite_params):
+    source = database.QuerySource("SQLite", sqlite_params, "SELECT * FROM sales")
+    assert source.load(should_cancel=lambda: True) is None
+    assert database.get_pool("SQLite", sqlite_params).idle == []
+    assert len(source.load()) == 2500
+
+
+def test_columns_keep_one_dtype_across_batches_with_only_nulls(tmp_path):
+    path = str(tmp_path / "sparse.db")
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE readings (id INTEGER, late INTEGER, level REAL, note TEXT)")
+        connection.executemany(
+            "INSERT INTO readings VALUES (?, ?, ?, ?)",
+            [(i, i if i >= 200 else None, None if 100 <= i < 200 else i / 2, None if i < 250 else "x") for i in range(300)],
+        )
+    params = {"database": path}
+    try:
+        frame = database.run_query("SQLite", params, "SELECT * FROM readings ORDER BY id", batch_size=100)
+    finally:
+        database.POOLS.pop(("SQLite", ("database", path)), None)
+    assert frame["id"].dtype == "int64"
+    assert frame["late"].dtype == "float64" and frame["late"].isna().sum() == 200 and frame["late"].iloc[-1] == 299
+    assert frame["level"].dtype == "float64" and frame["level"].isna().sum() == 100
+    assert frame["note"].dtype == object and frame["note"].isna().sum() == 250
@@ -0,0 +1,19 @@
+import tracemalloc
+
+from instrument import Recorder
+
+
+def test_nested_stage_keeps_the_outer_peak():
+    recorder = Recorder()
+    recorder.trace_memory = True
+    with recorder.stage("outer") as outer:
+        block = bytearray(8 * 2**20)
+        del block
+        with recorder.stage("inner") as inner:
+            small = bytearray(2**20)
+            del small
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+    assert 2**20 <= inner.traced_peak < 4 * 2**20
+    assert outer.traced_peak >= 8 * 2**20
+    assert [record.name for record in recorder.recent()] == ["inner", "outer"]
@@ -0,0 +1,24 @@
+import pandas as pd
+import pytest
+
+import ingest
+import outofcore
+
+
+def test_json_array_is_refused_out_of_core(tmp_path):
+    path = tmp_path / "events.json"
+    pd.DataFrame({"x": range(10)}).to_json(path, orient="records")
+    with pytest.raises(ValueError, match="JSON Lines"):
+        outofcore.load(ingest.FileSource(str(path)), budget=1)
+
+
+def test_json_lines_are_loaded_in_chunks(tmp_path):
+    path = tmp_path / "events.jsonl"
+    frame = pd.DataFrame({"x": range(5000), "y": [f"v{i}" for i in range(5000)]})
+    frame.to_json(path, orient="records", lines=True)
+    dataset = outofcore.load(ingest.FileSource(str(path)), budget=1)
+    try:
+        assert len(dataset.paths) > 1
+        pd.testing.assert_frame_equal(dataset.read_rows(0, len(dataset)), frame)
+    finally:
+        dataset.remove()
@@ -0,0 +1,27 @@
+import os
+
+import pandas as pd
+
+import pipeline
+
+
+def test_inputs_sharing_a_stem_get_separate_outputs(tmp_path):
+    source = tmp_path / "in"
+    source.mkdir()
+    pd.DataFrame({"x": [1, 2]}).to_csv(source / "a.csv", index=False)
+    pd.DataFrame({"x": [3]}).to_json(source / "a.json", orient="records")
+    pd.DataFrame({"x": [4]}).to_csv(source / "b.csv", index=False)
+    output = str(tmp_path / "out")
+
+    paths = pipeline.expand_inputs([str(source)])
+    summaries = {os.path.basename(row["input"]): row for row in pipeline.run_batch(paths, output, workers=1)}
+    assert {name: row["status"] for name, row in summaries.items()} == {"a.csv": "ok", "a.json": "ok", "b.csv": "ok"}
+    assert sorted(os.listdir(output)) == ["a.csv.csv", "a.csv.stats.json", "a.json.csv", "a.json.stats.json", "b.csv", "b.stats.json"]
+    assert pd.read_csv(os.path.join(output, "a.json.csv"))["x"].tolist() == [3]
+
+
+def test_outputs_still_claimed_twice_are_reported(tmp_path):
+    paths = [str(tmp_path / name) for name in ("a.csv", "a.json", "a.csv.jsonl")]
+    keep, clashing = pipeline.output_names(paths, str(tmp_path / "out"), ".csv", str(tmp_path))
+    assert keep == {paths[0], paths[1]}
+    assert clashing == {paths[0], paths[2]}
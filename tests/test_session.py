@@ -0,0 +1,49 @@
+import pandas as pd
+
+import database
+import session
+import web
+from cache import ResponseCache
+
+
+class Frame:
+    # Stands in for ProcessDataFrame: the store only needs its source, watching, memory_bytes() and close().
+    def __init__(self, source):
+        self.source = source
+        self.watching = False
+        self.closed = False
+
+    def memory_bytes(self):
+        return 0
+
+    def close(self):
+        self.closed = True
+
+
+def load(source):
+    source.load()
+    return Frame(source)
+
+
+def test_queries_on_one_database_are_kept_apart():
+    store = session.SessionStore()
+    first = store.open(database.QuerySource("SQLite", {"database": "a.db"}, "SELECT 1"), Frame)
+    second = store.open(database.QuerySource("SQLite", {"database": "a.db"}, "SELECT 2"), Frame)
+    assert first is not second and not first.closed
+    assert len(store.entries) == 2
+
+
+def test_unchanged_web_source_reuses_its_frame(server, tmp_path):
+    store = session.SessionStore()
+    response_cache = ResponseCache(str(tmp_path / "http"))
+    first = store.open(web.WebSource(server.url, response_cache), load)
+
+    again = web.WebSource(server.url, response_cache)
+    assert store.open(again, load) is first
+    assert server.requests == [None, '"v1"']
+    assert again.response is None
+
+    server.body, server.etag = b"id,name\n3,c\n", '"v2"'
+    changed = store.open(web.WebSource(server.url, response_cache), load)
+    assert changed is not first and first.closed
+    pd.testing.assert_frame_equal(changed.source.load(), pd.DataFrame({"id": [3], "name": ["c"]}))
@@ -0,0 +1,38 @@
+import pandas as pd
+
+import pipeline
+import web
+from cache import ColumnarCache, ResponseCache
+
+
+def test_unchanged_response_is_revalidated_with_a_304(server, tmp_path):
+    response_cache = ResponseCache(str(tmp_path / "http"))
+
+    first = web.WebSource(server.url, response_cache).load()
+    assert first["id"].tolist() == [1, 2]
+    path, headers = response_cache.lookup(server.url)
+    assert headers["etag"] == '"v1"'
+
+    second = web.WebSource(server.url, response_cache).load()
+    pd.testing.assert_frame_equal(second, first)
+    assert server.requests == [None, '"v1"']
+
+    # A changed body gets a new ETag, so the next request is answered with a 200 and replaces the cached copy.
+    server.body, server.etag = b"id,name\n3,c\n", '"v2"'
+    third = web.WebSource(server.url, response_cache).load()
+    assert third["id"].tolist() == [3]
+    assert response_cache.lookup(server.url)[1]["etag"] == '"v2"'
+
+
+def test_columnar_cache_hit_closes_the_revalidated_response(server, tmp_path):
+    # The server ignores If-None-Match, so every revalidation streams a 200 that load() would have read.
+    server.conditional = False
+    columnar_cache = ColumnarCache(str(tmp_path / "columnar"))
+    response_cache = ResponseCache(str(tmp_path / "http"))
+
+    first, key = pipeline.load_source(web.WebSource(server.url, response_cache), columnar_cache, background=False)
+    source = web.WebSource(server.url, response_cache)
+    second, second_key = pipeline.load_source(source, columnar_cache, background=False)
+    assert second_key == key
+    pd.testing.assert_frame_equal(second, first)
+    assert source.response is None and source.cached_path is None
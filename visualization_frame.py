@@ -0,0 +1,200 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+from aggregate import AGGREGATES, TIME_BUCKETS, AggregateQuery, AggregationEngine
+from instrument import stage
+from plotting import (
+    DEFAULT_WIDTH,
+    PLOT_TYPES,
+    PlotDataCache,
+    aggregate_plot_data,
+    draw_plot_data,
+    extend_plot_data,
+    update_plot_artists,
+)
+
+
+class VisualizationFrame(tk.Frame):
+    def __init__(self, parent, dataset, previous=None):
+        super().__init__(parent)
+        self.dataset = dataset
+        self.previous = previous
+        self.version = dataset.version
+        self.plot_cache = PlotDataCache()
+        self.aggregates = AggregationEngine()
+        self.selected_column = tk.StringVar()
+        self.selected_plot_type = tk.StringVar()
+        self.group_column = tk.StringVar()
+        self.then_column = tk.StringVar()
+        self.pivot_column = tk.StringVar()
+        self.aggregate = tk.StringVar(value="sum")
+        self.time_bucket = tk.StringVar()
+        self.aggregate_filter = tk.StringVar()
+        self.current_plot = None
+        self.create_widgets()
+        self.dataset.listeners.append(self.on_rows_appended)
+
+    @property
+    def data(self):
+        return self.dataset.frame if self.dataset is not None else None
+
+    def create_widgets(self):
+        self.column_names = {str(col): col for col in self.data.columns}
+
+        ttk.Label(self, text="Select Column to Plot:").pack()
+        self.column_dropdown = ttk.Combobox(self, textvariable=self.selected_column, values=list(self.column_names))
+        self.column_dropdown.pack()
+
+        ttk.Label(self, text="Select Plot Type:").pack()
+        self.plot_type_dropdown = ttk.Combobox(self, textvariable=self.selected_plot_type, values=PLOT_TYPES)
+        self.plot_type_dropdown.pack()
+
+        self.column_dropdown.bind("<<ComboboxSelected>>", self.plot_selected_column)
+        self.plot_type_dropdown.bind("<<ComboboxSelected>>", self.plot_selected_column)
+
+        group_bar = tk.Frame(self)
+        group_bar.pack(pady=2)
+        self.group_dropdowns = []
+        for text, variable in (("Group by:", self.group_column), ("then by:", self.then_column), ("Pivot by:", self.pivot_column)):
+            ttk.Label(group_bar, text=text).pack(side="left")
+            dropdown = ttk.Combobox(group_bar, textvariable=variable, values=[""] + list(self.column_names), state="readonly", width=14)
+            dropdown.pack(side="left", padx=5)
+            dropdown.bind("<<ComboboxSelected>>", self.plot_selected_column)
+            self.group_dropdowns.append(dropdown)
+
+        aggregate_bar = tk.Frame(self)
+        aggregate_bar.pack(pady=2)
+        ttk.Label(aggregate_bar, text="Aggregate:").pack(side="left")
+        aggregate_dropdown = ttk.Combobox(aggregate_bar, textvariable=self.aggregate, values=AGGREGATES, state="readonly", width=8)
+        aggregate_dropdown.pack(side="left", padx=5)
+        ttk.Label(aggregate_bar, text="Time bucket:").pack(side="left")
+        bucket_dropdown = ttk.Combobox(aggregate_bar, textvariable=self.time_bucket, values=[""] + TIME_BUCKETS, state="readonly", width=8)
+        bucket_dropdown.pack(side="left", padx=5)
+        ttk.Label(aggregate_bar, text="Filter:").pack(side="left")
+        filter_entry = ttk.Entry(aggregate_bar, textvariable=self.aggregate_filter, width=24)
+        filter_entry.pack(side="left", padx=5)
+        for widget in (aggregate_dropdown, bucket_dropdown):
+            widget.bind("<<ComboboxSelected>>", self.plot_selected_column)
+        filter_entry.bind("<Return>", self.plot_selected_column)
+
+        self.back_button = ttk.Button(self, text="Back", command=self.back_to_previous_frame)
+        self.back_button.pack()
+
+        self.fig, self.ax = plt.subplots()
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self)
+        self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+
+    def aggregate_query(self):
+        group_by = [self.column_names[name] for name in (self.group_column.get(), self.then_column.get()) if name in self.column_names]
+        if not group_by:
+            return None
+        return AggregateQuery(
+            group_by,
+            self.column_names.get(self.selected_column.get()),
+            self.aggregate.get() or "count",
+            self.column_names.get(self.pivot_column.get()),
+            self.time_bucket.get(),
+            self.aggregate_filter.get(),
+        )
+
+    def plot_aggregate(self, query, plot_type):
+        with stage("aggregate", group_by=str(query.group_by), agg=query.agg, rows=len(self.data)):
+            result = self.aggregates.compute(self.dataset, query)
+        plot_data = aggregate_plot_data(result, plot_type)
+        self.draw_plot_data(plot_data)
+        title = f"{query.agg} of {query.value}" if query.value is not None else "Row count"
+        title += f" by {', '.join(map(str, query.group_by))}"
+        if query.pivot is not None:
+            title += f" and {query.pivot}"
+        if self.previous is not None and self.previous.paged:
+            title += f" (sample of {len(self.data):,} rows)"
+        self.ax.set_title(title)
+        return plot_data
+
+    def plot_selected_column(self, event=None):
+        self.ax.clear()
+        self.current_plot = None
+
+        selected_column = self.selected_column.get()
+        plot_type = self.selected_plot_type.get()
+        query = self.aggregate_query()
+        if query is not None and plot_type and self.data is not None:
+            try:
+                plot_data = self.plot_aggregate(query, plot_type)
+            except Exception as e:
+                self.ax.clear()
+                messagebox.showerror('Error in plotting', f'{e}')
+            else:
+                self.current_plot = (query.value, plot_type, plot_data)
+        elif selected_column in self.column_names and plot_type and self.data is not None:
+            try:
+                with stage("plot.prepare", column=selected_column, plot_type=plot_type, rows=len(self.data)):
+                    plot_data = self.plot_cache.get(self.dataset, self.column_names[selected_column], plot_type, self.canvas_width())
+            except Exception as e:
+                messagebox.showerror('Error in plotting', f'{e}')
+            else:
+                self.draw_plot_data(plot_data)
+                self.ax.set_title(f'{plot_type} Plot of {selected_column}')
+                self.current_plot = (self.column_names[selected_column], plot_type, plot_data)
+
+        with stage("plot.draw", column=selected_column, plot_type=plot_type):
+            self.canvas.draw()
+
+    def canvas_width(self):
+        width = self.canvas.get_tk_widget().winfo_width()
+        return width if width > 1 else DEFAULT_WIDTH
+
+    def draw_plot_data(self, plot_data):
+        draw_plot_data(self.ax, plot_data)
+
+    def on_rows_appended(self, rows):
+        # Only the new rows are binned or decimated; the existing artists get the result.
+        if self.current_plot is None:
+            return
+        if self.aggregate_query() is not None:
+            # New rows can land in any group, so the aggregate is computed again.
+            self.plot_selected_column()
+            return
+        column, plot_type, plot_data = self.current_plot
+        width = self.canvas_width()
+        with stage("plot.extend", column=str(column), plot_type=plot_type, rows=len(rows)):
+            extended = extend_plot_data(plot_data, rows, column, width)
+        if extended is None:
+            self.plot_selected_column()
+            return
+        self.plot_cache.put(self.dataset, column, plot_type, width, extended)
+        self.current_plot = (column, plot_type, extended)
+        self.version = self.dataset.version
+        update_plot_artists(self.ax, extended)
+        self.canvas.draw_idle()
+
+    def refresh(self):
+        """Catches up with changes made to the dataset (such as cleaning) while the frame was hidden."""
+        if self.version == self.dataset.version:
+            return
+        self.version = self.dataset.version
+        self.column_names = {str(col): col for col in self.data.columns}
+        self.column_dropdown['values'] = list(self.column_names)
+        for dropdown in self.group_dropdowns:
+            dropdown['values'] = [""] + list(self.column_names)
+        for variable in (self.selected_column, self.group_column, self.then_column, self.pivot_column):
+            if variable.get() not in self.column_names:
+                variable.set("")
+        # Columns the change left alone are still in the plot cache, so this only redraws them.
+        self.plot_selected_column()
+
+    def back_to_previous_frame(self):
+        if self.previous is not None:
+            self.master.show_dataset(self.previous)
+        else:
+            self.pack_forget()
+            self.master.show_home()
+
+    def close(self):
+        if self.on_rows_appended in self.dataset.listeners:
+            self.dataset.listeners.remove(self.on_rows_appended)
+        plt.close(self.fig)
+        self.destroy()
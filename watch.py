@@ -0,0 +1,108 @@
+"""Follows CSV and JSON Lines files that are appended to, parsing only the new rows."""
+import io
+import os
+
+import ingest
+
+WATCH_FORMATS = ("csv", "jsonl")
+TAIL_BLOCK = 64 * 1024
+POLL_INTERVAL_MS = int(os.environ.get("BI_TOOL_WATCH_INTERVAL_MS", 2000))
+
+
+class FileTruncated(Exception):
+    pass
+
+
+def can_watch(source):
+    path = getattr(source, "file_path", None)
+    try:
+        return path is not None and ingest.file_format(path) in WATCH_FORMATS
+    except (OSError, ingest.UnsupportedFormatError):
+        return False
+
+
+def complete_end(f, start, size):
+    """Offset just past the last newline in [start, size), or start if there is none.
+
+    Writers may be halfway through a row, so anything after the last newline waits for the next read.
+    """
+    position = size
+    while position > start:
+        block_start = max(start, position - TAIL_BLOCK)
+        f.seek(block_start)
+        newline = f.read(position - block_start).rfind(b"\n")
+        if newline >= 0:
+            return block_start + newline + 1
+        position = block_start
+    return start
+
+
+class BoundedFile(io.RawIOBase):
+    # Reads a file only up to end, so rows written during a load are left for the next refresh.
+    def __init__(self, f, end):
+        self.f = f
+        self.end = end
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        remaining = self.end - self.f.tell()
+        if remaining <= 0:
+            return 0
+        return self.f.readinto(memoryview(buffer)[:remaining])
+
+    def tell(self):
+        return self.f.tell()
+
+    def close(self):
+        self.f.close()
+        super().close()
+
+
+class TailSource:
+    """A CSV or JSON Lines file loaded up to its last complete row and then followed by byte offset."""
+
+    def __init__(self, file_path, columns=None, dtypes=None):
+        self.file_path = file_path
+        self.columns = columns
+        self.dtypes = dtypes
+        self.offset = 0
+        self.header = b""
+
+    @property
+    def name(self):
+        return self.file_path
+
+    def cache_key(self, cache):
+        # The rows read depend on when the file was looked at, so they are never cached.
+        return None
+
+    def load(self, on_chunk=None, should_cancel=None):
+        with open(self.file_path, "rb") as f:
+            end = complete_end(f, 0, os.fstat(f.fileno()).st_size)
+            f.seek(0)
+            self.header = f.readline() if ingest.file_format(self.file_path) == "csv" else b""
+            f.seek(0)
+            stream = io.BufferedReader(BoundedFile(f, end))
+            frame = ingest.load(self.file_path, self.columns, self.dtypes, on_chunk=on_chunk, should_cancel=should_cancel, stream=stream, total_bytes=end)
+        self.offset = end
+        return frame
+
+    def read_new(self):
+        """Parses rows appended since the last read, with the offset just past them; None if nothing new was completed.
+
+        The offset is left alone: the caller moves it to the returned end once it keeps the rows, so rows
+        read by a refresh that was cancelled are read again.
+        """
+        with open(self.file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < self.offset:
+                raise FileTruncated(f"{os.path.basename(self.file_path)} got shorter; it was truncated or replaced.")
+            end = complete_end(f, self.offset, size)
+            if end == self.offset:
+                return None
+            f.seek(self.offset)
+            data = f.read(end - self.offset)
+        frame = ingest.load(self.file_path, self.columns, self.dtypes, stream=io.BytesIO(self.header + data), total_bytes=len(data))
+        return frame, end
@@ -0,0 +1,269 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlparse
+
+import pandas as pd
+
+import ingest
+
+POOL_SIZE = 8
+TIMEOUT = 30
+READ_BYTES = 2**20
+PAGE_WORKERS = 4
+MAX_PAGES = 10_000
+CONTENT_TYPES = {
+    "text/csv": ".csv",
+    "application/csv": ".csv",
+    "application/x-ndjson": ".jsonl",
+    "application/jsonl": ".jsonl",
+    "application/x-jsonlines": ".jsonl",
+    "application/json": ".json",
+    "application/vnd.apache.parquet": ".parquet",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": ".xlsx",
+}
+STREAMING_EXTENSIONS = (".csv", ".jsonl", ".ndjson")
+
+SESSION = None
+SESSION_LOCK = threading.Lock()
+
+
+def get_session():
+    # One keep-alive session per process; gzip and deflate bodies are requested by default.
+    global SESSION
+    with SESSION_LOCK:
+        if SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504], allowed_methods=["GET"])
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retries)
+            SESSION = requests.Session()
+            SESSION.mount("http://", adapter)
+            SESSION.mount("https://", adapter)
+        return SESSION
+
+
+def response_extension(url, content_type):
+    extension = os.path.splitext(urlparse(url).path)[1].lower()
+    if extension in ingest.SUPPORTED_EXTENSIONS:
+        return extension
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in CONTENT_TYPES:
+        return CONTENT_TYPES[media_type]
+    raise ingest.UnsupportedFormatError(f"Cannot tell the data format of {url} ({media_type or 'no content type'}).")
+
+
+def response_validators(response):
+    return {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+
+
+class ResponseReader(io.RawIOBase):
+    # Decodes the response body as it is read and copies it into the cache file.
+    def __init__(self, response, copy_to=None):
+        self.raw = response.raw
+        self.copy_to = copy_to
+        self.pending = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if not self.pending:
+            self.pending = self.raw.read(len(buffer), decode_content=True)
+            if not self.pending:
+                return 0
+            if self.copy_to is not None:
+                self.copy_to.write(self.pending)
+        count = min(len(buffer), len(self.pending))
+        buffer[:count] = self.pending[:count]
+        self.pending = self.pending[count:]
+        return count
+
+    def tell(self):
+        # Compressed bytes, so progress matches Content-Length.
+        return self.raw.tell()
+
+
+def page_url(url, params):
+    return f"{url}{'&' if '?' in url else '?'}{urlencode(params)}"
+
+
+def fetch(url, response_cache, session=None):
+    """Sends a conditional GET and returns (response, cached_path, cached_headers).
+
+    The response is None when the cached copy is still current.
+    """
+    session = session or get_session()
+    cached_path, cached_headers = response_cache.lookup(url) if response_cache is not None else (None, None)
+    headers = response_cache.validators(cached_headers) if cached_path is not None else {}
+    response = session.get(url, headers=headers, stream=True, timeout=TIMEOUT)
+    if response.status_code == 304 and cached_path is not None:
+        response.close()
+        return None, cached_path, cached_headers
+    response.raise_for_status()
+    return response, None, None
+
+
+class WebSource:
+    def __init__(self, url, response_cache=None, columns=None, dtypes=None):
+        self.url = url
+        self.response_cache = response_cache
+        self.columns = columns
+        self.dtypes = dtypes
+        self.response = None
+        self.cached_path = None
+        self.cached_headers = None
+        self.validators = None
+
+    @property
+    def name(self):
+        return self.url
+
+    def revalidate(self):
+        if self.response is None and self.cached_path is None:
+            self.response, self.cached_path, self.cached_headers = fetch(self.url, self.response_cache)
+            self.validators = response_validators(self.response) if self.response is not None else self.cached_headers
+        return self.response
+
+    def signature(self):
+        """The ETag and Last-Modified values of the version last revalidated, or None if the server sends neither."""
+        if self.validators is None:
+            self.revalidate()
+        validators = self.validators
+        if not (validators.get("etag") or validators.get("last_modified")):
+            return None
+        return validators.get("etag"), validators.get("last_modified")
+
+    def cache_key(self, cache):
+        # An unchanged response maps to the same frame, so a 304 is also a columnar cache hit.
+        self.revalidate()
+        signature = self.signature()
+        if signature is None:
+            return None
+        return cache.derived_key("web", self.url, *signature, self.columns, self.dtypes)
+
+    def release(self):
+        """Closes the response revalidate() kept for load(), when the frame came from the columnar cache instead."""
+        if self.response is not None:
+            self.response.close()
+        self.response = self.cached_path = self.cached_headers = self.validators = None
+
+    def load(self, on_chunk=None, should_cancel=None):
+        response = self.revalidate()
+        self.response = None
+        if response is None:
+            path, self.cached_path = self.cached_path, None
+            return ingest.load(path, self.columns, self.dtypes, on_chunk=on_chunk, should_cancel=should_cancel)
+        with response:
+            return self.load_response(response, on_chunk, should_cancel)
+
+    def load_response(self, response, on_chunk, should_cancel):
+        extension = response_extension(self.url, response.headers.get("Content-Type"))
+        validators = response_validators(response)
+        cacheable = self.response_cache is not None and any(validators.values())
+        if cacheable:
+            path, part_path = self.response_cache.reserve(self.url, extension)
+        else:
+            handle, path = tempfile.mkstemp(suffix=extension)
+            os.close(handle)
+            part_path = f"{path}.part"
+        total_bytes = int(response.headers.get("Content-Length") or 0)
+        try:
+            with open(part_path, "wb") as part:
+                reader = ResponseReader(response, part)
+                if extension in STREAMING_EXTENSIONS:
+                    with io.BufferedReader(reader, buffer_size=READ_BYTES) as stream:
+                        data = ingest.load(path, self.columns, self.dtypes, on_chunk=on_chunk, should_cancel=should_cancel, stream=stream, total_bytes=total_bytes)
+                    if data is None:
+                        return None
+                else:
+                    while reader.read(READ_BYTES):
+                        if should_cancel is not None and should_cancel():
+                            return None
+                        if on_chunk is not None:
+                            on_chunk(None, 0, reader.tell(), total_bytes)
+                    data = None
+            if cacheable:
+                self.response_cache.commit(self.url, part_path, path, validators)
+            else:
+                os.replace(part_path, path)
+            if data is None:
+                data = ingest.load(path, self.columns, self.dtypes, on_chunk=on_chunk, should_cancel=should_cancel)
+            return data
+        finally:
+            for leftover in (part_path,) if cacheable else (part_path, path):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+
+
+def page_records(payload, records_key=None):
+    if records_key:
+        for part in records_key.split("."):
+            payload = payload.get(part, []) if isinstance(payload, dict) else []
+        return payload
+    if isinstance(payload, dict):
+        return next((value for value in payload.values() if isinstance(value, list)), [])
+    return payload
+
+
+class PaginatedJSONSource:
+    def __init__(self, url, page_param="page", first_page=1, records_key=None, response_cache=None, workers=PAGE_WORKERS, max_pages=MAX_PAGES):
+        self.url = url
+        self.page_param = page_param
+        self.first_page = first_page
+        self.records_key = records_key
+        self.response_cache = response_cache
+        self.workers = workers
+        self.max_pages = max_pages
+
+    @property
+    def name(self):
+        return f"{self.url} (paginated)"
+
+    def cache_key(self, cache):
+        return None
+
+    def fetch_page(self, page):
+        url = page_url(self.url, {self.page_param: page})
+        response, cached_path, _ = fetch(url, self.response_cache)
+        if response is None:
+            with open(cached_path, "rb") as f:
+                return page_records(json.load(f), self.records_key)
+        with response:
+            validators = response_validators(response)
+            if self.response_cache is None or not any(validators.values()):
+                return page_records(response.json(), self.records_key)
+            path, part_path = self.response_cache.reserve(url, ".json")
+            with open(part_path, "wb") as part:
+                shutil.copyfileobj(ResponseReader(response), part, READ_BYTES)
+        self.response_cache.commit(url, part_path, path, validators)
+        with open(path, "rb") as f:
+            return page_records(json.load(f), self.records_key)
+
+    def load(self, on_chunk=None, should_cancel=None):
+        # Pages are requested a window at a time; the first empty page ends the listing.
+        chunks = []
+        rows = 0
+        page = self.first_page
+        last_page = self.first_page + self.max_pages
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while page < last_page:
+                window = range(page, min(page + self.workers, last_page))
+                for records in executor.map(self.fetch_page, window):
+                    if should_cancel is not None and should_cancel():
+                        return None
+                    if not records:
+                        return ingest.combine_chunks(chunks)
+                    chunk = pd.DataFrame.from_records(records)
+                    chunks.append(chunk)
+                    rows += len(chunk)
+                    if on_chunk is not None:
+                        on_chunk(chunk, rows, 0, 0)
+                page = window.stop
+        return ingest.combine_chunks(chunks)
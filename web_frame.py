@@ -0,0 +1,55 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+import web
+
+
+class WebSourceConnectionFrame(tk.Frame):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.parent = parent
+        self.selected_source = tk.StringVar()
+        self.url = tk.StringVar()
+        self.paginated = tk.BooleanVar(value=False)
+        self.page_param = tk.StringVar(value="page")
+        self.records_key = tk.StringVar()
+        self.label_url = ttk.Label(self, text="URL:")
+        self.label_url.grid(row=0, column=0, padx=5, pady=5, sticky="w")
+        self.entry_url = ttk.Entry(self, textvariable=self.url, width=50)
+        self.entry_url.grid(row=0, column=1, padx=5, pady=5)
+
+        self.paginated_check = ttk.Checkbutton(self, text="Paginated JSON API", variable=self.paginated)
+        self.paginated_check.grid(row=1, column=0, columnspan=2, padx=5, pady=5, sticky="w")
+
+        self.label_page_param = ttk.Label(self, text="Page Parameter:")
+        self.label_page_param.grid(row=2, column=0, padx=5, pady=5, sticky="w")
+        self.entry_page_param = ttk.Entry(self, textvariable=self.page_param)
+        self.entry_page_param.grid(row=2, column=1, padx=5, pady=5, sticky="w")
+
+        self.label_records_key = ttk.Label(self, text="Records Key (optional):")
+        self.label_records_key.grid(row=3, column=0, padx=5, pady=5, sticky="w")
+        self.entry_records_key = ttk.Entry(self, textvariable=self.records_key)
+        self.entry_records_key.grid(row=3, column=1, padx=5, pady=5, sticky="w")
+        
+        self.connect_button = ttk.Button(self, text="Load", command=self.connect_to_web_source)
+        self.connect_button.grid(row=4, column=0, columnspan=2, padx=5, pady=5)
+        
+    def connect_to_web_source(self):
+        url = self.url.get().strip()
+        if not url.lower().startswith(("http://", "https://")):
+            tk.messagebox.showerror("Web Source Connection", "Enter an http:// or https:// URL.")
+            return
+        if self.paginated.get():
+            source = web.PaginatedJSONSource(
+                url,
+                page_param=self.page_param.get().strip() or "page",
+                records_key=self.records_key.get().strip() or None,
+                response_cache=self.parent.response_cache,
+            )
+        else:
+            source = web.WebSource(url, self.parent.response_cache)
+        self.pack_forget()
+        self.parent.label.pack_forget()
+        self.parent.combobox.pack_forget()
+        self.parent.select_button.pack_forget()
+        self.parent.create_process_frame(source)